@@ -1,5 +1,8 @@
-from typing import Dict, Any
+from typing import Dict, Any, List, Optional
+import hashlib
 import json
+import re
+from app.core.metrics import REVIEW_PARSE_FAILURES
 
 def get_contract_review_system_prompt() -> str:
     """Get the system prompt for contract review."""
@@ -32,24 +35,38 @@ Always respond in JSON format with the following structure:
 
 Be thorough but concise. Focus on practical implications for the parties involved."""
 
-def review_contract_tool(file_content: str) -> Dict[str, Any]:
+def get_contract_review_prompt_version() -> str:
+    """Get a short version identifier for the contract review prompt, derived from its text."""
+    return hashlib.sha256(get_contract_review_system_prompt().encode("utf-8")).hexdigest()[:12]
+
+def review_contract_tool(file_content: str, part: Optional[int] = None, total_parts: Optional[int] = None) -> Dict[str, Any]:
     """
     Tool function for contract review that can be registered with the AdvisorAgent.
     
     Args:
         file_content: The text content of the contract to review
+        part: 1-based index when file_content is one chunk of a longer contract
+        total_parts: Number of chunks the contract was split into
         
     Returns:
         Dict containing the contract review analysis
     """
     system_prompt = get_contract_review_system_prompt()
     
-    user_prompt = f"""Please review the following property contract and provide your analysis:
+    if part is None:
+        user_prompt = f"""Please review the following property contract and provide your analysis:
 
 CONTRACT CONTENT:
 {file_content}
 
 Please analyze this contract and provide your response in the specified JSON format."""
+    else:
+        user_prompt = f"""The following is part {part} of {total_parts} of a longer property contract. Review only this part and summarize just the terms it contains:
+
+CONTRACT CONTENT:
+{file_content}
+
+Please analyze this part and provide your response in the specified JSON format."""
     
     # This would be called by the AdvisorAgent with the prompts
     return {
@@ -82,6 +99,7 @@ def format_contract_review_response(ai_response: str) -> Dict[str, Any]:
         
     except json.JSONDecodeError:
         # Fallback if JSON parsing fails
+        REVIEW_PARSE_FAILURES.inc()
         return {
             "summary": "Failed to parse AI response properly",
             "highlights": ["Review the raw response for details"],
@@ -90,6 +108,110 @@ def format_contract_review_response(ai_response: str) -> Dict[str, Any]:
             "raw_response": ai_response
         }
 
+# Lines that start a new section or clause: "Section 4", "ARTICLE II", "12.", "3.1", "(a)" or an all-caps heading
+_SECTION_BOUNDARY = re.compile(
+    r"^\s*(?:(?:section|article|clause|schedule|exhibit|addendum)\b|\d+(?:\.\d+)*[.)]\s|\([a-z0-9]{1,3}\)\s|[A-Z][A-Z0-9 ,&'-]{3,}$)",
+    re.IGNORECASE
+)
+_SENTENCE_END = re.compile(r"(?<=[.;:])\s+")
+
+def split_contract_sections(file_content: str) -> List[str]:
+    """
+    Split contract text into sections and clauses on heading and numbering boundaries.
+    
+    Args:
+        file_content: The text content of the contract
+        
+    Returns:
+        List of section texts in document order (whitespace preserved inside sections)
+    """
+    sections = []
+    current = []
+    for line in file_content.splitlines():
+        # Headings are only recognized at the start of a paragraph-like line
+        is_boundary = bool(line.strip()) and _SECTION_BOUNDARY.match(line) is not None and not line.strip().isdigit()
+        if is_boundary and any(l.strip() for l in current):
+            sections.append("\n".join(current).strip())
+            current = []
+        current.append(line)
+    if any(l.strip() for l in current):
+        sections.append("\n".join(current).strip())
+    return sections
+
+def _split_oversized(section: str, max_chars: int) -> List[str]:
+    """Split a section longer than max_chars on paragraph, then sentence boundaries."""
+    pieces = []
+    for paragraph in re.split(r"\n\s*\n", section):
+        if len(paragraph) <= max_chars:
+            pieces.append(paragraph)
+            continue
+        for sentence in _SENTENCE_END.split(paragraph):
+            # A single sentence longer than the limit is hard-wrapped
+            pieces.extend(sentence[i:i + max_chars] for i in range(0, len(sentence), max_chars))
+    return pieces
+
+def split_contract_into_chunks(file_content: str, max_chunk_chars: int = 12000) -> List[str]:
+    """
+    Split a long contract into chunks for parallel review.
+    
+    Sections are kept whole where possible and packed greedily into chunks of at
+    most max_chunk_chars; only sections that are too long on their own are split
+    further, on paragraph and then sentence boundaries.
+    
+    Args:
+        file_content: The text content of the contract
+        max_chunk_chars: Maximum characters per chunk
+        
+    Returns:
+        List of chunk texts in document order
+    """
+    pieces = []
+    for section in split_contract_sections(file_content):
+        pieces.extend([section] if len(section) <= max_chunk_chars else _split_oversized(section, max_chunk_chars))
+    
+    chunks = []
+    current = ""
+    for piece in pieces:
+        if current and len(current) + len(piece) + 2 > max_chunk_chars:
+            chunks.append(current)
+            current = ""
+        current = f"{current}\n\n{piece}" if current else piece
+    if current:
+        chunks.append(current)
+    return chunks
+
+def _dedupe_key(item: str) -> str:
+    return re.sub(r"[^a-z0-9]+", " ", item.lower()).strip()
+
+def merge_contract_reviews(reviews: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    Merge per-chunk reviews into one review with the format_contract_review_response shape.
+    
+    Summaries are joined in document order; highlights, warnings and suggestions are
+    concatenated with duplicates (ignoring case and punctuation) removed.
+    
+    Args:
+        reviews: Chunk reviews in document order
+        
+    Returns:
+        Merged contract review data
+    """
+    merged = {"summary": "", "highlights": [], "warnings": [], "suggestions": []}
+    summaries = []
+    seen = {field: set() for field in ("highlights", "warnings", "suggestions")}
+    for review in reviews:
+        summary = review.get("summary")
+        if isinstance(summary, str) and summary.strip() and _dedupe_key(summary) not in {_dedupe_key(s) for s in summaries}:
+            summaries.append(summary.strip())
+        for field in seen:
+            for item in review.get(field) or []:
+                key = _dedupe_key(str(item))
+                if key and key not in seen[field]:
+                    seen[field].add(key)
+                    merged[field].append(item)
+    merged["summary"] = " ".join(summaries)
+    return merged
+
 # Tool configuration for registration
 CONTRACT_REVIEW_TOOL_CONFIG = {
     "name": "contract_reviewer",
@@ -1,4 +1,204 @@
+import asyncio
+import mmap
+import os
+import zipfile
+from concurrent.futures import ProcessPoolExecutor
+from typing import AsyncIterator, Iterator, List, Optional
+from xml.etree import ElementTree
+
+PDF = "pdf"
+DOCX = "docx"
+TEXT = "text"
+
+CONTENT_TYPES = {
+    "application/pdf": PDF,
+    "application/vnd.openxmlformats-officedocument.wordprocessingml.document": DOCX,
+    "text/plain": TEXT,
+}
+
+# Characters per page for formats without reliable page boundaries
+DEFAULT_PAGE_CHARS = 3000
+
+_W = "{http://schemas.openxmlformats.org/wordprocessingml/2006/main}"
+
+_pool: Optional[ProcessPoolExecutor] = None
+_pool_workers = 0
+
+def _get_pool(max_workers: Optional[int] = None) -> ProcessPoolExecutor:
+    """Process pool shared by all PDF parses, started on first use."""
+    global _pool, _pool_workers
+    if _pool is None:
+        _pool_workers = max_workers or os.cpu_count() or 1
+        _pool = ProcessPoolExecutor(max_workers=_pool_workers)
+    return _pool
+
+def shutdown_parser_pool():
+    global _pool
+    if _pool is not None:
+        _pool.shutdown(cancel_futures=True)
+        _pool = None
+
+def detect_document_type(file_path: str, content_type: Optional[str] = None) -> str:
+    """Document type from the declared content type, else from the file's leading bytes."""
+    declared = CONTENT_TYPES.get((content_type or "").split(";")[0].strip().lower())
+    if declared is not None:
+        return declared
+    with open(file_path, "rb") as f:
+        head = f.read(5)
+    if head.startswith(b"%PDF"):
+        return PDF
+    if head.startswith(b"PK") and zipfile.is_zipfile(file_path):
+        with zipfile.ZipFile(file_path) as archive:
+            if "word/document.xml" in archive.namelist():
+                return DOCX
+    return TEXT
+
+def _open_pdf(file_path: str):
+    # Imported on first use: pypdf is optional and slow to import
+    try:
+        import pypdf
+    except ImportError:
+        raise RuntimeError("PDF parsing requires the pypdf package")
+    f = open(file_path, "rb")
+    # Memory-map the file so pages are read from the page cache instead of copied into each process
+    mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    f.close()
+    return mapped, pypdf.PdfReader(mapped)
+
+def count_pdf_pages(file_path: str) -> int:
+    mapped, reader = _open_pdf(file_path)
+    try:
+        return len(reader.pages)
+    finally:
+        mapped.close()
+
+def extract_pdf_pages(file_path: str, start: int, stop: int) -> List[str]:
+    """Text of pages [start, stop) of a PDF; runs in a worker process."""
+    mapped, reader = _open_pdf(file_path)
+    try:
+        return [reader.pages[i].extract_text() or "" for i in range(start, stop)]
+    finally:
+        del reader
+        mapped.close()
+
+def iter_pdf_pages(file_path: str, max_workers: Optional[int] = None, pages_per_task: Optional[int] = None) -> Iterator[str]:
+    """
+    Yield the text of each PDF page in order, extracting page ranges in parallel.
+
+    At most two ranges per worker are in flight, so memory stays flat however
+    long the document is. Each range reopens the file, so ranges default to a
+    few per worker (8 to 64 pages) to amortize that cost.
+    """
+    total = count_pdf_pages(file_path)
+    pool = _get_pool(max_workers)
+    window = 2 * _pool_workers
+    if pages_per_task is None:
+        pages_per_task = min(64, max(8, -(-total // (4 * _pool_workers))))
+    pending = []
+    try:
+        for start in range(0, total, pages_per_task):
+            stop = min(start + pages_per_task, total)
+            pending.append(pool.submit(extract_pdf_pages, file_path, start, stop))
+            if len(pending) >= window:
+                yield from pending.pop(0).result()
+        while pending:
+            yield from pending.pop(0).result()
+    finally:
+        for future in pending:
+            future.cancel()
+
+def _docx_has_page_breaks(archive: zipfile.ZipFile) -> bool:
+    """Scan document.xml in blocks for recorded page breaks without parsing it."""
+    overlap = b""
+    with archive.open("word/document.xml") as document:
+        for block in iter(lambda: document.read(1 << 20), b""):
+            block = overlap + block
+            if b"lastRenderedPageBreak" in block or b'w:type="page"' in block:
+                return True
+            overlap = block[-32:]
+    return False
+
+def iter_docx_pages(file_path: str, page_chars: int = DEFAULT_PAGE_CHARS) -> Iterator[str]:
+    """
+    Yield the text of a DOCX document page by page without loading its XML tree.
+
+    Pages end at the page breaks Word recorded, or every page_chars characters
+    when the document has none.
+    """
+    with zipfile.ZipFile(file_path) as archive, archive.open("word/document.xml") as document:
+        has_page_breaks = _docx_has_page_breaks(archive)
+        paragraphs: List[str] = []
+        size = 0
+        runs: List[str] = []
+        for event, element in ElementTree.iterparse(document, events=("end",)):
+            tag = element.tag
+            if tag == f"{_W}t":
+                runs.append(element.text or "")
+            elif tag == f"{_W}tab":
+                runs.append("\t")
+            elif tag in (f"{_W}br", f"{_W}lastRenderedPageBreak"):
+                if tag == f"{_W}lastRenderedPageBreak" or element.get(f"{_W}type") == "page":
+                    if runs:
+                        paragraphs.append("".join(runs))
+                        runs = []
+                    if paragraphs:
+                        yield "\n".join(paragraphs)
+                        paragraphs, size = [], 0
+                else:
+                    runs.append("\n")
+            elif tag == f"{_W}p":
+                text = "".join(runs)
+                runs = []
+                paragraphs.append(text)
+                size += len(text)
+                # Drop parsed paragraphs so memory does not grow with the document
+                element.clear()
+                if size >= page_chars and not has_page_breaks:
+                    yield "\n".join(paragraphs)
+                    paragraphs, size = [], 0
+        if paragraphs and any(paragraphs):
+            yield "\n".join(paragraphs)
+
+def iter_text_pages(file_path: str, page_chars: int = DEFAULT_PAGE_CHARS) -> Iterator[str]:
+    """Yield a plain text file in pages, split at form feeds or at a line break about every page_chars characters."""
+    with open(file_path, encoding="utf-8", errors="replace") as f:
+        buffer = ""
+        for block in iter(lambda: f.read(page_chars), ""):
+            *pages, buffer = (buffer + block).split("\f")
+            yield from pages
+            while len(buffer) >= page_chars:
+                cut = buffer.rfind("\n", 0, page_chars) + 1 or page_chars
+                yield buffer[:cut]
+                buffer = buffer[cut:]
+        if buffer:
+            yield buffer
+
+def iter_document_pages(file_path: str, content_type: Optional[str] = None, max_workers: Optional[int] = None) -> Iterator[str]:
+    """
+    Yield a document's text page by page.
+
+    Args:
+        file_path: PDF, DOCX or plain text file
+        content_type: Declared MIME type; the type is sniffed from the file when missing
+        max_workers: Worker processes for PDF extraction (all cores by default)
+    """
+    document_type = detect_document_type(file_path, content_type)
+    if document_type == PDF:
+        return iter_pdf_pages(file_path, max_workers=max_workers)
+    if document_type == DOCX:
+        return iter_docx_pages(file_path)
+    return iter_text_pages(file_path)
+
+async def aiter_document_pages(file_path: str, content_type: Optional[str] = None) -> AsyncIterator[str]:
+    """Async version of iter_document_pages; parsing runs off the event loop, one page ahead at most."""
+    pages = await asyncio.to_thread(iter_document_pages, file_path, content_type)
+    done = object()
+    while True:
+        page = await asyncio.to_thread(next, pages, done)
+        if page is done:
+            return
+        yield page
+
 def parse_document(file_path: str) -> str:
-    """Parse a document (PDF, DOC, etc.) and return its text content."""
-    # TODO: Implement document parsing logic (e.g., using PyPDF2, python-docx)
-    return f"Parsed content from {file_path}"
+    """Parse a document (PDF, DOCX or plain text) and return its text content."""
+    return "\n\n".join(iter_document_pages(file_path))
@@ -0,0 +1,102 @@
+import json
+from typing import Any, Dict, List, Tuple
+
+# Array fields of the review JSON and the event name emitted for each finished item
+ITEM_FIELDS = {"highlights": "highlight", "warnings": "warning", "suggestions": "suggestion"}
+
+class IncrementalReviewParser:
+    """
+    Incremental parser for a streamed contract review JSON document.
+
+    Feed it the model output as it arrives; every time a string value closes it
+    returns an event for it: the top-level "summary", or one item of the
+    "highlights", "warnings" or "suggestions" arrays. Text before the first "{"
+    (e.g. a ```json fence) is ignored. Use format_contract_review_response on the
+    full text for the final, validated review.
+    """
+
+    def __init__(self):
+        self.text = []
+        self._started = False
+        self._depth = 0
+        self._in_string = False
+        self._escape = False
+        self._buffer = []
+        # Top-level parsing state: the last key read and whether a key is expected next
+        self._key = None
+        self._expect_key = False
+        self._array_field = None
+
+    def feed(self, delta: str) -> List[Tuple[str, Any]]:
+        """
+        Consume the next piece of model output.
+
+        Args:
+            delta: Newly streamed text
+
+        Returns:
+            List of (event, value) tuples for values completed by this delta,
+            e.g. ("summary", "...") or ("warning", "...")
+        """
+        self.text.append(delta)
+        events = []
+        for char in delta:
+            if not self._started:
+                if char == "{":
+                    self._started = True
+                    self._depth = 1
+                    self._expect_key = True
+                continue
+
+            if self._in_string:
+                if self._escape:
+                    self._escape = False
+                elif char == "\\":
+                    self._escape = True
+                elif char == '"':
+                    self._in_string = False
+                    event = self._close_string("".join(self._buffer))
+                    if event is not None:
+                        events.append(event)
+                    continue
+                self._buffer.append(char)
+                continue
+
+            if char == '"':
+                self._in_string = True
+                self._buffer = []
+            elif char in "{[":
+                self._depth += 1
+                if char == "[" and self._depth == 2 and self._key in ITEM_FIELDS:
+                    self._array_field = self._key
+            elif char in "}]":
+                self._depth -= 1
+                if self._depth == 1:
+                    self._array_field = None
+            elif char == ":" and self._depth == 1:
+                self._expect_key = False
+            elif char == "," and self._depth == 1:
+                self._expect_key = True
+        return events
+
+    def _close_string(self, raw: str):
+        try:
+            value = json.loads(f'"{raw}"')
+        except json.JSONDecodeError:
+            value = raw
+        if self._depth == 1:
+            if self._expect_key:
+                self._key = value
+                return None
+            return ("summary", value) if self._key == "summary" else None
+        if self._depth == 2 and self._array_field is not None:
+            return (ITEM_FIELDS[self._array_field], value)
+        return None
+
+    def full_text(self) -> str:
+        """The complete text fed so far."""
+        return "".join(self.text)
+
+def format_sse_event(event: str, data: Dict[str, Any]) -> str:
+    """Encode one server-sent event."""
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
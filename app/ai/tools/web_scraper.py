@@ -1,38 +1,247 @@
-import requests
-from bs4 import BeautifulSoup
-from typing import Optional
+import asyncio
+import codecs
+import html
+import re
 import time
+from typing import Dict, List, Optional
+from urllib.parse import urlsplit
 
-def scrape_web_page(url: str, timeout: int = 30, user_agent: Optional[str] = None) -> str:
+import httpx
+from pydantic import BaseModel
+
+from app.core.cache import LRUCache, SQLiteCache, TieredCache
+
+DEFAULT_USER_AGENT = 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
+DEFAULT_MAX_BYTES = 5 * 1024 * 1024
+
+# Elements whose content is never page text
+SKIPPED_TAGS = ("script", "style", "noscript", "template", "svg")
+# Elements that separate words even without surrounding whitespace
+BLOCK_TAGS = (
+    "address", "article", "aside", "blockquote", "br", "dd", "div", "dl", "dt", "fieldset", "figcaption", "figure",
+    "footer", "form", "h1", "h2", "h3", "h4", "h5", "h6", "header", "hr", "li", "main", "nav", "ol", "p", "pre",
+    "section", "table", "td", "th", "title", "tr", "ul",
+)
+
+_SKIPPED = "|".join(SKIPPED_TAGS)
+# A complete skipped element or comment, or (when its end has not arrived yet) just its opening
+_SKIPPED_ELEMENT = re.compile(rf"<({_SKIPPED})\b.*?</\1\s*>|<!--.*?-->|(<(?:{_SKIPPED})\b|<!--)", re.IGNORECASE | re.DOTALL)
+_BLOCK_TAG = re.compile(rf"</?(?:{'|'.join(BLOCK_TAGS)})\b[^>]*>", re.IGNORECASE)
+_TAG = re.compile(r"<[/!?a-zA-Z][^>]*>")
+_PARTIAL_ENTITY = re.compile(r"&#?\w{0,31}$")
+
+class TextExtractor:
+    """
+    Streaming HTML-to-text extractor.
+
+    Feed it decoded chunks as they arrive. Each chunk is reduced to collapsed text
+    with a few regular expression passes; only an unfinished tag, entity or
+    script/style element at the end of a chunk is held back for the next one. No
+    document tree is built, so memory grows with the text rather than the markup.
+    """
+
+    def __init__(self):
+        self._parts: List[str] = []
+        self._carry = ""
+        self._pending_space = False
+
+    def feed(self, chunk: str):
+        buffer = self._carry + chunk
+        cut = len(buffer)
+        last_open = buffer.rfind("<")
+        if last_open != -1 and buffer.find(">", last_open) == -1:
+            cut = last_open
+
+        pieces, position = [], 0
+        for match in _SKIPPED_ELEMENT.finditer(buffer, 0, cut):
+            if match.group(2) is not None:
+                # Wait for the end of this element
+                cut = match.start()
+                break
+            pieces.append(buffer[position:match.start()])
+            pieces.append(" ")
+            position = match.end()
+        text = buffer[position:cut]
+        partial = _PARTIAL_ENTITY.search(text)
+        if partial and cut == len(buffer):
+            cut -= len(partial.group(0))
+            text = text[:partial.start()]
+        pieces.append(text)
+        self._carry = buffer[cut:]
+        self._add("".join(pieces))
+
+    def _add(self, markup: str):
+        text = html.unescape(_TAG.sub("", _BLOCK_TAG.sub(" ", markup)))
+        words = text.split()
+        if not words:
+            self._pending_space = self._pending_space or bool(text)
+            return
+        if self._parts and (self._pending_space or text[0].isspace()):
+            self._parts.append(" ")
+        self._parts.append(" ".join(words))
+        self._pending_space = text[-1].isspace()
+
+    def text(self) -> str:
+        """The extracted text; flushes anything held back."""
+        carry, self._carry = self._carry, ""
+        if carry:
+            # An unterminated script/style element hides the rest of the page, as in browsers
+            match = _SKIPPED_ELEMENT.search(carry)
+            self._add(carry[:match.start()] if match is not None and match.group(2) is not None else carry)
+        return "".join(self._parts)
+
+class ScrapeResult(BaseModel):
+    url: str
+    status_code: Optional[int] = None
+    text: str = ""
+    from_cache: bool = False  # revalidated with a 304 instead of downloaded
+    truncated: bool = False   # body exceeded max_bytes; text covers the first max_bytes
+    error: Optional[str] = None
+
+def _decoder(response: httpx.Response):
+    return codecs.getincrementaldecoder(response.charset_encoding or "utf-8")(errors="replace")
+
+class AsyncWebScraper:
+    """
+    Async web scraper with pooled connections and conditional revalidation.
+
+    Connections are reused through one httpx.AsyncClient, with at most
+    max_per_host requests in flight per host. Bodies are streamed through
+    TextExtractor and reading stops after max_bytes. Extracted text is cached with
+    the response's ETag and Last-Modified; the next scrape of the URL sends
+    If-None-Match / If-Modified-Since and reuses the cached text on a 304.
+
+    Args:
+        cache_path: SQLite file for the response cache; memory only when None
+        cache_size: Entries in the in-memory cache tier
+        max_connections: Connection pool size across all hosts
+        max_per_host: Concurrent requests per host
+        timeout: Request timeout in seconds
+        max_bytes: Largest body read per page
+        user_agent: User-Agent header
+    """
+
+    def __init__(
+        self,
+        cache_path: Optional[str] = None,
+        cache_size: int = 1024,
+        max_connections: int = 100,
+        max_per_host: int = 8,
+        timeout: float = 30,
+        max_bytes: int = DEFAULT_MAX_BYTES,
+        user_agent: Optional[str] = None
+    ):
+        self.max_per_host = max_per_host
+        self.max_bytes = max_bytes
+        self.cache = TieredCache(
+            memory=LRUCache(max_entries=cache_size),
+            persistent=SQLiteCache(cache_path, table="web_pages") if cache_path else None
+        )
+        self.client = httpx.AsyncClient(
+            headers={"User-Agent": user_agent or DEFAULT_USER_AGENT},
+            timeout=timeout,
+            follow_redirects=True,
+            limits=httpx.Limits(max_connections=max_connections, max_keepalive_connections=max_connections),
+        )
+        self._host_slots: Dict[str, asyncio.Semaphore] = {}
+
+    async def aclose(self):
+        await self.client.aclose()
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.aclose()
+
+    def _slot(self, url: str) -> asyncio.Semaphore:
+        host = urlsplit(url).netloc
+        if host not in self._host_slots:
+            self._host_slots[host] = asyncio.Semaphore(self.max_per_host)
+        return self._host_slots[host]
+
+    async def scrape(self, url: str) -> ScrapeResult:
+        """
+        Scrape the text content of one page.
+
+        Errors are reported in ScrapeResult.error rather than raised.
+        """
+        cached = self.cache.get(url)
+        headers = {}
+        if cached is not None:
+            if cached.get("etag"):
+                headers["If-None-Match"] = cached["etag"]
+            if cached.get("last_modified"):
+                headers["If-Modified-Since"] = cached["last_modified"]
+
+        try:
+            async with self._slot(url):
+                async with self.client.stream("GET", url, headers=headers) as response:
+                    if response.status_code == 304 and cached is not None:
+                        return ScrapeResult(url=url, status_code=304, text=cached["text"], from_cache=True, truncated=cached.get("truncated", False))
+                    response.raise_for_status()
+                    text, truncated = await self._extract(response)
+        except httpx.HTTPError as e:
+            return ScrapeResult(url=url, error=f"Error scraping {url}: {str(e)}")
+        except Exception as e:
+            return ScrapeResult(url=url, error=f"Unexpected error scraping {url}: {str(e)}")
+
+        if response.headers.get("etag") or response.headers.get("last-modified"):
+            self.cache.set(url, {
+                "etag": response.headers.get("etag"),
+                "last_modified": response.headers.get("last-modified"),
+                "text": text,
+                "truncated": truncated,
+                "fetched_at": time.time(),
+            })
+        return ScrapeResult(url=url, status_code=response.status_code, text=text, truncated=truncated)
+
+    async def _extract(self, response: httpx.Response):
+        declared = response.headers.get("content-length")
+        truncated = declared is not None and declared.isdigit() and int(declared) > self.max_bytes
+        extractor = TextExtractor()
+        decoder = _decoder(response)
+        received = 0
+        async for chunk in response.aiter_bytes():
+            room = self.max_bytes - received
+            if len(chunk) > room:
+                # Stop reading; leaving the block closes the connection without downloading the rest
+                extractor.feed(decoder.decode(chunk[:room]))
+                truncated = True
+                break
+            received += len(chunk)
+            extractor.feed(decoder.decode(chunk))
+        extractor.feed(decoder.decode(b"", final=True))
+        return extractor.text(), truncated
+
+    async def scrape_many(self, urls: List[str]) -> List[ScrapeResult]:
+        """Scrape pages concurrently (bounded per host); results are in input order."""
+        return await asyncio.gather(*(self.scrape(url) for url in urls))
+
+def scrape_web_page(url: str, timeout: int = 30, user_agent: Optional[str] = None, max_bytes: int = DEFAULT_MAX_BYTES) -> str:
     """Scrape the content of a web page from the specified URL."""
     try:
-        # Set default user agent to avoid being blocked
         headers = {
-            'User-Agent': user_agent or 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
+            'User-Agent': user_agent or DEFAULT_USER_AGENT
         }
-        
-        # Make the request
-        response = requests.get(url, headers=headers, timeout=timeout)
-        response.raise_for_status()  # Raise an exception for bad status codes
-        
-        # Parse the HTML content
-        soup = BeautifulSoup(response.content, 'html.parser')
-        
-        # Remove script and style elements
-        for script in soup(["script", "style"]):
-            script.decompose()
-        
-        # Get text content
-        text = soup.get_text()
-        
-        # Clean up the text (remove extra whitespace)
-        lines = (line.strip() for line in text.splitlines())
-        chunks = (phrase.strip() for line in lines for phrase in line.split("  "))
-        text = ' '.join(chunk for chunk in chunks if chunk)
-        
-        return text
-        
-    except requests.exceptions.RequestException as e:
+
+        # Stream the body through the extractor instead of building a full document
+        with httpx.stream("GET", url, headers=headers, timeout=timeout, follow_redirects=True) as response:
+            response.raise_for_status()
+            extractor = TextExtractor()
+            decoder = _decoder(response)
+            received = 0
+            for chunk in response.iter_bytes():
+                room = max_bytes - received
+                if len(chunk) > room:
+                    extractor.feed(decoder.decode(chunk[:room]))
+                    break
+                received += len(chunk)
+                extractor.feed(decoder.decode(chunk))
+            extractor.feed(decoder.decode(b"", final=True))
+            return extractor.text()
+
+    except httpx.HTTPError as e:
         return f"Error scraping {url}: {str(e)}"
     except Exception as e:
         return f"Unexpected error scraping {url}: {str(e)}"
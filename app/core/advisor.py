@@ -1,75 +1,583 @@
-import openai
-from typing import Any, Dict, List, Optional
-from app.ai.tools.contract_reviewer import review_contract_tool, format_contract_review_response, get_contract_review_system_prompt
+import asyncio
+import time
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple
+from app.ai.tools.contract_reviewer import (
+    review_contract_tool,
+    format_contract_review_response,
+    get_contract_review_prompt_version,
+    get_contract_review_system_prompt,
+    merge_contract_reviews,
+    split_contract_into_chunks,
+)
+from app.ai.tools.review_stream import ITEM_FIELDS, IncrementalReviewParser
+from app.core.cache import TieredCache
+from app.core.clause_index import ClauseIndex, segment_clauses
+from app.core.metrics import LLM_REQUESTS, record_llm_usage, record_stage, span
+from app.core.rate_limiter import (
+    AdaptiveConcurrencyLimiter,
+    LLMRateLimiter,
+    call_with_retries,
+    estimate_tokens,
+    hedged_call,
+)
+from app.core.review_cache import contract_review_cache_key
+
+# Defaults for the shared LLM client; override per deployment through the constructor
+DEFAULT_MAX_CONCURRENT_REQUESTS = 8
+DEFAULT_REQUEST_TIMEOUT = 60.0
+# Contracts longer than this are reviewed in parallel chunks (~3k tokens each)
+DEFAULT_CHUNK_SIZE_CHARS = 12000
+# With a clause index, known clauses are only reused when they cover at least this share of the contract
+CLAUSE_REUSE_MIN_FRACTION = 0.5
+
+def _openai():
+    """The openai package, imported on first use; it is the slowest import in the app."""
+    import openai
+    return openai
+
+def retryable_errors() -> tuple:
+    """Transient provider errors that are retried with backoff."""
+    openai = _openai()
+    return (openai.RateLimitError, openai.APIConnectionError, openai.InternalServerError)
+
+# Model parameters for contract reviews; part of the review cache key
+CONTRACT_REVIEW_PARAMS = {"temperature": 0.1, "max_tokens": 2000}
+
+def contract_review_error(error: BaseException) -> Dict[str, Any]:
+    """Review-shaped response for a contract that could not be analyzed."""
+    return {
+        "summary": f"Error analyzing contract: {str(error)}",
+        "highlights": [],
+        "warnings": [f"Analysis failed: {str(error)}"],
+        "suggestions": ["Please try again or check the contract format"]
+    }
 
 class AdvisorAgent:
-    def __init__(self, openai_api_key: str, deployment_name: str, api_base: Optional[str] = None):
+    def __init__(
+        self,
+        openai_api_key: str,
+        deployment_name: str,
+        api_base: Optional[str] = None,
+        api_version: Optional[str] = None,
+        max_concurrent_requests: int = DEFAULT_MAX_CONCURRENT_REQUESTS,
+        request_timeout: float = DEFAULT_REQUEST_TIMEOUT,
+        max_retries: int = 2,
+        review_cache: Optional[TieredCache] = None,
+        chunk_size_chars: int = DEFAULT_CHUNK_SIZE_CHARS,
+        clause_index: Optional[ClauseIndex] = None,
+        requests_per_minute: Optional[float] = None,
+        tokens_per_minute: Optional[float] = None,
+        hedge_requests: bool = False,
+        hedge_quantile: float = 0.95
+    ):
+        """
+        Async agent for LLM-backed property analysis.
+
+        Args:
+            openai_api_key: API key for the OpenAI / Azure OpenAI endpoint
+            deployment_name: Model or Azure deployment name
+            api_base: Endpoint base URL (Azure endpoint when api_version is set)
+            api_version: Azure OpenAI API version; when set the Azure client is used
+            max_concurrent_requests: Cap on in-flight LLM requests across all callers; the
+                adaptive limit backs off below it on 429s and latency spikes
+            request_timeout: Default per-call timeout in seconds
+            max_retries: Retries (with jittered backoff) for throttling and transient errors
+            review_cache: Optional cache of contract reviews (see app.core.review_cache)
+            chunk_size_chars: Contracts longer than this are split and reviewed chunk by chunk
+            clause_index: Optional clause fingerprint index; known clauses skip the LLM
+            requests_per_minute: Provider request quota shared by all calls (None for no limit)
+            tokens_per_minute: Provider token quota, charged with prompt length plus max_tokens
+            hedge_requests: Start a duplicate request when a call outlasts the hedge_quantile latency
+            hedge_quantile: Latency quantile after which a call is hedged
+        """
         self.openai_api_key = openai_api_key
         self.deployment_name = deployment_name
         self.api_base = api_base
+        self.api_version = api_version
+        self.max_concurrent_requests = max_concurrent_requests
+        self.request_timeout = request_timeout
+        self.max_retries = max_retries
+        self.review_cache = review_cache
+        self.chunk_size_chars = chunk_size_chars
+        self.clause_index = clause_index
+        self.hedge_requests = hedge_requests
+        self.hedge_quantile = hedge_quantile
         self.tools = {}
-        self._setup_openai_client()
+        # Shared quota and concurrency control; callers wait here without holding a connection
+        self.rate_limiter = LLMRateLimiter(requests_per_minute, tokens_per_minute)
+        self.concurrency = AdaptiveConcurrencyLimiter(max_concurrent_requests)
+        # Created on the first LLM call, so constructing the agent does not import openai
+        self._client = None
+
+    @property
+    def client(self):
+        if self._client is None:
+            self._client = self._setup_openai_client()
+        return self._client
 
     def _setup_openai_client(self):
-        openai.api_key = self.openai_api_key
-        if self.api_base:
-            openai.api_base = self.api_base
+        import httpx
+        openai = _openai()
+        # One pooled HTTP client per agent, shared by every request
+        http_client = openai.DefaultAsyncHttpxClient(
+            limits=httpx.Limits(
+                max_connections=self.max_concurrent_requests,
+                max_keepalive_connections=self.max_concurrent_requests
+            ),
+            timeout=self.request_timeout
+        )
+        if self.api_version:
+            return openai.AsyncAzureOpenAI(
+                api_key=self.openai_api_key,
+                azure_endpoint=self.api_base,
+                api_version=self.api_version,
+                max_retries=0,  # retries go through call_with_retries so the limiters see them
+                http_client=http_client
+            )
+        else:
+            return openai.AsyncOpenAI(
+                api_key=self.openai_api_key,
+                base_url=self.api_base,
+                max_retries=0,
+                http_client=http_client
+            )
+
+    async def preload(self):
+        """Import the LLM client library in a worker thread, so the first review does not block the event loop on it."""
+        await asyncio.to_thread(_openai)
+
+    async def aclose(self):
+        """Close the pooled HTTP connections."""
+        if self._client is not None:
+            await self._client.close()
+            self._client = None
 
     def register_tool(self, name: str, tool_callable):
         self.tools[name] = tool_callable
 
-    def infer(self, prompt: str, tools: Optional[List[str]] = None, **kwargs) -> Dict[str, Any]:
+    async def _chat_completion(self, messages: List[Dict[str, str]], timeout: Optional[float] = None, **kwargs):
+        """
+        Issue one chat completion under the shared rate and concurrency limits.
+
+        Throttling (429) and transient errors are retried with jittered backoff,
+        honoring Retry-After; each 429 also halves the adaptive concurrency limit.
+        With hedge_requests, a call slower than the recent hedge_quantile latency
+        gets a duplicate request and the first response wins.
+        """
+        estimated_tokens = estimate_tokens(messages, kwargs.get("max_tokens"))
+        client = self.client
+        openai = _openai()
+
+        async def attempt():
+            queued = time.perf_counter()
+            charged_tokens = await self.rate_limiter.acquire(estimated_tokens)
+            async with self.concurrency.slot():
+                # Time spent waiting for quota and a concurrency slot, separate from the call itself
+                record_stage("llm_queue", time.perf_counter() - queued)
+                started = time.monotonic()
+                try:
+                    with span("llm_request"):
+                        response = await client.chat.completions.create(
+                            model=self.deployment_name,
+                            messages=messages,
+                            timeout=timeout or self.request_timeout,
+                            **kwargs
+                        )
+                except openai.RateLimitError:
+                    LLM_REQUESTS.inc("rate_limited")
+                    self.concurrency.on_congestion()
+                    raise
+                except Exception:
+                    LLM_REQUESTS.inc("error")
+                    raise
+                self.concurrency.on_success(time.monotonic() - started)
+            LLM_REQUESTS.inc("ok")
+            usage = getattr(response, "usage", None)
+            record_llm_usage(usage)
+            self.rate_limiter.record_usage(charged_tokens, usage.total_tokens if usage else None)
+            return response
+
+        hedge_after = None
+        if self.hedge_requests and len(self.concurrency.latencies) >= 20:
+            hedge_after = self.concurrency.latencies.quantile(self.hedge_quantile)
+
+        return await call_with_retries(
+            lambda: hedged_call(attempt, hedge_after),
+            retry_on=retryable_errors(),
+            max_retries=self.max_retries,
+            retry_after=_retry_after_seconds,
+            on_retry=self._on_retry
+        )
+
+    def _on_retry(self, error: BaseException):
+        # Respect the provider's Retry-After for everyone, not just this caller
+        delay = _retry_after_seconds(error)
+        if delay:
+            self.rate_limiter.pause(delay)
+
+    async def infer(self, prompt: str, tools: Optional[List[str]] = None, timeout: Optional[float] = None, **kwargs) -> Dict[str, Any]:
         # Prepare tools for the response API if any are specified
-        tool_list = [self.tools[name] for name in tools] if tools else []
-        # Call AOAI LLM using the responses API
-        response = openai.ChatCompletion.create(
-            deployment_id=self.deployment_name,
+        if tools:
+            kwargs["tools"] = [self.tools[name] for name in tools]
+        # Call AOAI LLM using the chat completions API
+        response = await self._chat_completion(
             messages=[{"role": "user", "content": prompt}],
-            tools=tool_list,
+            timeout=timeout,
             **kwargs
         )
         return response
 
-    def analyze_contract(self, file_content: str) -> Dict[str, Any]:
+    async def _review_contract_text(
+        self,
+        file_content: str,
+        timeout: Optional[float] = None,
+        part: Optional[int] = None,
+        total_parts: Optional[int] = None
+    ) -> Dict[str, Any]:
+        """Review one contract (or one chunk of it) with a single LLM call."""
+        # Get the system and user prompts from the tool
+        tool_response = review_contract_tool(file_content, part=part, total_parts=total_parts)
+        system_prompt = tool_response["system_prompt"]
+        user_prompt = tool_response["user_prompt"]
+
+        # Call OpenAI API with the prompts
+        response = await self._chat_completion(
+            messages=[
+                {"role": "system", "content": system_prompt},
+                {"role": "user", "content": user_prompt}
+            ],
+            timeout=timeout,
+            **CONTRACT_REVIEW_PARAMS  # Low temperature for more consistent analysis
+        )
+
+        # Extract the AI response and format it into the structured review
+        with span("parse_review"):
+            return format_contract_review_response(response.choices[0].message.content)
+
+    def _start_segment_reviews(self, file_content: str, timeout: Optional[float] = None) -> List["asyncio.Future"]:
+        """
+        Map step of a segmented review: start one review per segment of the contract.
+
+        Without a clause index the contract is split into chunks of up to
+        chunk_size_chars. With a clause index it is split into clauses and each is
+        looked up; clauses with known findings resolve immediately, and runs of
+        novel clauses are packed into chunks of up to chunk_size_chars, so a new
+        contract costs as many LLM calls as the plain chunk path. Each chunk is
+        itself looked up before review and stored once reviewed, so a contract
+        from a known template reuses every chunk whose text (and numbers) did not
+        change. When less than CLAUSE_REUSE_MIN_FRACTION of the text is known, the
+        matches are ignored and every clause is reviewed in chunks, rather than
+        breaking chunks up around a few reused clauses. Segments run in parallel
+        under the agent's concurrency cap, so latency follows the slowest segment
+        rather than the document length.
+
+        Returns:
+            One future per segment, in document order
+        """
+        if self.clause_index is None:
+            chunks = split_contract_into_chunks(file_content, self.chunk_size_chars)
+            return [
+                asyncio.ensure_future(self._review_contract_text(chunk, timeout, part=i + 1, total_parts=len(chunks)))
+                for i, chunk in enumerate(chunks)
+            ]
+
+        clauses = segment_clauses(file_content)
+        scope = f"{get_contract_review_prompt_version()}:{self.deployment_name}"
+        known = [self.clause_index.lookup(clause, scope) for clause in clauses]
+        reused_chars = sum(len(clause) for clause, findings in zip(clauses, known) if findings is not None)
+        if reused_chars < CLAUSE_REUSE_MIN_FRACTION * sum(len(clause) for clause in clauses):
+            known = [None] * len(clauses)
+
+        # (text, findings or None for a chunk to review, whether the text was already looked up)
+        segments: List[Tuple[str, Optional[Dict[str, Any]], bool]] = []
+        for clause, findings in zip(clauses, known):
+            if findings is not None:
+                segments.append((clause, findings, True))
+                continue
+            pieces = [clause] if len(clause) <= self.chunk_size_chars else split_contract_into_chunks(clause, self.chunk_size_chars)
+            for piece in pieces:
+                previous = segments[-1] if segments else None
+                if previous is not None and previous[1] is None and len(previous[0]) + len(piece) + 2 <= self.chunk_size_chars:
+                    segments[-1] = (f"{previous[0]}\n\n{piece}", None, False)
+                else:
+                    segments.append((piece, None, piece == clause))
+
+        loop = asyncio.get_running_loop()
+        futures = []
+        for i, (text, findings, looked_up) in enumerate(segments):
+            if findings is None and not looked_up:
+                findings = self.clause_index.lookup(text, scope)
+            if findings is None:
+                futures.append(asyncio.ensure_future(self._review_clause(text, scope, timeout, i + 1, len(segments))))
+            else:
+                reused = loop.create_future()
+                reused.set_result(findings)
+                futures.append(reused)
+        return futures
+
+    async def _review_clause(self, clause: str, scope: str, timeout: Optional[float], part: int, total_parts: int) -> Dict[str, Any]:
+        """Review novel clauses (one chunk of them) and record the findings in the clause index."""
+        review = await self._review_contract_text(clause, timeout, part=part, total_parts=total_parts)
+        if "raw_response" not in review:
+            self.clause_index.add(clause, scope, review)
+        return review
+
+    @staticmethod
+    def _merge_chunk_results(results: List[Any]) -> Dict[str, Any]:
+        """Merge chunk reviews (or the exceptions they raised) in document order."""
+        reviews = []
+        failed_parts = []
+        for part, result in enumerate(results, start=1):
+            if isinstance(result, BaseException) or "raw_response" in result:
+                failed_parts.append(part)
+            else:
+                reviews.append(result)
+        if not reviews:
+            error = next((r for r in results if isinstance(r, BaseException)), None)
+            raise error or ValueError("No part of the contract could be parsed")
+
+        merged = merge_contract_reviews(reviews)
+        if failed_parts:
+            merged["warnings"].append(
+                f"Parts {', '.join(map(str, failed_parts))} of {len(results)} could not be analyzed; review them manually"
+            )
+            merged["failed_parts"] = failed_parts
+        return merged
+
+    async def analyze_contract(self, file_content: str, timeout: Optional[float] = None, raise_errors: bool = False) -> Dict[str, Any]:
         """
         Analyze a property contract using the contract reviewer tool.
-        
+
+        Contracts longer than chunk_size_chars are split on section and clause
+        boundaries and reviewed as parallel chunks whose results are merged. With a
+        clause index, known boilerplate clauses reuse their stored findings and only
+        novel clauses are reviewed.
+
         Args:
             file_content: The text content of the contract to analyze
-            
+            timeout: Per-call timeout in seconds (defaults to request_timeout)
+            raise_errors: Raise when the contract cannot be analyzed instead of
+                returning contract_review_error()
+
         Returns:
             Dict containing contract analysis with summary, highlights, warnings, and suggestions
         """
+        cache_key = None
+        if self.review_cache is not None:
+            cache_key = contract_review_cache_key(file_content, self.deployment_name, **CONTRACT_REVIEW_PARAMS)
+            cached = self.review_cache.get(cache_key)
+            if cached is not None:
+                return cached
+
         try:
-            # Get the system and user prompts from the tool
-            tool_response = review_contract_tool(file_content)
-            system_prompt = tool_response["system_prompt"]
-            user_prompt = tool_response["user_prompt"]
-            
-            # Call OpenAI API with the prompts
-            response = openai.ChatCompletion.create(
-                deployment_id=self.deployment_name,
-                messages=[
-                    {"role": "system", "content": system_prompt},
-                    {"role": "user", "content": user_prompt}
-                ],
-                temperature=0.1,  # Lower temperature for more consistent analysis
-                max_tokens=2000
-            )
-            
-            # Extract the AI response
-            ai_response = response.choices[0].message.content
-            
-            # Format and return the structured response
-            return format_contract_review_response(ai_response)
-            
+            if self.clause_index is not None or len(file_content) > self.chunk_size_chars:
+                segments = self._start_segment_reviews(file_content, timeout)
+                analysis = self._merge_chunk_results(await asyncio.gather(*segments, return_exceptions=True))
+            else:
+                analysis = await self._review_contract_text(file_content, timeout)
+
+            # Only cache complete responses that parsed cleanly
+            if cache_key is not None and "raw_response" not in analysis and "failed_parts" not in analysis:
+                self.review_cache.set(cache_key, analysis)
+            return analysis
+
+        except Exception as e:
+            if raise_errors:
+                raise
+            return contract_review_error(e)
+
+    async def review_contract_pages(self, pages: AsyncIterator[str], timeout: Optional[float] = None) -> Dict[str, Any]:
+        """
+        Analyze a contract delivered page by page, e.g. while an upload is still being parsed.
+
+        Pages are gathered into blocks of several chunks; each block's segment
+        reviews start as soon as it is complete, so parsing and review overlap.
+        Documents that fit in one chunk go through analyze_contract (and its cache).
+
+        Args:
+            pages: Page texts in document order
+            timeout: Per-call timeout in seconds (defaults to request_timeout)
+
+        Returns:
+            Dict containing contract analysis with summary, highlights, warnings, and suggestions
+        """
+        block_chars = 4 * self.chunk_size_chars
+        block: List[str] = []
+        block_size = 0
+        segments: List[asyncio.Future] = []
+        try:
+            async for page in pages:
+                block.append(page)
+                block_size += len(page)
+                if block_size >= block_chars:
+                    segments.extend(self._start_segment_reviews("\n\n".join(block), timeout))
+                    block, block_size = [], 0
+
+            if not segments:
+                return await self.analyze_contract("\n\n".join(block), timeout)
+            if block:
+                segments.extend(self._start_segment_reviews("\n\n".join(block), timeout))
+            return self._merge_chunk_results(await asyncio.gather(*segments, return_exceptions=True))
+
         except Exception as e:
-            return {
-                "summary": f"Error analyzing contract: {str(e)}",
-                "highlights": [],
-                "warnings": [f"Analysis failed: {str(e)}"],
-                "suggestions": ["Please try again or check the contract format"]
-            }
+            for segment in segments:
+                segment.cancel()
+            return contract_review_error(e)
+
+    async def stream_contract_review(
+        self,
+        file_content: str,
+        timeout: Optional[float] = None,
+        include_tokens: bool = False
+    ) -> AsyncIterator[Tuple[str, Any]]:
+        """
+        Analyze a contract and yield results as soon as they are available.
+
+        Yields ("summary", str), ("highlight" | "warning" | "suggestion", str) events as
+        the model closes each item, optional ("token", str) events with the raw output,
+        and finally ("result", review) with the same structured review analyze_contract
+        returns. Long or clause-indexed contracts are reviewed in parallel segments;
+        their items are emitted (deduplicated) as each segment finishes, so findings
+        for known clauses arrive immediately. Cached reviews are returned
+        as a single result event.
+
+        Args:
+            file_content: The text content of the contract to analyze
+            timeout: Per-call timeout in seconds (defaults to request_timeout)
+            include_tokens: Also forward the raw model output as token events
+        """
+        cache_key = None
+        if self.review_cache is not None:
+            cache_key = contract_review_cache_key(file_content, self.deployment_name, **CONTRACT_REVIEW_PARAMS)
+            cached = self.review_cache.get(cache_key)
+            if cached is not None:
+                yield ("result", cached)
+                return
+
+        if self.clause_index is not None or len(file_content) > self.chunk_size_chars:
+            # Review segments concurrently, streaming items as each one completes; the
+            # merge below performs the same deduplication for the final result
+            tasks = self._start_segment_reviews(file_content, timeout)
+            try:
+                emitted = set()
+                for next_done in asyncio.as_completed(tasks):
+                    try:
+                        review = await next_done
+                    except Exception:
+                        continue
+                    for field, event in ITEM_FIELDS.items():
+                        for item in review.get(field) or []:
+                            if (field, item) not in emitted:
+                                emitted.add((field, item))
+                                yield (event, item)
+            finally:
+                for task in tasks:
+                    task.cancel()
+            # All tasks are finished here, so this only merges their results
+            try:
+                analysis = self._merge_chunk_results([task.exception() or task.result() for task in tasks])
+            except Exception as e:
+                yield ("error", {"message": f"Error analyzing contract: {str(e)}"})
+                return
+        else:
+            tool_response = review_contract_tool(file_content)
+            parser = IncrementalReviewParser()
+            messages = [
+                {"role": "system", "content": tool_response["system_prompt"]},
+                {"role": "user", "content": tool_response["user_prompt"]}
+            ]
+            deltas: asyncio.Queue = asyncio.Queue()
+            upstream = asyncio.ensure_future(self._stream_completion(messages, deltas, timeout))
+            # Marks the end of the output, also when the upstream call fails
+            upstream.add_done_callback(lambda _: deltas.put_nowait(None))
+            try:
+                while (delta := await deltas.get()) is not None:
+                    if include_tokens:
+                        yield ("token", delta)
+                    for event in parser.feed(delta):
+                        yield event
+                await upstream
+            except Exception as e:
+                yield ("error", {"message": f"Error analyzing contract: {str(e)}"})
+                return
+            finally:
+                upstream.cancel()
+            with span("parse_review"):
+                analysis = format_contract_review_response(parser.full_text())
+
+        if cache_key is not None and "raw_response" not in analysis and "failed_parts" not in analysis:
+            self.review_cache.set(cache_key, analysis)
+        yield ("result", analysis)
+
+    async def _stream_completion(self, messages: List[Dict[str, str]], deltas: "asyncio.Queue", timeout: Optional[float] = None):
+        """
+        Stream one contract review completion into `deltas` under the shared rate and concurrency limits.
+
+        The upstream stream is read to the end into the (unbounded) queue, so the
+        concurrency slot is released when the provider finishes rather than when
+        a slow client has read every event. Throttling and transient errors are
+        retried like _chat_completion until the first token has been forwarded;
+        after that a retry would repeat output, so the error is raised. Streams
+        are not hedged. Latency, token usage and metrics are recorded as for
+        _chat_completion.
+        """
+        openai = _openai()
+        estimated_tokens = estimate_tokens(messages, CONTRACT_REVIEW_PARAMS["max_tokens"])
+        forwarded = False
+
+        async def attempt():
+            nonlocal forwarded
+            queued = time.perf_counter()
+            charged_tokens = await self.rate_limiter.acquire(estimated_tokens)
+            usage = None
+            async with self.concurrency.slot():
+                record_stage("llm_queue", time.perf_counter() - queued)
+                started = time.monotonic()
+                try:
+                    with span("llm_request"):
+                        stream = await self.client.chat.completions.create(
+                            model=self.deployment_name,
+                            messages=messages,
+                            timeout=timeout or self.request_timeout,
+                            stream=True,
+                            # The final chunk then reports token usage
+                            stream_options={"include_usage": True},
+                            **CONTRACT_REVIEW_PARAMS
+                        )
+                        async for chunk in stream:
+                            usage = getattr(chunk, "usage", None) or usage
+                            if chunk.choices and chunk.choices[0].delta.content:
+                                deltas.put_nowait(chunk.choices[0].delta.content)
+                                forwarded = True
+                except openai.RateLimitError:
+                    LLM_REQUESTS.inc("rate_limited")
+                    self.concurrency.on_congestion()
+                    raise
+                except Exception:
+                    LLM_REQUESTS.inc("error")
+                    raise
+                self.concurrency.on_success(time.monotonic() - started)
+            LLM_REQUESTS.inc("ok")
+            record_llm_usage(usage)
+            self.rate_limiter.record_usage(charged_tokens, usage.total_tokens if usage else None)
+
+        await call_with_retries(
+            attempt,
+            retry_on=retryable_errors(),
+            max_retries=self.max_retries,
+            retry_after=_retry_after_seconds,
+            on_retry=self._on_retry,
+            give_up=lambda e: forwarded
+        )
+
+def _retry_after_seconds(error: BaseException) -> Optional[float]:
+    """Seconds requested by the provider's Retry-After header, if any."""
+    response = getattr(error, "response", None)
+    value = response.headers.get("retry-after") if response is not None else None
+    try:
+        return float(value) if value is not None else None
+    except ValueError:
+        return None
 
 # Initialize the global advisor agent (you may want to move this to a config or dependency injection)
 # agent = AdvisorAgent(openai_api_key="your-api-key", deployment_name="your-deployment-name")
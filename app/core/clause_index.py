@@ -0,0 +1,181 @@
+import hashlib
+import json
+import re
+import sqlite3
+import threading
+import zlib
+from collections import defaultdict
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from app.ai.tools.contract_reviewer import split_contract_sections
+from app.core.review_cache import normalize_contract_text
+
+# MinHash parameters: 64 hash functions in 16 LSH bands of 4 rows
+NUM_PERMUTATIONS = 64
+LSH_BANDS = 16
+SHINGLE_WORDS = 5
+_MERSENNE_PRIME = (1 << 31) - 1
+_rng = np.random.default_rng(20240611)
+_PERM_A = _rng.integers(1, _MERSENNE_PRIME, NUM_PERMUTATIONS, dtype=np.uint64)
+_PERM_B = _rng.integers(0, _MERSENNE_PRIME, NUM_PERMUTATIONS, dtype=np.uint64)
+
+_LEADING_NUMBERING = re.compile(r"^\s*(?:(?:section|article|clause)\s+)?(?:\d+(?:\.\d+)*[.)]?|\([a-z0-9]{1,3}\)|[ivxlc]+\.)\s*", re.IGNORECASE)
+_NON_WORD = re.compile(r"[^a-z0-9$%.]+")
+_NUMBER = re.compile(r"\d+(?:[.,]\d+)*")
+
+def segment_clauses(file_content: str, min_clause_chars: int = 300) -> List[str]:
+    """
+    Split a contract into clauses for fingerprinting.
+
+    Sections from split_contract_sections shorter than min_clause_chars are joined
+    with the following ones, so sub-clauses like "(a)", "(b)" stay with their parent
+    and every template produces the same clause boundaries.
+    """
+    clauses = []
+    current = ""
+    for section in split_contract_sections(file_content):
+        current = f"{current}\n{section}" if current else section
+        if len(current) >= min_clause_chars:
+            clauses.append(current)
+            current = ""
+    if current:
+        if clauses and len(current) < min_clause_chars:
+            clauses[-1] = f"{clauses[-1]}\n{current}"
+        else:
+            clauses.append(current)
+    return clauses
+
+def normalize_clause(clause: str) -> str:
+    """Normalize a clause for fingerprinting: case, whitespace, punctuation and its own numbering."""
+    text = normalize_contract_text(clause).lower()
+    text = _LEADING_NUMBERING.sub("", text)
+    return _NON_WORD.sub(" ", text).strip()
+
+def clause_fingerprint(normalized: str) -> str:
+    """Exact fingerprint of a normalized clause."""
+    return hashlib.sha256(normalized.encode("utf-8")).hexdigest()
+
+def minhash_signature(normalized: str) -> np.ndarray:
+    """MinHash signature over word shingles of a normalized clause."""
+    words = normalized.split()
+    if len(words) < SHINGLE_WORDS:
+        shingles = [" ".join(words)]
+    else:
+        shingles = [" ".join(words[i:i + SHINGLE_WORDS]) for i in range(len(words) - SHINGLE_WORDS + 1)]
+    hashes = np.fromiter((zlib.crc32(s.encode("utf-8")) & _MERSENNE_PRIME for s in set(shingles)), dtype=np.uint64)
+    # (a * x + b) mod p for every hash function and shingle, then the minimum per function
+    permuted = (_PERM_A[:, None] * hashes[None, :] + _PERM_B[:, None]) % _MERSENNE_PRIME
+    return permuted.min(axis=1).astype(np.uint32)
+
+def _numbers(normalized: str) -> Tuple[str, ...]:
+    return tuple(_NUMBER.findall(normalized))
+
+class ClauseIndex:
+    """
+    Fingerprint index of previously reviewed contract clauses and their findings.
+
+    Clauses are matched exactly by the hash of their normalized text, or as near
+    duplicates by MinHash similarity with LSH banding. A near duplicate is only
+    reused when it contains the same numbers (amounts, dates, percentages), so a
+    changed rent or late fee is always sent for review. Findings are scoped by
+    prompt version and model so a prompt change invalidates them.
+
+    Args:
+        path: SQLite file for persistence; memory only when None
+        similarity_threshold: Minimum estimated Jaccard similarity for a near-duplicate match
+    """
+
+    def __init__(self, path: Optional[str] = None, similarity_threshold: float = 0.9):
+        self.similarity_threshold = similarity_threshold
+        self.exact_hits = 0
+        self.near_hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path or ":memory:", check_same_thread=False, isolation_level=None)
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS clauses ("
+            "fingerprint TEXT NOT NULL, scope TEXT NOT NULL, signature BLOB NOT NULL, "
+            "numbers TEXT NOT NULL, findings TEXT NOT NULL, PRIMARY KEY (fingerprint, scope))"
+        )
+        # In-memory LSH buckets: (scope, band, band hash) -> fingerprints
+        self._buckets: Dict[Tuple[str, int, bytes], List[str]] = defaultdict(list)
+        self._signatures: Dict[Tuple[str, str], Tuple[np.ndarray, Tuple[str, ...]]] = {}
+        for fingerprint, scope, signature, numbers in self._conn.execute(
+            "SELECT fingerprint, scope, signature, numbers FROM clauses"
+        ):
+            self._index(fingerprint, scope, np.frombuffer(signature, dtype=np.uint32), tuple(json.loads(numbers)))
+
+    def _index(self, fingerprint: str, scope: str, signature: np.ndarray, numbers: Tuple[str, ...]):
+        self._signatures[(scope, fingerprint)] = (signature, numbers)
+        rows = NUM_PERMUTATIONS // LSH_BANDS
+        for band in range(LSH_BANDS):
+            self._buckets[(scope, band, signature[band * rows:(band + 1) * rows].tobytes())].append(fingerprint)
+
+    def _findings(self, fingerprint: str, scope: str) -> Optional[Dict[str, Any]]:
+        row = self._conn.execute(
+            "SELECT findings FROM clauses WHERE fingerprint = ? AND scope = ?", (fingerprint, scope)
+        ).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def lookup(self, clause: str, scope: str) -> Optional[Dict[str, Any]]:
+        """
+        Find stored findings for a clause.
+
+        Args:
+            clause: Clause text
+            scope: Prompt version and model the findings must come from
+
+        Returns:
+            Stored review dict for the clause, or None if it is novel
+        """
+        normalized = normalize_clause(clause)
+        fingerprint = clause_fingerprint(normalized)
+        with self._lock:
+            findings = self._findings(fingerprint, scope)
+            if findings is not None:
+                self.exact_hits += 1
+                return findings
+
+            signature = minhash_signature(normalized)
+            numbers = _numbers(normalized)
+            rows = NUM_PERMUTATIONS // LSH_BANDS
+            best, best_similarity = None, self.similarity_threshold
+            candidates = set()
+            for band in range(LSH_BANDS):
+                candidates.update(self._buckets.get((scope, band, signature[band * rows:(band + 1) * rows].tobytes()), ()))
+            for candidate in candidates:
+                candidate_signature, candidate_numbers = self._signatures[(scope, candidate)]
+                similarity = float(np.mean(candidate_signature == signature))
+                if similarity >= best_similarity and candidate_numbers == numbers:
+                    best, best_similarity = candidate, similarity
+            if best is not None:
+                self.near_hits += 1
+                return self._findings(best, scope)
+            self.misses += 1
+            return None
+
+    def add(self, clause: str, scope: str, findings: Dict[str, Any]):
+        """Store the review findings for a clause."""
+        normalized = normalize_clause(clause)
+        fingerprint = clause_fingerprint(normalized)
+        signature = minhash_signature(normalized)
+        numbers = _numbers(normalized)
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO clauses (fingerprint, scope, signature, numbers, findings) VALUES (?, ?, ?, ?, ?)",
+                (fingerprint, scope, signature.tobytes(), json.dumps(numbers), json.dumps(findings))
+            )
+            if (scope, fingerprint) not in self._signatures:
+                self._index(fingerprint, scope, signature, numbers)
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.exact_hits + self.near_hits + self.misses
+        return {
+            "clauses": len(self._signatures),
+            "exact_hits": self.exact_hits,
+            "near_duplicate_hits": self.near_hits,
+            "misses": self.misses,
+            "hit_rate": round((self.exact_hits + self.near_hits) / lookups, 4) if lookups else 0.0,
+        }
@@ -0,0 +1,279 @@
+import asyncio
+import itertools
+import json
+import os
+import sqlite3
+import threading
+import time
+import uuid
+from typing import Any, Dict, List, Optional
+
+from app.core.advisor import contract_review_error
+
+# Job and item states
+QUEUED = "queued"
+RUNNING = "running"
+COMPLETED = "completed"
+FAILED = "failed"
+CANCELLED = "cancelled"
+TERMINAL_STATES = (COMPLETED, FAILED, CANCELLED)
+
+# Default job database; jobs survive restarts
+DEFAULT_JOB_DB_PATH = "./data/jobs.sqlite"
+
+
+class QueueFullError(Exception):
+    """Raised when a batch does not fit in the review queue."""
+
+
+class JobStore:
+    """
+    SQLite-backed store for bulk review jobs and their items.
+
+    Args:
+        path: SQLite database file, created with its directory if missing
+            (":memory:" keeps jobs for the process lifetime only)
+    """
+
+    def __init__(self, path: str = DEFAULT_JOB_DB_PATH):
+        if path != ":memory:" and os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.executescript(
+            """
+            CREATE TABLE IF NOT EXISTS jobs (
+                id TEXT PRIMARY KEY,
+                status TEXT NOT NULL,
+                priority INTEGER NOT NULL,
+                total INTEGER NOT NULL,
+                created_at REAL NOT NULL,
+                updated_at REAL NOT NULL
+            );
+            CREATE TABLE IF NOT EXISTS job_items (
+                job_id TEXT NOT NULL,
+                idx INTEGER NOT NULL,
+                status TEXT NOT NULL,
+                file_content TEXT NOT NULL,
+                result TEXT,
+                PRIMARY KEY (job_id, idx)
+            );
+            CREATE INDEX IF NOT EXISTS job_items_status ON job_items (status);
+            """
+        )
+
+    def create_job(self, contracts: List[str], priority: int) -> str:
+        job_id = uuid.uuid4().hex
+        now = time.time()
+        with self._lock, self._conn:
+            self._conn.execute("BEGIN")
+            self._conn.execute(
+                "INSERT INTO jobs (id, status, priority, total, created_at, updated_at) VALUES (?, ?, ?, ?, ?, ?)",
+                (job_id, QUEUED, priority, len(contracts), now, now),
+            )
+            self._conn.executemany(
+                "INSERT INTO job_items (job_id, idx, status, file_content) VALUES (?, ?, ?, ?)",
+                [(job_id, i, QUEUED, content) for i, content in enumerate(contracts)],
+            )
+        return job_id
+
+    def item_content(self, job_id: str, idx: int) -> Optional[str]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT file_content FROM job_items WHERE job_id = ? AND idx = ? AND status = ?", (job_id, idx, QUEUED)
+            ).fetchone()
+        return row[0] if row else None
+
+    def set_item_status(self, job_id: str, idx: int, status: str, result: Optional[Dict[str, Any]] = None):
+        with self._lock:
+            self._conn.execute(
+                "UPDATE job_items SET status = ?, result = ? WHERE job_id = ? AND idx = ?",
+                (status, json.dumps(result) if result is not None else None, job_id, idx),
+            )
+            self._refresh_job(job_id)
+
+    def _refresh_job(self, job_id: str):
+        """Derive the job status from its items. Caller holds the lock."""
+        counts = dict(self._conn.execute(
+            "SELECT status, COUNT(*) FROM job_items WHERE job_id = ? GROUP BY status", (job_id,)
+        ).fetchall())
+        job_status = self._conn.execute("SELECT status FROM jobs WHERE id = ?", (job_id,)).fetchone()[0]
+        if job_status == CANCELLED:
+            return
+        if counts.get(QUEUED, 0) + counts.get(RUNNING, 0) == 0:
+            status = FAILED if counts.get(FAILED, 0) and not counts.get(COMPLETED, 0) else COMPLETED
+        elif counts.get(RUNNING, 0) or counts.get(COMPLETED, 0) or counts.get(FAILED, 0):
+            status = RUNNING
+        else:
+            status = QUEUED
+        self._conn.execute("UPDATE jobs SET status = ?, updated_at = ? WHERE id = ?", (status, time.time(), job_id))
+
+    def cancel_job(self, job_id: str) -> bool:
+        with self._lock:
+            row = self._conn.execute("SELECT status FROM jobs WHERE id = ?", (job_id,)).fetchone()
+            if row is None or row[0] in TERMINAL_STATES:
+                return False
+            self._conn.execute(
+                "UPDATE job_items SET status = ? WHERE job_id = ? AND status IN (?, ?)", (CANCELLED, job_id, QUEUED, RUNNING)
+            )
+            self._conn.execute("UPDATE jobs SET status = ?, updated_at = ? WHERE id = ?", (CANCELLED, time.time(), job_id))
+            return True
+
+    def job_status(self, job_id: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            job = self._conn.execute(
+                "SELECT status, priority, total, created_at, updated_at FROM jobs WHERE id = ?", (job_id,)
+            ).fetchone()
+            if job is None:
+                return None
+            counts = dict(self._conn.execute(
+                "SELECT status, COUNT(*) FROM job_items WHERE job_id = ? GROUP BY status", (job_id,)
+            ).fetchall())
+        status, priority, total, created_at, updated_at = job
+        return {
+            "job_id": job_id,
+            "status": status,
+            "priority": priority,
+            "total": total,
+            "queued": counts.get(QUEUED, 0),
+            "running": counts.get(RUNNING, 0),
+            "completed": counts.get(COMPLETED, 0),
+            "failed": counts.get(FAILED, 0),
+            "cancelled": counts.get(CANCELLED, 0),
+            "created_at": created_at,
+            "updated_at": updated_at,
+        }
+
+    def job_results(self, job_id: str) -> List[Dict[str, Any]]:
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT idx, status, result FROM job_items WHERE job_id = ? ORDER BY idx", (job_id,)
+            ).fetchall()
+        return [
+            {"index": idx, "status": status, "review": json.loads(result) if result else None}
+            for idx, status, result in rows
+        ]
+
+    def pending_items(self) -> List[tuple]:
+        """Items left queued or running by a previous process, as (priority, job_id, idx)."""
+        with self._lock:
+            self._conn.execute("UPDATE job_items SET status = ? WHERE status = ?", (QUEUED, RUNNING))
+            return self._conn.execute(
+                "SELECT jobs.priority, job_items.job_id, job_items.idx FROM job_items "
+                "JOIN jobs ON jobs.id = job_items.job_id WHERE job_items.status = ? "
+                "ORDER BY jobs.created_at, job_items.idx",
+                (QUEUED,),
+            ).fetchall()
+
+
+class ContractReviewQueue:
+    """
+    Bounded in-process queue with a worker pool for bulk contract reviews.
+
+    Jobs are persisted in a JobStore before they are queued, and unfinished items
+    are re-queued when the queue starts, so a restart does not lose work. Higher
+    priority jobs are served first; within a priority, items run in submission order.
+
+    Args:
+        agent: AdvisorAgent used to review each contract
+        store: Job store
+        max_pending: Maximum queued items; larger batches are rejected with QueueFullError
+        workers: Number of concurrent review workers
+    """
+
+    def __init__(self, agent, store: JobStore, max_pending: int = 1000, workers: int = 4):
+        self.agent = agent
+        self.store = store
+        self.max_pending = max_pending
+        self.workers = workers
+        self._queue: Optional[asyncio.PriorityQueue] = None
+        self._sequence = itertools.count()
+        self._worker_tasks: List[asyncio.Task] = []
+        # In-flight review tasks per job, so cancellation can interrupt them
+        self._running: Dict[str, Dict[int, asyncio.Task]] = {}
+
+    @property
+    def pending(self) -> int:
+        return self._queue.qsize() if self._queue is not None else 0
+
+    async def start(self):
+        """Start the workers and re-queue work left over from a previous run."""
+        if self._worker_tasks:
+            return
+        self._queue = asyncio.PriorityQueue()
+        for priority, job_id, idx in self.store.pending_items():
+            self._queue.put_nowait((-priority, next(self._sequence), job_id, idx))
+        self._worker_tasks = [asyncio.create_task(self._worker()) for _ in range(self.workers)]
+
+    async def stop(self):
+        """Stop the workers; unfinished items stay queued in the store."""
+        for task in self._worker_tasks:
+            task.cancel()
+        await asyncio.gather(*self._worker_tasks, return_exceptions=True)
+        self._worker_tasks = []
+
+    async def submit(self, contracts: List[str], priority: int = 0) -> str:
+        """
+        Submit a batch of contracts for review.
+
+        Args:
+            contracts: Contract texts
+            priority: Higher values are reviewed first
+
+        Returns:
+            The job id
+
+        Raises:
+            QueueFullError: If the batch does not fit in the queue
+        """
+        await self.start()
+        if self.pending + len(contracts) > self.max_pending:
+            raise QueueFullError(
+                f"Review queue is full ({self.pending} of {self.max_pending} items pending); retry later"
+            )
+        job_id = self.store.create_job(contracts, priority)
+        for idx in range(len(contracts)):
+            self._queue.put_nowait((-priority, next(self._sequence), job_id, idx))
+        return job_id
+
+    def cancel(self, job_id: str) -> bool:
+        """Cancel a job: queued items are skipped and in-flight reviews are interrupted."""
+        cancelled = self.store.cancel_job(job_id)
+        for task in self._running.get(job_id, {}).values():
+            task.cancel()
+        return cancelled
+
+    async def _worker(self):
+        while True:
+            _, _, job_id, idx = await self._queue.get()
+            try:
+                # Cancelled or already finished items no longer have queued content
+                file_content = self.store.item_content(job_id, idx)
+                if file_content is None:
+                    continue
+                self.store.set_item_status(job_id, idx, RUNNING)
+                task = asyncio.create_task(self.agent.analyze_contract(file_content, raise_errors=True))
+                self._running.setdefault(job_id, {})[idx] = task
+                try:
+                    review = await task
+                    status = COMPLETED
+                except asyncio.CancelledError:
+                    # cancel() marks the job in the store before interrupting its tasks; any other
+                    # cancellation (which also cancels the awaited task) means the worker is stopping
+                    # and the item is re-queued on restart
+                    if self.store.job_status(job_id)["status"] != CANCELLED:
+                        task.cancel()
+                        raise
+                    continue
+                except Exception as e:
+                    review = contract_review_error(e)
+                    status = FAILED
+                finally:
+                    self._running.get(job_id, {}).pop(idx, None)
+                    if not self._running.get(job_id):
+                        self._running.pop(job_id, None)
+                if self.store.job_status(job_id)["status"] != CANCELLED:
+                    self.store.set_item_status(job_id, idx, status, review)
+            finally:
+                self._queue.task_done()
@@ -0,0 +1,267 @@
+import asyncio
+import random
+import time
+from collections import deque
+from contextlib import asynccontextmanager
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple, Type
+
+# Rough characters-per-token ratio for English prompts
+CHARS_PER_TOKEN = 4
+
+
+def estimate_tokens(messages: List[Dict[str, str]], max_tokens: Optional[int] = None) -> int:
+    """Estimate the tokens a chat completion will consume: prompt length plus max_tokens."""
+    prompt_chars = sum(len(message.get("content") or "") for message in messages)
+    # A few tokens of overhead per message for roles and separators
+    return prompt_chars // CHARS_PER_TOKEN + 4 * len(messages) + (max_tokens or 0)
+
+
+class TokenBucket:
+    """
+    Async token bucket refilled continuously at `rate_per_minute`.
+
+    Args:
+        rate_per_minute: Units added per minute
+        burst_seconds: Bucket capacity, expressed as seconds of refill
+    """
+
+    def __init__(self, rate_per_minute: float, burst_seconds: float = 60.0):
+        self.capacity = rate_per_minute * burst_seconds / 60.0
+        self.rate = rate_per_minute / 60.0
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    def _refill(self):
+        now = time.monotonic()
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    async def acquire(self, amount: float = 1.0) -> float:
+        """
+        Wait until `amount` units are available and take them (FIFO across callers).
+
+        A request larger than the bucket waits for a full bucket and takes it into
+        debt, so later requests wait until the excess has been refilled.
+
+        Returns:
+            Units charged, for a later adjust()
+        """
+        needed = min(amount, self.capacity)
+        async with self._lock:
+            while True:
+                self._refill()
+                if self._tokens >= needed:
+                    self._tokens -= amount
+                    return amount
+                await asyncio.sleep((needed - self._tokens) / self.rate)
+
+    def adjust(self, delta: float):
+        """Return (positive) or charge (negative) units after the real usage is known."""
+        self._refill()
+        self._tokens = min(self.capacity, self._tokens + delta)
+
+    def pause(self, seconds: float):
+        """Drain the bucket so no request is admitted for about `seconds` (e.g. on Retry-After)."""
+        self._refill()
+        self._tokens = min(self._tokens, -seconds * self.rate)
+
+
+class LLMRateLimiter:
+    """
+    Shared requests-per-minute and tokens-per-minute limiter for LLM calls.
+
+    Each call reserves one request and its estimated tokens up front; once the
+    provider reports actual usage the difference is returned to (or charged to)
+    the token bucket. A call estimated above the burst size waits for a full
+    bucket and leaves it in debt, so the quota holds for large calls too.
+    Providers such as Azure OpenAI enforce per-minute quotas over
+    short windows, so bursts are limited to `burst_seconds` worth of quota; set
+    requests_per_minute a little below the real quota to leave headroom.
+
+    Args:
+        requests_per_minute: Request quota, None for no request limit
+        tokens_per_minute: Token quota, None for no token limit
+        burst_seconds: Largest burst allowed, in seconds of quota
+    """
+
+    def __init__(
+        self,
+        requests_per_minute: Optional[float] = None,
+        tokens_per_minute: Optional[float] = None,
+        burst_seconds: float = 1.0,
+    ):
+        self.requests = TokenBucket(requests_per_minute, burst_seconds) if requests_per_minute else None
+        self.tokens = TokenBucket(tokens_per_minute, burst_seconds) if tokens_per_minute else None
+
+    async def acquire(self, estimated_tokens: int) -> int:
+        """Wait for one request and the estimated tokens; returns the tokens charged, for record_usage()."""
+        if self.requests is not None:
+            await self.requests.acquire(1)
+        if self.tokens is not None:
+            return int(await self.tokens.acquire(estimated_tokens))
+        return 0
+
+    def record_usage(self, charged_tokens: int, actual_tokens: Optional[int]):
+        """Settle a call's token charge against the usage the provider reported."""
+        if self.tokens is not None and actual_tokens is not None:
+            self.tokens.adjust(charged_tokens - actual_tokens)
+
+    def pause(self, seconds: float):
+        """Hold back all new requests, e.g. when the provider sends Retry-After."""
+        for bucket in (self.requests, self.tokens):
+            if bucket is not None:
+                bucket.pause(seconds)
+
+
+class LatencyTracker:
+    """Sliding window of recent call latencies for quantile estimates."""
+
+    def __init__(self, window: int = 200):
+        self._samples = deque(maxlen=window)
+
+    def record(self, seconds: float):
+        self._samples.append(seconds)
+
+    def __len__(self) -> int:
+        return len(self._samples)
+
+    def quantile(self, q: float) -> Optional[float]:
+        if not self._samples:
+            return None
+        ordered = sorted(self._samples)
+        return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+
+class AdaptiveConcurrencyLimiter:
+    """
+    AIMD concurrency controller for LLM calls.
+
+    The limit grows additively (about +1 per limit's worth of successful calls)
+    and is cut multiplicatively when the provider throttles (429) or when the
+    smoothed recent latency rises above `latency_factor` times the long-run
+    median. Smoothing keeps isolated slow responses from shrinking the limit;
+    those are what hedging is for.
+
+    Args:
+        max_limit: Upper bound (and starting value) for concurrent calls
+        min_limit: Lower bound for concurrent calls
+        decrease_factor: Multiplier applied to the limit on congestion
+        latency_factor: Latency above this multiple of the median counts as congestion
+    """
+
+    def __init__(self, max_limit: int, min_limit: int = 1, decrease_factor: float = 0.5, latency_factor: float = 3.0):
+        self.max_limit = max_limit
+        self.min_limit = min_limit
+        self.decrease_factor = decrease_factor
+        self.latency_factor = latency_factor
+        self.limit = float(max_limit)
+        self.in_flight = 0
+        self.latencies = LatencyTracker()
+        self._recent_latency: Optional[float] = None
+        self._condition = asyncio.Condition()
+        # Only one decrease per round of in-flight calls, so a burst of 429s halves once
+        self._last_decrease = 0.0
+
+    @asynccontextmanager
+    async def slot(self):
+        """Hold one concurrency slot for the duration of a call."""
+        async with self._condition:
+            await self._condition.wait_for(lambda: self.in_flight < max(self.min_limit, int(self.limit)))
+            self.in_flight += 1
+        try:
+            yield
+        finally:
+            async with self._condition:
+                self.in_flight -= 1
+                self._condition.notify_all()
+
+    def on_success(self, latency: float):
+        median = self.latencies.quantile(0.5) if len(self.latencies) >= 20 else None
+        self.latencies.record(latency)
+        # Exponentially weighted recent latency
+        self._recent_latency = latency if self._recent_latency is None else 0.9 * self._recent_latency + 0.1 * latency
+        if median is not None and self._recent_latency > self.latency_factor * median:
+            self.on_congestion()
+        else:
+            self.limit = min(self.max_limit, self.limit + 1.0 / max(self.limit, 1.0))
+
+    def on_congestion(self):
+        now = time.monotonic()
+        recent = self.latencies.quantile(0.5) or 1.0
+        if now - self._last_decrease < recent:
+            return
+        self._last_decrease = now
+        self.limit = max(self.min_limit, self.limit * self.decrease_factor)
+
+
+def backoff_delay(attempt: int, base_delay: float, max_delay: float) -> float:
+    """Full-jitter exponential backoff for the given (0-based) retry attempt."""
+    return random.uniform(0, min(max_delay, base_delay * (2 ** attempt)))
+
+
+async def call_with_retries(
+    call: Callable[[], Awaitable[Any]],
+    retry_on: Tuple[Type[BaseException], ...],
+    max_retries: int = 3,
+    base_delay: float = 0.5,
+    max_delay: float = 30.0,
+    retry_after: Callable[[BaseException], Optional[float]] = lambda e: None,
+    on_retry: Callable[[BaseException], None] = lambda e: None,
+    give_up: Callable[[BaseException], bool] = lambda e: False,
+) -> Any:
+    """
+    Run `call`, retrying retryable errors with jittered exponential backoff.
+
+    Args:
+        call: Zero-argument coroutine function performing one attempt
+        retry_on: Exception types that are retried
+        max_retries: Retries after the first attempt
+        base_delay: Backoff base in seconds
+        max_delay: Backoff ceiling in seconds
+        retry_after: Extracts a server-requested delay (Retry-After) from an error
+        on_retry: Called with each retried error (e.g. to back off concurrency)
+        give_up: Returns True when an error must not be retried although its type is
+            retryable (e.g. a stream that already forwarded output)
+    """
+    for attempt in range(max_retries + 1):
+        try:
+            return await call()
+        except retry_on as e:
+            if attempt == max_retries or give_up(e):
+                raise
+            on_retry(e)
+            requested = retry_after(e)
+            delay = backoff_delay(attempt, base_delay, max_delay)
+            await asyncio.sleep(max(delay, requested) if requested is not None else delay)
+
+
+async def hedged_call(call: Callable[[], Awaitable[Any]], hedge_after: Optional[float]) -> Any:
+    """
+    Run `call`, starting a second identical attempt if the first is slower than `hedge_after`.
+
+    The first attempt to succeed wins and the other is cancelled. If one attempt
+    fails, the other is still awaited. With hedge_after None this is a plain call.
+    """
+    if hedge_after is None:
+        return await call()
+
+    first = asyncio.ensure_future(call())
+    done, _ = await asyncio.wait({first}, timeout=hedge_after)
+    if done:
+        return first.result()
+
+    second = asyncio.ensure_future(call())
+    pending = {first, second}
+    error = None
+    try:
+        while pending:
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                if task.exception() is None:
+                    return task.result()
+                error = task.exception()
+        raise error
+    finally:
+        for task in pending:
+            task.cancel()
@@ -0,0 +1,71 @@
+import hashlib
+import json
+import re
+import unicodedata
+from typing import Any, Optional
+from app.ai.tools.contract_reviewer import get_contract_review_prompt_version
+from app.core.cache import LRUCache, SQLiteCache, TieredCache
+from app.core.shared_cache import SharedMemoryCache
+
+_WHITESPACE = re.compile(r"\s+")
+
+def normalize_contract_text(text: str) -> str:
+    """
+    Normalize contract text so trivially different copies of a document share a cache key.
+
+    Applies Unicode NFKC normalization (folding e.g. non-breaking spaces and ligatures),
+    unifies curly quotes, and collapses all whitespace runs to a single space.
+    """
+    text = unicodedata.normalize("NFKC", text)
+    text = text.replace("\u2018", "'").replace("\u2019", "'").replace("\u201c", '"').replace("\u201d", '"')
+    return _WHITESPACE.sub(" ", text).strip()
+
+def contract_review_cache_key(file_content: str, model: str, **params: Any) -> str:
+    """
+    Build the content-addressed cache key for a contract review.
+
+    Args:
+        file_content: Contract text (normalized before hashing)
+        model: Model or deployment name
+        **params: Model parameters that affect the output (temperature, max_tokens, ...)
+
+    Returns:
+        Hex SHA-256 of the normalized text, prompt version, model and parameters
+    """
+    payload = json.dumps(
+        {
+            "text": hashlib.sha256(normalize_contract_text(file_content).encode("utf-8")).hexdigest(),
+            "prompt_version": get_contract_review_prompt_version(),
+            "model": model,
+            "params": params,
+        },
+        sort_keys=True,
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+def create_review_cache(
+    path: Optional[str] = None,
+    max_entries: int = 1024,
+    ttl: Optional[float] = 7 * 24 * 3600,
+    shared_path: Optional[str] = None,
+    shared_max_bytes: int = 64 * 1024 * 1024
+) -> TieredCache:
+    """
+    Create the contract review cache.
+
+    Args:
+        path: SQLite file for the persistent tier; memory only when None
+        max_entries: Size of the in-memory LRU tier
+        ttl: Time-to-live for cached reviews in seconds
+        shared_path: Memory-mapped SharedMemoryCache file shared by all worker
+            processes, used as the second tier instead of SQLite
+        shared_max_bytes: Byte budget of the shared tier
+
+    Returns:
+        TieredCache holding review dicts
+    """
+    if shared_path:
+        persistent = SharedMemoryCache(shared_path, max_bytes=shared_max_bytes, ttl=ttl)
+    else:
+        persistent = SQLiteCache(path, table="contract_reviews", ttl=ttl) if path else None
+    return TieredCache(memory=LRUCache(max_entries=max_entries, ttl=ttl), persistent=persistent)
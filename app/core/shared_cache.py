@@ -0,0 +1,288 @@
+import fcntl
+import hashlib
+import json
+import mmap
+import os
+import struct
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Dict, Optional, Tuple
+
+import numpy as np
+
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
+# First byte of every stored value: how the rest is encoded
+_MSGPACK = b"m"
+_JSON = b"j"
+
+
+def encode_value(value: Any) -> bytes:
+    """MessagePack when the msgpack package is installed, else JSON; tagged so either process can tell them apart."""
+    if msgpack is not None:
+        return _MSGPACK + msgpack.packb(value, default=str)
+    return _JSON + json.dumps(value, default=str, separators=(",", ":")).encode("utf-8")
+
+
+def decode_value(data: bytes) -> Any:
+    """Decode a value from encode_value(); raises ValueError for an encoding this process cannot read."""
+    tag, payload = data[:1], data[1:]
+    if tag == _MSGPACK and msgpack is not None:
+        return msgpack.unpackb(payload, raw=False, strict_map_key=False)
+    if tag == _JSON:
+        return json.loads(payload)
+    raise ValueError(f"cannot decode cached value with encoding {tag!r}")
+
+
+_MAGIC = b"PACACHE1"
+# magic, slot count, arena bytes, arena head, live bytes, entries, tombstones, evictions
+_HEADER = struct.Struct("<8s7Q")
+_HEADER_BYTES = 128
+_SLOT = np.dtype([
+    ("hash", "<u8"), ("offset", "<u8"), ("length", "<u4"), ("state", "<u4"), ("expires_at", "<f8"), ("accessed", "<u8"),
+])
+# The same layout for single-slot reads on the lookup path, which struct does faster than numpy
+_SLOT_STRUCT = struct.Struct("<QQIIdQ")
+_ACCESSED = struct.Struct("<Q")
+_EMPTY, _USED, _DELETED = 0, 1, 2
+_KEY_LENGTH = struct.Struct("<H")
+
+
+class SharedMemoryCache:
+    """
+    Key/value cache in a memory-mapped file shared by every process that opens it.
+
+    Values (JSON-like: dicts, lists, strings, numbers) are stored MessagePack
+    encoded (JSON without the msgpack package) in a fixed-size arena, indexed by an open-addressing hash table of
+    fixed-layout slots in the same file. Put the file on tmpfs (e.g. /dev/shm) for
+    a cache shared only by the running workers, or on disk to keep it across
+    restarts. All uvicorn workers then share one copy of each entry and each
+    other's warm-up.
+
+    Processes coordinate with flock() on the file: lookups hold a shared lock,
+    writes an exclusive one. When the arena or the slot table is full, expired
+    entries and then the least recently used ones are evicted down to 90% of
+    the budget and the survivors are compacted; access times are updated under
+    the shared lock, so the LRU order is approximate across processes.
+
+    Args:
+        path: Backing file; created if missing. An existing file keeps its own size.
+        max_bytes: Byte budget for encoded entries
+        max_entries: Entries the hash table is sized for (default: one per KB of budget)
+        ttl: Default time-to-live in seconds (None for no expiry)
+    """
+
+    def __init__(self, path: str, max_bytes: int = 64 * 1024 * 1024, max_entries: Optional[int] = None, ttl: Optional[float] = None):
+        self.path = path
+        self.ttl = ttl
+        self._slot_count = 2 * (max_entries or max(1024, max_bytes // 1024))
+        self._arena_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._pid = None
+        self._open()
+
+    def _open(self):
+        self._fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o600)
+        self._pid = os.getpid()
+        fcntl.flock(self._fd, fcntl.LOCK_EX)
+        try:
+            header = os.pread(self._fd, _HEADER.size, 0)
+            if len(header) == _HEADER.size and header[:8] == _MAGIC:
+                _, self._slot_count, self._arena_bytes = _HEADER.unpack(header)[:3]
+            else:
+                os.ftruncate(self._fd, 0)
+                os.ftruncate(self._fd, self._file_size())
+                os.pwrite(self._fd, _HEADER.pack(_MAGIC, self._slot_count, self._arena_bytes, 0, 0, 0, 0, 0), 0)
+            if os.fstat(self._fd).st_size < self._file_size():
+                os.ftruncate(self._fd, self._file_size())
+            self._mm = mmap.mmap(self._fd, self._file_size())
+        finally:
+            fcntl.flock(self._fd, fcntl.LOCK_UN)
+        self._slots = np.ndarray(self._slot_count, dtype=_SLOT, buffer=self._mm, offset=_HEADER_BYTES)
+        self._arena_offset = _HEADER_BYTES + self._slot_count * _SLOT.itemsize
+
+    def _file_size(self) -> int:
+        return _HEADER_BYTES + self._slot_count * _SLOT.itemsize + self._arena_bytes
+
+    @contextmanager
+    def _locked(self, operation: int):
+        with self._lock:
+            if self._pid != os.getpid():
+                # A forked child shares the parent's file description, and flock would not exclude it
+                os.close(self._fd)
+                self._open()
+            fcntl.flock(self._fd, operation)
+            try:
+                yield
+            finally:
+                fcntl.flock(self._fd, fcntl.LOCK_UN)
+
+    def _header(self) -> list:
+        return list(_HEADER.unpack_from(self._mm, 0))
+
+    def _write_header(self, header: list):
+        _HEADER.pack_into(self._mm, 0, *header)
+
+    @staticmethod
+    def _hash(key: bytes) -> int:
+        # 0 is never a valid hash so a zeroed slot is unambiguous
+        return int.from_bytes(hashlib.blake2b(key, digest_size=8).digest(), "little") or 1
+
+    def _find(self, key: bytes, key_hash: int) -> Tuple[int, Optional[tuple]]:
+        """Index and fields of the slot holding key, or (-1, None)."""
+        mm = self._mm
+        i = key_hash % self._slot_count
+        for _ in range(self._slot_count):
+            slot = _SLOT_STRUCT.unpack_from(mm, _HEADER_BYTES + i * _SLOT_STRUCT.size)
+            state = slot[3]
+            if state == _EMPTY:
+                break
+            if state == _USED and slot[0] == key_hash:
+                start = self._arena_offset + slot[1]
+                (key_length,) = _KEY_LENGTH.unpack_from(mm, start)
+                if mm[start + 2:start + 2 + key_length] == key:
+                    return i, slot
+            i = (i + 1) % self._slot_count
+        return -1, None
+
+    def _insert_slot(self, key_hash: int, offset: int, length: int, expires_at: float, accessed: int):
+        i = key_hash % self._slot_count
+        while self._slots[i]["state"] == _USED:
+            i = (i + 1) % self._slot_count
+        # Publish the slot after its entry bytes are written
+        self._slots[i] = (key_hash, offset, length, _USED, expires_at, accessed)
+
+    def get(self, key: str) -> Optional[Any]:
+        encoded_key = key.encode("utf-8")
+        with self._locked(fcntl.LOCK_SH):
+            i, slot = self._find(encoded_key, self._hash(encoded_key))
+            if slot is None:
+                return None
+            _, offset, length, _, expires_at, _ = slot
+            if expires_at and expires_at <= time.time():
+                return None
+            _ACCESSED.pack_into(self._mm, _HEADER_BYTES + i * _SLOT_STRUCT.size + 32, time.monotonic_ns())
+            start = self._arena_offset + offset
+            data = self._mm[start + 2 + len(encoded_key):start + length]
+        try:
+            return decode_value(data)
+        except ValueError:
+            # Written by a process that has msgpack installed; treat it as a miss
+            return None
+
+    def set(self, key: str, value: Any, ttl: Optional[float] = None):
+        ttl = self.ttl if ttl is None else ttl
+        expires_at = time.time() + ttl if ttl is not None else 0.0
+        encoded_key = key.encode("utf-8")
+        record = _KEY_LENGTH.pack(len(encoded_key)) + encoded_key + encode_value(value)
+        if len(record) > self._arena_bytes or len(encoded_key) > 0xFFFF:
+            return
+        key_hash = self._hash(encoded_key)
+        with self._locked(fcntl.LOCK_EX):
+            self._remove(encoded_key, key_hash)
+            header = self._header()
+            head, entries, tombstones = header[3], header[5], header[6]
+            if head + len(record) > self._arena_bytes or entries + tombstones + 1 > self._slot_count * 3 // 4:
+                self._compact(len(record))
+                header = self._header()
+            head = header[3]
+            self._mm[self._arena_offset + head:self._arena_offset + head + len(record)] = record
+            self._insert_slot(key_hash, head, len(record), expires_at, time.monotonic_ns())
+            header[3] += len(record)
+            header[4] += len(record)
+            header[5] += 1
+            self._write_header(header)
+
+    def _remove(self, encoded_key: bytes, key_hash: int) -> bool:
+        i, slot = self._find(encoded_key, key_hash)
+        if slot is None:
+            return False
+        header = self._header()
+        header[4] -= slot[2]
+        header[5] -= 1
+        header[6] += 1
+        self._slots[i]["state"] = _DELETED
+        self._write_header(header)
+        return True
+
+    def delete(self, key: str):
+        encoded_key = key.encode("utf-8")
+        with self._locked(fcntl.LOCK_EX):
+            self._remove(encoded_key, self._hash(encoded_key))
+
+    def _compact(self, needed: int = 0) -> int:
+        """
+        Drop expired entries, evict least recently used ones until needed bytes fit
+        within 90% of the budget, and pack the survivors to the start of the arena.
+
+        Returns:
+            Number of entries removed
+        """
+        slots = self._slots
+        live = np.flatnonzero(slots["state"] == _USED)
+        expires_at = slots["expires_at"][live]
+        live = live[(expires_at == 0) | (expires_at > time.time())]
+        expired = int((slots["state"] == _USED).sum()) - len(live)
+
+        # Most recently used first; keep entries while they fit the byte and slot targets
+        live = live[np.argsort(slots["accessed"][live])[::-1]]
+        sizes = np.cumsum(slots["length"][live].astype(np.int64))
+        keep = (sizes + needed <= self._arena_bytes * 9 // 10) & (np.arange(len(live)) < self._slot_count * 9 // 20)
+        kept = live[keep]
+        header = self._header()
+        header[7] += len(live) - len(kept)
+
+        # Entries only move towards the start of the arena, so moving them in offset order is safe
+        kept = kept[np.argsort(slots["offset"][kept])]
+        records = slots[kept].copy()
+        head = 0
+        for record in records:
+            length = int(record["length"])
+            if int(record["offset"]) != head:
+                self._mm.move(self._arena_offset + head, self._arena_offset + int(record["offset"]), length)
+            record["offset"] = head
+            head += length
+        slots[:] = np.zeros(1, dtype=_SLOT)
+        for record in records:
+            self._insert_slot(int(record["hash"]), int(record["offset"]), int(record["length"]), float(record["expires_at"]), int(record["accessed"]))
+
+        header[3] = head
+        header[4] = head
+        header[5] = len(records)
+        header[6] = 0
+        self._write_header(header)
+        return expired + len(live) - len(kept)
+
+    def purge_expired(self) -> int:
+        """Remove expired entries (and compact the arena); returns how many entries were removed."""
+        with self._locked(fcntl.LOCK_EX):
+            return self._compact(-self._arena_bytes)
+
+    def clear(self):
+        with self._locked(fcntl.LOCK_EX):
+            self._slots[:] = np.zeros(1, dtype=_SLOT)
+            self._write_header([_MAGIC, self._slot_count, self._arena_bytes, 0, 0, 0, 0, self._header()[7]])
+
+    def __len__(self) -> int:
+        with self._locked(fcntl.LOCK_SH):
+            return self._header()[5]
+
+    def stats(self) -> Dict[str, Any]:
+        with self._locked(fcntl.LOCK_SH):
+            header = self._header()
+        return {
+            "entries": header[5],
+            "bytes_used": header[4],
+            "max_bytes": self._arena_bytes,
+            "evictions": header[7],
+        }
+
+    def close(self):
+        with self._lock:
+            self._slots = None
+            self._mm.close()
+            os.close(self._fd)
@@ -1,10 +1,44 @@
+import asyncio
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
+from fastapi.responses import PlainTextResponse
+from app.ai.tools.document_parser import shutdown_parser_pool
+from app.core import metrics
 from app.routes import http_server
 
-app = FastAPI()
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Routes receive these through dependencies (http_server.get_agent, get_review_queue, ...), so
+    # importing the app stays cheap and reference data is only loaded by a starting worker
+    app.state.address_index = http_server.create_address_index()
+    app.state.comparables_index = http_server.create_comparables_index()
+    app.state.market_rollups = http_server.create_market_rollups()
+    app.state.property_data_loader = http_server.PropertyDataLoader(
+        http_server.create_property_cache(), http_server.create_property_aggregator(), app.state.market_rollups
+    )
+    app.state.underwriting_sessions = http_server.create_underwriting_sessions()
+    app.state.agent = http_server.create_advisor_agent()
+    app.state.review_queue = http_server.create_review_queue(app.state.agent)
+    # Resume bulk review jobs left unfinished by a previous run
+    await app.state.review_queue.start()
+    # Startup does not wait for the LLM client import; it finishes in the background
+    preload = asyncio.create_task(app.state.agent.preload())
+    yield
+    await preload
+    await app.state.review_queue.stop()
+    await app.state.agent.aclose()
+    shutdown_parser_pool()
+    http_server.save_market_rollups(app.state.market_rollups)
+
+app = FastAPI(lifespan=lifespan)
+app.add_middleware(metrics.MetricsMiddleware)
 
 app.include_router(http_server.router, prefix="/api")
 
 @app.get("/healthcheck")
 def healthcheck():
     return {"status": "healthy"}
+
+@app.get("/metrics", response_class=PlainTextResponse)
+def prometheus_metrics():
+    return PlainTextResponse(metrics.registry.render(), media_type=metrics.CONTENT_TYPE)
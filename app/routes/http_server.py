@@ -1,25 +1,205 @@
-from fastapi import APIRouter, Request, File, UploadFile
-from pydantic import BaseModel
-from typing import List
-from app.ai.advisor import AdvisorAgent
-from app.services.property_data_provider import get_property_data
-from app.services.calculations import calculate_property_metrics
+from fastapi import APIRouter, Depends, HTTPException, Request
+from fastapi.responses import Response, StreamingResponse
+from pydantic import BaseModel, Field
+from typing import Dict, List, Optional
+import numpy as np
+from app.core.advisor import AdvisorAgent
+from app.ai.tools.document_parser import aiter_document_pages
+from app.ai.tools.review_stream import format_sse_event
+from app.core.clause_index import ClauseIndex
+from app.core.job_queue import DEFAULT_JOB_DB_PATH, TERMINAL_STATES, ContractReviewQueue, JobStore, QueueFullError
+from app.core.metrics import span
+from app.core.review_cache import create_review_cache
+from app.services.address_parser import AddressIndex, InvalidAddressError, load_address_index
+from app.services.comparables import ComparablesIndex
+from app.services.property_aggregator import FunctionSource, PropertyDataAggregator, PropertyDataUnavailableError
+from app.services.property_cache import PropertyDataCache
+from app.services.property_data_provider import PropertyData, get_property_data
+from app.services.calculations import (
+    calculate_property_metrics,
+    calculate_property_metrics_batch,
+    metric_inputs_from_property_data,
+)
+from app.services.cash_flow_projection import MAX_HOLD_YEARS, project_hold_period_batch
+from app.services.financing import financing_scenarios
+from app.services.market_rollups import MarketRollupStore
+from app.services.risk_analysis import MAX_SENSITIVITY_SCENARIOS, sensitivity_grid, simulate_property_risk
+from app.services.underwriting_session import UnderwritingSession, UnderwritingSessionStore
+import asyncio
+import hashlib
+import math
 import os
+import struct
+import tempfile
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
 
 router = APIRouter()
 
-# Initialize the advisor agent (you may want to move this to a config file)
-agent = AdvisorAgent(
-    openai_api_key=os.getenv("OPENAI_API_KEY", "your-api-key"),
-    deployment_name=os.getenv("OPENAI_DEPLOYMENT_NAME", "your-deployment-name"),
-    api_base=os.getenv("OPENAI_API_BASE")
-)
+def create_advisor_agent() -> AdvisorAgent:
+    """Build the advisor agent from the environment; called by the application lifespan."""
+    return AdvisorAgent(
+        openai_api_key=os.getenv("OPENAI_API_KEY", "your-api-key"),
+        deployment_name=os.getenv("OPENAI_DEPLOYMENT_NAME", "your-deployment-name"),
+        api_base=os.getenv("OPENAI_API_BASE"),
+        api_version=os.getenv("OPENAI_API_VERSION"),
+        max_concurrent_requests=int(os.getenv("OPENAI_MAX_CONCURRENT_REQUESTS", "8")),
+        request_timeout=float(os.getenv("OPENAI_REQUEST_TIMEOUT", "60")),
+        requests_per_minute=float(os.getenv("OPENAI_REQUESTS_PER_MINUTE", "0")) or None,
+        tokens_per_minute=float(os.getenv("OPENAI_TOKENS_PER_MINUTE", "0")) or None,
+        hedge_requests=os.getenv("OPENAI_HEDGE_REQUESTS", "").lower() in ("1", "true", "yes"),
+        review_cache=create_review_cache(
+            path=os.getenv("CONTRACT_REVIEW_CACHE_PATH"),
+            max_entries=int(os.getenv("CONTRACT_REVIEW_CACHE_SIZE", "1024")),
+            shared_path=os.getenv("CONTRACT_REVIEW_SHARED_CACHE_PATH"),
+            shared_max_bytes=int(os.getenv("CONTRACT_REVIEW_SHARED_CACHE_BYTES", str(64 * 1024 * 1024)))
+        ),
+        chunk_size_chars=int(os.getenv("CONTRACT_REVIEW_CHUNK_CHARS", "12000")),
+        # Clause-level reuse of findings for boilerplate; enabled by giving the index a file
+        clause_index=ClauseIndex(os.getenv("CONTRACT_CLAUSE_INDEX_PATH")) if os.getenv("CONTRACT_CLAUSE_INDEX_PATH") else None
+    )
+
+def create_review_queue(agent: AdvisorAgent) -> ContractReviewQueue:
+    """Bulk review jobs; the lifespan starts and stops the workers."""
+    return ContractReviewQueue(
+        agent,
+        JobStore(os.getenv("CONTRACT_REVIEW_JOB_DB", DEFAULT_JOB_DB_PATH)),
+        max_pending=int(os.getenv("CONTRACT_REVIEW_QUEUE_SIZE", "1000")),
+        workers=int(os.getenv("CONTRACT_REVIEW_WORKERS", "4"))
+    )
+
+def get_agent(request: Request) -> AdvisorAgent:
+    """Dependency: the agent created by the application lifespan."""
+    return request.app.state.agent
+
+def get_review_queue(request: Request) -> ContractReviewQueue:
+    """Dependency: the bulk review queue created by the application lifespan."""
+    return request.app.state.review_queue
+
+def create_address_index() -> AddressIndex:
+    """Street/ZIP reference data for address autocomplete and ZIP lookups."""
+    return load_address_index(os.getenv("ADDRESS_REFERENCE_PATH"))
+
+def create_comparables_index() -> ComparablesIndex:
+    """Comparable properties, memory-mapped from a store written by ComparablesIndex.save()."""
+    path = os.getenv("COMPARABLES_INDEX_PATH")
+    return ComparablesIndex.load(path) if path else ComparablesIndex()
+
+# Per-ZIP/county market rollups; loaded from a file written by MarketRollupStore.save()
+MARKET_ROLLUPS_PATH = os.getenv("MARKET_ROLLUPS_PATH")
+
+def create_market_rollups() -> MarketRollupStore:
+    if MARKET_ROLLUPS_PATH and os.path.exists(MARKET_ROLLUPS_PATH):
+        return MarketRollupStore.load(MARKET_ROLLUPS_PATH)
+    return MarketRollupStore()
+
+def save_market_rollups(market_rollups: MarketRollupStore):
+    """
+    Merge the listings this worker ingested into MARKET_ROLLUPS_PATH; called by the
+    application lifespan on shutdown. Workers merge under a file lock, so each one's
+    listings are kept; other workers see them after a restart.
+    """
+    if MARKET_ROLLUPS_PATH and market_rollups.modified:
+        market_rollups.merge_into(MARKET_ROLLUPS_PATH)
+
+def create_property_aggregator() -> PropertyDataAggregator:
+    """Property data sources queried in parallel; the placeholder provider is the lowest-priority fallback."""
+    return PropertyDataAggregator(
+        [FunctionSource("placeholder", get_property_data, priority=-100)],
+        deadline=float(os.getenv("PROPERTY_DATA_DEADLINE", "2.0"))
+    )
+
+def create_property_cache() -> PropertyDataCache:
+    """
+    Property data cache shared by all property routes; PROPERTY_DATA_SHARED_CACHE_PATH
+    (e.g. on /dev/shm) shares the second tier between uvicorn workers.
+    """
+    return PropertyDataCache(
+        path=os.getenv("PROPERTY_DATA_CACHE_PATH"),
+        max_entries=int(os.getenv("PROPERTY_DATA_CACHE_SIZE", "10000")),
+        shared_path=os.getenv("PROPERTY_DATA_SHARED_CACHE_PATH"),
+        shared_max_bytes=int(os.getenv("PROPERTY_DATA_SHARED_CACHE_BYTES", str(64 * 1024 * 1024)))
+    )
+
+def create_underwriting_sessions() -> UnderwritingSessionStore:
+    """
+    What-if underwriting sessions, held in this worker's memory; with several workers a
+    session's requests must reach the worker that created it (sticky routing on the session id).
+    """
+    return UnderwritingSessionStore(
+        max_sessions=int(os.getenv("UNDERWRITING_SESSION_LIMIT", "10000")),
+        idle_timeout=float(os.getenv("UNDERWRITING_SESSION_IDLE_SECONDS", "1800"))
+    )
+
+class PropertyDataLoader:
+    """
+    Cached property data from the aggregated sources, with market fields from the
+    ZIP/county rollups when they cover the property.
+    """
+
+    def __init__(self, cache: PropertyDataCache, aggregator: PropertyDataAggregator, market_rollups: MarketRollupStore):
+        self.cache = cache
+        self.aggregator = aggregator
+        self.market_rollups = market_rollups
+
+    async def load(self, address) -> PropertyData:
+        """Property data for an address; 422 for an empty address, 503 if the sources cannot provide a complete record."""
+        try:
+            with span("property_data"):
+                property_data = await self.cache.get(address, self.aggregator.get)
+        except PropertyDataUnavailableError as e:
+            raise HTTPException(status_code=503, detail=str(e))
+        except InvalidAddressError as e:
+            raise HTTPException(status_code=422, detail=str(e))
+        return self.market_rollups.apply(property_data) if len(self.market_rollups) else property_data
+
+def get_address_index(request: Request) -> AddressIndex:
+    return request.app.state.address_index
+
+def get_comparables_index(request: Request) -> ComparablesIndex:
+    return request.app.state.comparables_index
+
+def get_market_rollups(request: Request) -> MarketRollupStore:
+    return request.app.state.market_rollups
+
+def get_property_data_loader(request: Request) -> PropertyDataLoader:
+    return request.app.state.property_data_loader
+
+def get_underwriting_sessions(request: Request) -> UnderwritingSessionStore:
+    return request.app.state.underwriting_sessions
+
+# Property insights are serialized from plain dicts with orjson, skipping response model validation of
+# data the service computed itself; set PROPERTY_INSIGHT_FAST_PATH=0 to validate every response
+INSIGHT_FAST_PATH = orjson is not None and os.getenv("PROPERTY_INSIGHT_FAST_PATH", "1").lower() in ("1", "true", "yes")
+# Part of every property insight ETag; bump when the response format or calculations change
+INSIGHT_ETAG_VERSION = "1"
+
+# Largest contract upload accepted, in bytes
+CONTRACT_UPLOAD_MAX_BYTES = int(os.getenv("CONTRACT_UPLOAD_MAX_BYTES", str(50 * 1024 * 1024)))
+
+class MarketListing(BaseModel):
+    zip_code: Optional[str] = None
+    county: Optional[str] = None
+    property_type: Optional[str] = None
+    monthly_rent: Optional[float] = None
+    square_feet: Optional[float] = None
+    vacancy_rate: Optional[float] = Field(None, ge=0, le=1)
 
 class PropertyInsightRequest(BaseModel):
     address: str
 
 class SimilarProperty(BaseModel):
     address: str
+    distance_km: Optional[float] = None
+    similarity_score: Optional[float] = None  # lower is more similar
+    property_type: Optional[str] = None
+    bedrooms: Optional[float] = None
+    bathrooms: Optional[float] = None
+    square_feet: Optional[float] = None
+    year_built: Optional[float] = None
 
 class PropertyInsightResponse(BaseModel):
     proper_address: str
@@ -37,6 +217,130 @@ class PropertyInsightResponse(BaseModel):
     total_expenses: float
     expense_breakdown: dict
 
+class AddressSuggestion(BaseModel):
+    street: str
+    city: str
+    state: str
+    zip_code: str
+    full_address: str
+
+class BatchPropertyMetricsRequest(BaseModel):
+    # One value per property; None entries in estimated expenses use the default estimates
+    purchase_price: List[float]
+    annual_rental_income: List[float]
+    other_income: Optional[List[float]] = None
+    property_taxes: Optional[List[Optional[float]]] = None
+    insurance: Optional[List[Optional[float]]] = None
+    property_management: Optional[List[Optional[float]]] = None
+    maintenance_repairs: Optional[List[Optional[float]]] = None
+    utilities: Optional[List[float]] = None
+    vacancy_rate: Optional[List[float]] = None
+
+class BatchPropertyMetricsResponse(BaseModel):
+    count: int
+    cap_rate: List[float]
+    noi: List[float]
+    gross_income: List[float]
+    effective_gross_income: List[float]
+    vacancy_loss: List[float]
+    total_expenses: List[float]
+    expense_breakdown: Dict[str, List[float]]
+
+class PropertyRiskRequest(BaseModel):
+    address: str
+    n_scenarios: int = Field(10_000, ge=100, le=200_000)
+    seed: Optional[int] = None
+    rent_volatility: float = 0.05
+    vacancy_volatility: float = 0.02
+    expense_inflation: float = 0.03
+    expense_volatility: float = 0.01
+    # Optional deterministic sensitivity grid, at most MAX_SENSITIVITY_SCENARIOS points in total
+    grid_vacancy_rates: Optional[List[float]] = Field(None, max_length=MAX_SENSITIVITY_SCENARIOS)
+    grid_rent_changes: List[float] = Field([0.0], max_length=MAX_SENSITIVITY_SCENARIOS)
+    grid_expense_changes: List[float] = Field([0.0], max_length=MAX_SENSITIVITY_SCENARIOS)
+
+class PropertyRiskResponse(BaseModel):
+    proper_address: str
+    n_scenarios: int
+    noi: Dict[str, float]
+    cap_rate: Dict[str, float]
+    probability_negative_noi: float
+    sensitivity_grid: Optional[dict] = None
+
+class HoldPeriodRequest(BaseModel):
+    address: str
+    horizons: List[int] = Field([5, 10], min_length=1, max_length=MAX_HOLD_YEARS)
+    discount_rate: float = 0.08
+    selling_cost_rate: float = 0.06
+    expense_growth_rate: float = 0.03
+    # Override the market growth assumptions from the property data
+    rent_growth_rate: Optional[float] = None
+    appreciation_rate: Optional[float] = None
+
+class HoldPeriodResult(BaseModel):
+    horizon_years: int
+    resale_value: float
+    net_sale_proceeds: float
+    npv: float
+    irr: Optional[float]  # percent, None when the cash flows have no IRR
+    equity_multiple: Optional[float]  # None without a purchase price
+
+class HoldPeriodResponse(BaseModel):
+    proper_address: str
+    projected_noi: List[float]
+    results: List[HoldPeriodResult]
+
+class FinancingScenariosRequest(BaseModel):
+    address: str
+    interest_rates: List[float] = Field(..., min_length=1)
+    ltvs: List[float] = Field(..., min_length=1)
+    amortization_years: List[float] = Field([30], min_length=1)
+    interest_only_years: List[int] = Field([0], min_length=1)
+    closing_cost_rate: float = 0.03
+    # Override the listing price used to size the loans
+    purchase_price: Optional[float] = Field(None, gt=0)
+    balance_after_years: Optional[float] = Field(None, ge=0)
+
+class FinancingScenariosResponse(BaseModel):
+    proper_address: str
+    noi: float
+    # Grid axes; every metric below is a flat list in [rate][ltv][amortization][interest_only] order
+    interest_rates: List[float]
+    ltvs: List[float]
+    amortization_years: List[float]
+    interest_only_years: List[float]
+    shape: List[int]
+    loan_amount: List[float]
+    annual_debt_service: List[float]
+    amortizing_debt_service: List[float]
+    dscr: List[Optional[float]]  # None for an all-cash purchase
+    amortizing_dscr: List[Optional[float]]
+    cash_flow: List[float]
+    cash_on_cash: List[Optional[float]]  # percent
+    break_even_occupancy: List[Optional[float]]  # percent
+    loan_balance: Optional[List[float]] = None
+
+class UnderwritingSessionRequest(BaseModel):
+    address: str
+    # Overrides of the property's inputs, e.g. {"vacancy_rate": 0.08}
+    inputs: Dict[str, Optional[float]] = {}
+
+class UnderwritingSessionResponse(BaseModel):
+    session_id: str
+    proper_address: Optional[str] = None
+    inputs: Dict[str, Optional[float]]
+    metrics: dict
+
+class UnderwritingUpdateRequest(BaseModel):
+    # Input changes; None restores the default estimate of an estimated expense
+    changes: Dict[str, Optional[float]] = Field(..., min_length=1)
+
+class UnderwritingUpdateResponse(BaseModel):
+    session_id: str
+    # Only the outputs whose value changed, shaped like the full metrics
+    changed: dict
+    recomputed: int
+
 class ContractReviewResponse(BaseModel):
     summary: str
     highlights: List[str]
@@ -46,53 +350,449 @@ class ContractReviewResponse(BaseModel):
 class ContractReviewRequest(BaseModel):
     file_content: str
 
+class ContractReviewStreamRequest(ContractReviewRequest):
+    # Also forward the raw model output as "token" events
+    include_tokens: bool = False
+
+class ContractReviewJobRequest(BaseModel):
+    contracts: List[str] = Field(..., min_length=1)
+    # Higher values are reviewed first
+    priority: int = 0
+
+class ContractReviewJobStatus(BaseModel):
+    job_id: str
+    status: str
+    priority: int
+    total: int
+    queued: int
+    running: int
+    completed: int
+    failed: int
+    cancelled: int
+    created_at: float
+    updated_at: float
+
+class ContractReviewJobItem(BaseModel):
+    index: int
+    status: str
+    review: Optional[ContractReviewResponse] = None
+
+def to_contract_review_response(analysis: dict) -> ContractReviewResponse:
+    return ContractReviewResponse(
+        summary=analysis.get("summary", ""),
+        highlights=analysis.get("highlights", []),
+        warnings=analysis.get("warnings", []),
+        suggestions=analysis.get("suggestions", [])
+    )
+
+def property_insight_etag(property_data: PropertyData, inputs: Dict[str, float], comparables_count: int = 0) -> str:
+    """
+    ETag for a property insight: the property data version (last_updated) plus the
+    inputs that can change without it (metric inputs, rollup market fields, the
+    comparables dataset size).
+    """
+    market = property_data.market
+    # Missing values (expenses left to the default estimates, absent market fields) hash as NaN
+    numbers = [inputs[name] for name in sorted(inputs)] + [
+        market.median_rent_per_sqft, market.average_rent_nearby, market.vacancy_rate, market.rent_growth_rate, market.market_appreciation_rate
+    ]
+    numbers = [math.nan if value is None else value for value in numbers]
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(f"{INSIGHT_ETAG_VERSION}|{property_data.address.full_address}|{property_data.last_updated.isoformat()}|{comparables_count}".encode("utf-8"))
+    digest.update(struct.pack(f"<{len(numbers)}d", *numbers))
+    return '"' + digest.hexdigest() + '"'
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """Whether an If-None-Match header matches the ETag (weak comparison, as for GET)."""
+    if not if_none_match:
+        return False
+    candidates = [candidate.strip() for candidate in if_none_match.split(",")]
+    return "*" in candidates or any(candidate.removeprefix("W/") == etag for candidate in candidates)
+
+def property_insight_payload(property_data: PropertyData, metrics: dict, similar_properties: List[dict]) -> dict:
+    """PropertyInsightResponse fields, in model order, as a plain dict."""
+    return {
+        "proper_address": property_data.address.full_address,
+        "county": property_data.address.county,
+        "zip_code": property_data.address.zip_code,
+        "state": property_data.address.state,
+        "estimate_monthly_rent": property_data.financial.monthly_rent,
+        "similar_properties": similar_properties,
+        # Include all calculated metrics
+        "cap_rate": metrics["cap_rate"],
+        "noi": metrics["noi"],
+        "gross_income": metrics["gross_income"],
+        "effective_gross_income": metrics["effective_gross_income"],
+        "vacancy_loss": metrics["vacancy_loss"],
+        "total_expenses": metrics["total_expenses"],
+        "expense_breakdown": metrics["expense_breakdown"],
+    }
+
+def serialize_property_insight(payload: dict, fast_path: bool = INSIGHT_FAST_PATH) -> bytes:
+    """JSON body for a property insight; the fast path encodes the dict directly with orjson."""
+    if fast_path:
+        return orjson.dumps(payload)
+    return PropertyInsightResponse(**payload).model_dump_json().encode("utf-8")
+
+# No comparables dataset configured; the placeholder listings, as SimilarProperty dicts
+PLACEHOLDER_SIMILAR_PROPERTIES = [
+    SimilarProperty(address=address).model_dump()
+    for address in ("124 Main St, Anytown, CA 12345", "125 Main St, Anytown, CA 12345", "126 Main St, Anytown, CA 12345")
+]
+
 @router.post("/get_property_insight", response_model=PropertyInsightResponse)
-async def get_property_insight(request: PropertyInsightRequest):
+async def get_property_insight(
+    request: PropertyInsightRequest,
+    http_request: Request,
+    loader: PropertyDataLoader = Depends(get_property_data_loader),
+    comparables_index: ComparablesIndex = Depends(get_comparables_index)
+):
     # Get property data using the property data provider
-    property_data = get_property_data(request.address)
+    property_data = await loader.load(request.address)
+    inputs = metric_inputs_from_property_data(property_data)
+    
+    # Clients that already have this version of the insight get 304 before any work is done
+    etag = property_insight_etag(property_data, inputs, len(comparables_index))
+    if etag_matches(http_request.headers.get("if-none-match"), etag):
+        return Response(status_code=304, headers={"ETag": etag})
     
     # Calculate property metrics using the data
-    metrics = calculate_property_metrics(
-        purchase_price=property_data.financial.current_market_value,
-        annual_rental_income=property_data.financial.annual_rental_income,
-        other_income=property_data.financial.other_monthly_income * 12,
-        property_taxes=property_data.financial.monthly_property_taxes * 12 if property_data.financial.monthly_property_taxes else None,
-        insurance=property_data.financial.monthly_insurance * 12 if property_data.financial.monthly_insurance else None,
-        property_management=property_data.financial.monthly_property_management * 12 if property_data.financial.monthly_property_management else None,
-        maintenance_repairs=property_data.financial.monthly_maintenance * 12 if property_data.financial.monthly_maintenance else None,
-        utilities=property_data.financial.monthly_utilities * 12,
-        vacancy_rate=property_data.market.vacancy_rate
+    with span("calculations"):
+        metrics = calculate_property_metrics(**inputs)
+    
+    with span("comparables"):
+        if len(comparables_index):
+            similar_properties = comparables_index.similar_to(property_data, k=3)
+        else:
+            similar_properties = PLACEHOLDER_SIMILAR_PROPERTIES
+    
+    # Serialize here rather than in FastAPI so the stage is measured (and validated at most once)
+    with span("serialization"):
+        content = serialize_property_insight(property_insight_payload(property_data, metrics, similar_properties))
+        return Response(content=content, media_type="application/json", headers={"ETag": etag})
+
+@router.get("/address/autocomplete", response_model=List[AddressSuggestion])
+async def address_autocomplete(q: str, limit: int = 10, address_index: AddressIndex = Depends(get_address_index)):
+    return address_index.autocomplete(q, limit=limit)
+
+@router.get("/property_data_cache/stats")
+async def property_data_cache_stats(loader: PropertyDataLoader = Depends(get_property_data_loader)):
+    return loader.cache.stats()
+
+@router.get("/property_data_sources/stats")
+async def property_data_sources_stats(loader: PropertyDataLoader = Depends(get_property_data_loader)):
+    return loader.aggregator.stats()
+
+@router.post("/market_rollups/listings")
+async def ingest_market_listings(listings: List[MarketListing], market_rollups: MarketRollupStore = Depends(get_market_rollups)):
+    added = market_rollups.ingest(listing.model_dump() for listing in listings)
+    return {"added": added, "skipped": len(listings) - added}
+
+@router.get("/market_rollups/stats")
+async def market_rollups_stats(market_rollups: MarketRollupStore = Depends(get_market_rollups)):
+    return market_rollups.stats()
+
+@router.post("/batch_property_metrics", response_model=BatchPropertyMetricsResponse)
+async def batch_property_metrics(request: BatchPropertyMetricsRequest):
+    # Only pass the columns the caller provided so the scalar defaults apply
+    columns = {name: value for name, value in request.model_dump().items() if value is not None}
+    try:
+        metrics = calculate_property_metrics_batch(**columns)
+    except ValueError as e:
+        raise HTTPException(status_code=422, detail=str(e))
+    
+    return BatchPropertyMetricsResponse(
+        count=len(request.purchase_price),
+        expense_breakdown={name: np.round(values, 2).tolist() for name, values in metrics.pop("expense_breakdown").items()},
+        **{name: np.round(values, 2).tolist() for name, values in metrics.items()}
+    )
+
+@router.post("/property_risk", response_model=PropertyRiskResponse)
+async def property_risk(request: PropertyRiskRequest, loader: PropertyDataLoader = Depends(get_property_data_loader)):
+    property_data = await loader.load(request.address)
+    inputs = metric_inputs_from_property_data(property_data)
+    
+    # The grid is built first, so an oversized one is rejected before the simulation runs
+    grid = None
+    if request.grid_vacancy_rates:
+        try:
+            grid = sensitivity_grid(
+                inputs,
+                vacancy_rates=request.grid_vacancy_rates,
+                rent_changes=request.grid_rent_changes,
+                expense_changes=request.grid_expense_changes
+            )
+        except ValueError as e:
+            raise HTTPException(status_code=422, detail=str(e))
+    
+    simulation = simulate_property_risk(
+        inputs,
+        n_scenarios=request.n_scenarios,
+        rent_growth_rate=property_data.market.rent_growth_rate,
+        rent_volatility=request.rent_volatility,
+        vacancy_volatility=request.vacancy_volatility,
+        expense_inflation=request.expense_inflation,
+        expense_volatility=request.expense_volatility,
+        seed=request.seed
     )
     
-    return PropertyInsightResponse(
+    return PropertyRiskResponse(
         proper_address=property_data.address.full_address,
-        county=property_data.address.county,
-        zip_code=property_data.address.zip_code,
-        state=property_data.address.state,
-        estimate_monthly_rent=property_data.financial.monthly_rent,
-        similar_properties=[
-            SimilarProperty(address="124 Main St, Anytown, CA 12345"),
-            SimilarProperty(address="125 Main St, Anytown, CA 12345"),
-            SimilarProperty(address="126 Main St, Anytown, CA 12345")
-        ],
-        # Include all calculated metrics
-        cap_rate=metrics["cap_rate"],
-        noi=metrics["noi"],
-        gross_income=metrics["gross_income"],
-        effective_gross_income=metrics["effective_gross_income"],
-        vacancy_loss=metrics["vacancy_loss"],
-        total_expenses=metrics["total_expenses"],
-        expense_breakdown=metrics["expense_breakdown"]
+        sensitivity_grid=grid,
+        **simulation
     )
 
+@router.post("/hold_period_analysis", response_model=HoldPeriodResponse)
+async def hold_period_analysis(request: HoldPeriodRequest, loader: PropertyDataLoader = Depends(get_property_data_loader)):
+    property_data = await loader.load(request.address)
+    inputs = metric_inputs_from_property_data(property_data)
+    market = property_data.market
+    
+    try:
+        projection = project_hold_period_batch(
+            horizon_years=request.horizons,
+            rent_growth_rate=request.rent_growth_rate if request.rent_growth_rate is not None else (market.rent_growth_rate or 0.0),
+            appreciation_rate=request.appreciation_rate if request.appreciation_rate is not None else (market.market_appreciation_rate or 0.0),
+            expense_growth_rate=request.expense_growth_rate,
+            discount_rate=request.discount_rate,
+            selling_cost_rate=request.selling_cost_rate,
+            **inputs
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=422, detail=str(e))
+    
+    # Every row shares the same yearly NOI path, so report it once for the longest horizon
+    longest = int(np.argmax(request.horizons))
+    results = [
+        HoldPeriodResult(
+            horizon_years=horizon,
+            resale_value=round(float(projection["resale_value"][i]), 2),
+            net_sale_proceeds=round(float(projection["net_sale_proceeds"][i]), 2),
+            npv=round(float(projection["npv"][i]), 2),
+            irr=None if np.isnan(projection["irr"][i]) else round(float(projection["irr"][i]) * 100, 2),
+            equity_multiple=None if np.isnan(projection["equity_multiple"][i]) else round(float(projection["equity_multiple"][i]), 3)
+        )
+        for i, horizon in enumerate(request.horizons)
+    ]
+    
+    return HoldPeriodResponse(
+        proper_address=property_data.address.full_address,
+        projected_noi=np.round(projection["projected_noi"][longest], 2).tolist(),
+        results=results
+    )
+
+@router.post("/financing_scenarios", response_model=FinancingScenariosResponse)
+async def financing_scenarios_route(request: FinancingScenariosRequest, loader: PropertyDataLoader = Depends(get_property_data_loader)):
+    property_data = await loader.load(request.address)
+    inputs = metric_inputs_from_property_data(property_data)
+    if request.purchase_price is not None:
+        inputs["purchase_price"] = request.purchase_price
+    metrics = calculate_property_metrics(**inputs)
+    
+    try:
+        grid = financing_scenarios(
+            noi=metrics["noi"],
+            purchase_price=inputs["purchase_price"],
+            gross_income=metrics["gross_income"],
+            operating_expenses=metrics["total_expenses"],
+            interest_rates=request.interest_rates,
+            ltvs=request.ltvs,
+            amortization_years=request.amortization_years,
+            interest_only_years=request.interest_only_years,
+            closing_cost_rate=request.closing_cost_rate,
+            balance_after_years=request.balance_after_years
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=422, detail=str(e))
+    
+    values = {}
+    for name, value in grid.items():
+        if isinstance(value, np.ndarray):
+            rounded = np.round(value, 2)
+            values[name] = [None if np.isnan(v) else v for v in rounded.tolist()] if np.isnan(rounded).any() else rounded.tolist()
+        else:
+            values[name] = value
+    return FinancingScenariosResponse(proper_address=property_data.address.full_address, noi=metrics["noi"], **values)
+
+def to_underwriting_session_response(session: UnderwritingSession) -> UnderwritingSessionResponse:
+    return UnderwritingSessionResponse(
+        session_id=session.session_id,
+        proper_address=session.address,
+        inputs=session.inputs(),
+        metrics=session.metrics()
+    )
+
+@router.post("/underwriting_sessions", response_model=UnderwritingSessionResponse, status_code=201)
+async def create_underwriting_session(
+    request: UnderwritingSessionRequest,
+    loader: PropertyDataLoader = Depends(get_property_data_loader),
+    underwriting_sessions: UnderwritingSessionStore = Depends(get_underwriting_sessions)
+):
+    """Pin a property's inputs server-side for what-if updates; property data is loaded once here."""
+    property_data = await loader.load(request.address)
+    session = underwriting_sessions.create(metric_inputs_from_property_data(property_data), property_data.address.full_address)
+    try:
+        session.update(request.inputs)
+    except ValueError as e:
+        underwriting_sessions.delete(session.session_id)
+        raise HTTPException(status_code=422, detail=str(e))
+    return to_underwriting_session_response(session)
+
+@router.get("/underwriting_sessions/stats")
+async def underwriting_sessions_stats(underwriting_sessions: UnderwritingSessionStore = Depends(get_underwriting_sessions)):
+    return underwriting_sessions.stats()
+
+@router.get("/underwriting_sessions/{session_id}", response_model=UnderwritingSessionResponse)
+async def get_underwriting_session(session_id: str, underwriting_sessions: UnderwritingSessionStore = Depends(get_underwriting_sessions)):
+    session = underwriting_sessions.get(session_id)
+    if session is None:
+        raise HTTPException(status_code=404, detail="Session not found")
+    return to_underwriting_session_response(session)
+
+@router.patch("/underwriting_sessions/{session_id}", response_model=UnderwritingUpdateResponse)
+async def update_underwriting_session(
+    session_id: str,
+    request: UnderwritingUpdateRequest,
+    underwriting_sessions: UnderwritingSessionStore = Depends(get_underwriting_sessions)
+):
+    session = underwriting_sessions.get(session_id)
+    if session is None:
+        raise HTTPException(status_code=404, detail="Session not found")
+    try:
+        changed, recomputed = session.update(request.changes)
+    except ValueError as e:
+        raise HTTPException(status_code=422, detail=str(e))
+    return UnderwritingUpdateResponse(session_id=session_id, changed=changed, recomputed=recomputed)
+
+@router.delete("/underwriting_sessions/{session_id}", status_code=204)
+async def delete_underwriting_session(session_id: str, underwriting_sessions: UnderwritingSessionStore = Depends(get_underwriting_sessions)):
+    if not underwriting_sessions.delete(session_id):
+        raise HTTPException(status_code=404, detail="Session not found")
+    return Response(status_code=204)
+
+@router.get("/contract_review_cache/stats")
+async def contract_review_cache_stats(agent: AdvisorAgent = Depends(get_agent)):
+    return agent.review_cache.stats()
+
+@router.get("/contract_clause_index/stats")
+async def contract_clause_index_stats(agent: AdvisorAgent = Depends(get_agent)):
+    if agent.clause_index is None:
+        raise HTTPException(status_code=404, detail="Clause index is not enabled")
+    return agent.clause_index.stats()
+
 @router.post("/ai_contract_review", response_model=ContractReviewResponse)
-async def ai_contract_review(request: ContractReviewRequest):
+async def ai_contract_review(request: ContractReviewRequest, agent: AdvisorAgent = Depends(get_agent)):
     # Use AdvisorAgent to analyze the contract
-    analysis = agent.analyze_contract(request.file_content)
+    analysis = await agent.analyze_contract(request.file_content)
     
-    return ContractReviewResponse(
-        summary=analysis.get("summary", ""),
-        highlights=analysis.get("highlights", []),
-        warnings=analysis.get("warnings", []),
-        suggestions=analysis.get("suggestions", [])
-    )
\ No newline at end of file
+    return to_contract_review_response(analysis)
+
+@router.post("/ai_contract_review/stream")
+async def ai_contract_review_stream(request: ContractReviewStreamRequest, agent: AdvisorAgent = Depends(get_agent)):
+    """
+    Server-sent events variant of ai_contract_review.
+    
+    Emits summary/highlight/warning/suggestion events as the model finishes each
+    item, then a final "result" event with the ContractReviewResponse (or "error").
+    """
+    async def events():
+        async for event, data in agent.stream_contract_review(request.file_content, include_tokens=request.include_tokens):
+            if event == "result":
+                payload = to_contract_review_response(data).model_dump()
+            elif event == "error":
+                payload = data
+            else:
+                payload = {"text": data}
+            yield format_sse_event(event, payload)
+    
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+async def spool_request_body(request: Request, max_bytes: int) -> str:
+    """Stream the request body to a temporary file without holding it in memory; returns its path."""
+    spool = tempfile.NamedTemporaryFile(prefix="contract-upload-", delete=False)
+    try:
+        received = 0
+        with spool:
+            async for chunk in request.stream():
+                received += len(chunk)
+                if received > max_bytes:
+                    raise HTTPException(status_code=413, detail=f"Upload exceeds {max_bytes} bytes")
+                spool.write(chunk)
+        if received == 0:
+            raise HTTPException(status_code=400, detail="Empty upload")
+        return spool.name
+    except BaseException:
+        os.unlink(spool.name)
+        raise
+
+@router.post("/ai_contract_review/upload", response_model=ContractReviewResponse)
+async def ai_contract_review_upload(request: Request, agent: AdvisorAgent = Depends(get_agent)):
+    """
+    Review an uploaded PDF, DOCX or plain text contract sent as the raw request body.
+    
+    The body is spooled to disk as it arrives, then parsed page by page (PDF pages
+    in parallel worker processes) while the pages are fed to the review.
+    multipart/form-data uploads (browser forms, curl -F) are rejected with 415;
+    send the file itself, e.g. curl --data-binary @lease.pdf -H "Content-Type: application/pdf".
+    """
+    content_type = request.headers.get("content-type")
+    if (content_type or "").split(";")[0].strip().lower().startswith("multipart/"):
+        raise HTTPException(status_code=415, detail="Send the contract file as the raw request body, not as multipart/form-data")
+    with span("spool_upload"):
+        path = await spool_request_body(request, CONTRACT_UPLOAD_MAX_BYTES)
+    try:
+        analysis = await agent.review_contract_pages(aiter_document_pages(path, content_type))
+    finally:
+        os.unlink(path)
+    return to_contract_review_response(analysis)
+
+@router.post("/contract_review_jobs", response_model=ContractReviewJobStatus, status_code=202)
+async def submit_contract_review_job(request: ContractReviewJobRequest, review_queue: ContractReviewQueue = Depends(get_review_queue)):
+    try:
+        job_id = await review_queue.submit(request.contracts, priority=request.priority)
+    except QueueFullError as e:
+        raise HTTPException(status_code=429, detail=str(e), headers={"Retry-After": "30"})
+    return review_queue.store.job_status(job_id)
+
+@router.get("/contract_review_jobs/{job_id}", response_model=ContractReviewJobStatus)
+async def get_contract_review_job(job_id: str, review_queue: ContractReviewQueue = Depends(get_review_queue)):
+    status = review_queue.store.job_status(job_id)
+    if status is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return status
+
+@router.get("/contract_review_jobs/{job_id}/results", response_model=List[ContractReviewJobItem])
+async def get_contract_review_job_results(job_id: str, review_queue: ContractReviewQueue = Depends(get_review_queue)):
+    if review_queue.store.job_status(job_id) is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return review_queue.store.job_results(job_id)
+
+@router.get("/contract_review_jobs/{job_id}/events")
+async def stream_contract_review_job(job_id: str, interval: float = 1.0, review_queue: ContractReviewQueue = Depends(get_review_queue)):
+    """Server-sent "status" events whenever the job's progress changes, until it finishes."""
+    if review_queue.store.job_status(job_id) is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+    
+    async def events():
+        last = None
+        while True:
+            status = review_queue.store.job_status(job_id)
+            if status != last:
+                yield format_sse_event("status", status)
+                last = status
+            if status["status"] in TERMINAL_STATES:
+                return
+            await asyncio.sleep(max(interval, 0.1))
+    
+    return StreamingResponse(events(), media_type="text/event-stream", headers={"Cache-Control": "no-cache"})
+
+@router.delete("/contract_review_jobs/{job_id}", response_model=ContractReviewJobStatus)
+async def cancel_contract_review_job(job_id: str, review_queue: ContractReviewQueue = Depends(get_review_queue)):
+    if review_queue.store.job_status(job_id) is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+    review_queue.cancel(job_id)
+    return review_queue.store.job_status(job_id)
@@ -0,0 +1,362 @@
+"""
+Deal screener for large listing files.
+
+Streams listings from CSV, JSONL or Parquet in fixed-size chunks, computes
+cap rate and NOI for each chunk with calculate_property_metrics_batch, and
+writes only the listings that pass the filters. Chunks are screened in worker
+processes, with at most two chunks per worker in flight, so memory stays
+constant however large the input is. Matches are written in input order.
+
+Input columns use the argument names of calculate_property_metrics
+(purchase_price, annual_rental_income, property_taxes, ...). A price or
+list_price column is read as purchase_price, and monthly_rent is annualized
+when annual_rental_income is absent. Empty estimated expenses fall back to the
+default estimates; other empty amounts count as zero.
+
+Usage:
+    python -m app.screener listings.csv -o matches.csv --min-cap-rate 6 --max-price 500000 --property-type single_family
+"""
+import argparse
+import csv
+import io
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, FrozenSet, Iterator, List, NamedTuple, Optional, Sequence, TextIO, Tuple
+
+import numpy as np
+
+from app.services.calculations import ESTIMATED_EXPENSE_FIELDS, FIXED_EXPENSE_FIELDS, calculate_property_metrics_batch
+
+try:
+    import pyarrow.parquet as pq
+except ImportError:  # Parquet input is optional
+    pq = None
+
+CSV = "csv"
+JSONL = "jsonl"
+PARQUET = "parquet"
+
+DEFAULT_CHUNK_SIZE = 50_000
+
+# Alternative input column names
+COLUMN_ALIASES = {
+    "price": "purchase_price",
+    "list_price": "purchase_price",
+}
+
+# Numeric columns read from each listing, besides purchase_price
+AMOUNT_FIELDS = ("annual_rental_income", "monthly_rent", "other_income", "vacancy_rate") + ESTIMATED_EXPENSE_FIELDS + FIXED_EXPENSE_FIELDS
+
+# Columns added to every match
+RESULT_FIELDS = ("cap_rate", "noi")
+
+
+class ScreenCriteria(NamedTuple):
+    """Filter predicates; None disables a filter. Property types are lower-case."""
+    min_cap_rate: Optional[float] = None
+    max_price: Optional[float] = None
+    property_types: Optional[FrozenSet[str]] = None
+
+
+def detect_format(path: str) -> str:
+    """Input/output format from the file extension; CSV when unknown."""
+    name = path.lower()
+    if name.endswith((".jsonl", ".ndjson", ".json")):
+        return JSONL
+    if name.endswith((".parquet", ".pq")):
+        return PARQUET
+    return CSV
+
+
+def _to_float(value: Any) -> float:
+    """
+    Parse an amount such as 450000, "450000", "$450,000" or "" (NaN).
+
+    Percentages are read as fractions, so "5%" is 0.05, like a vacancy_rate of 0.05.
+    """
+    if value is None or value == "":
+        return np.nan
+    if isinstance(value, (int, float)):
+        return float(value)
+    try:
+        return float(value)
+    except ValueError:
+        text = value.replace("$", "").replace(",", "").strip()
+        scale = 1.0
+        if text.endswith("%"):
+            text, scale = text[:-1].strip(), 0.01
+        try:
+            return float(text) * scale
+        except ValueError:
+            return np.nan
+
+
+def _column(values: Sequence[Any]) -> np.ndarray:
+    return np.fromiter((_to_float(v) for v in values), dtype=np.float64, count=len(values))
+
+
+def screen_rows(fields: Sequence[str], rows: Sequence[Sequence[Any]], criteria: ScreenCriteria) -> Tuple[List[int], np.ndarray, np.ndarray]:
+    """
+    Screen one chunk of listings.
+
+    Price and property type are checked first, so amounts are only parsed and
+    metrics only computed for the listings that can still match.
+
+    Args:
+        fields: Column names, in row order
+        rows: Listings as sequences of raw values
+        criteria: Filter predicates
+
+    Returns:
+        Tuple of (indices of matching rows, their cap rates, their NOIs)
+    """
+    index = {}
+    for position, name in enumerate(fields):
+        index.setdefault(COLUMN_ALIASES.get(name, name), position)
+    if "purchase_price" not in index:
+        raise ValueError("Listings need a purchase_price, price or list_price column")
+
+    def values(name: str, selected: Sequence[int]) -> np.ndarray:
+        position = index.get(name)
+        if position is None:
+            return np.full(len(selected), np.nan)
+        return _column([rows[i][position] if position < len(rows[i]) else None for i in selected])
+
+    selected = range(len(rows))
+    if criteria.property_types is not None:
+        position = index.get("property_type")
+        if position is None:
+            raise ValueError("Filtering by property type needs a property_type column")
+        selected = [i for i in selected if position < len(rows[i]) and str(rows[i][position]).strip().lower() in criteria.property_types]
+
+    price = values("purchase_price", selected)
+    keep = price > 0
+    if criteria.max_price is not None:
+        keep &= price <= criteria.max_price
+    selected = np.asarray(selected, dtype=np.intp)[keep]
+    price = price[keep]
+    if not len(selected):
+        return [], np.empty(0), np.empty(0)
+
+    columns = {name: values(name, selected) for name in AMOUNT_FIELDS}
+    monthly_rent = columns.pop("monthly_rent")
+    income = columns["annual_rental_income"]
+    columns["annual_rental_income"] = np.where(np.isnan(income), monthly_rent * 12, income)
+    columns["vacancy_rate"] = np.where(np.isnan(columns["vacancy_rate"]), 0.05, columns["vacancy_rate"])
+    for name in ("annual_rental_income", "other_income") + FIXED_EXPENSE_FIELDS:
+        columns[name] = np.nan_to_num(columns[name])
+
+    metrics = calculate_property_metrics_batch(purchase_price=price, **columns)
+    cap_rate, noi = metrics["cap_rate"], metrics["noi"]
+    keep = np.ones(len(selected), dtype=bool)
+    if criteria.min_cap_rate is not None:
+        keep = cap_rate >= criteria.min_cap_rate
+    return selected[keep].tolist(), cap_rate[keep], noi[keep]
+
+
+def _format_rows(fields: Sequence[str], rows: Sequence[Sequence[Any]], matches: List[int], cap_rate: np.ndarray, noi: np.ndarray, output_format: str) -> str:
+    """Serialize the matching rows with their cap rate and NOI appended."""
+    buffer = io.StringIO()
+    if output_format == JSONL:
+        out_fields = list(fields) + list(RESULT_FIELDS)
+        for i, cap, income in zip(matches, cap_rate.round(2).tolist(), noi.round(2).tolist()):
+            buffer.write(json.dumps(dict(zip(out_fields, list(rows[i]) + [cap, income])), default=str))
+            buffer.write("\n")
+    else:
+        writer = csv.writer(buffer, lineterminator="\n")
+        for i, cap, income in zip(matches, cap_rate.round(2).tolist(), noi.round(2).tolist()):
+            writer.writerow(list(rows[i]) + [cap, income])
+    return buffer.getvalue()
+
+
+def screen_csv_chunk(fields: List[str], records: List[str], criteria: ScreenCriteria, output_format: str) -> Tuple[int, int, str]:
+    """Parse and screen a chunk of CSV records; runs in a worker process."""
+    rows = list(csv.reader(records))
+    matches, cap_rate, noi = screen_rows(fields, rows, criteria)
+    return len(rows), len(matches), _format_rows(fields, rows, matches, cap_rate, noi, output_format)
+
+
+def screen_jsonl_chunk(fields: List[str], lines: List[str], criteria: ScreenCriteria, output_format: str) -> Tuple[int, int, str]:
+    """Parse and screen a chunk of JSON lines; runs in a worker process."""
+    objects = [json.loads(line) for line in lines if line.strip()]
+    rows = [[obj.get(name) for name in fields] for obj in objects]
+    matches, cap_rate, noi = screen_rows(fields, rows, criteria)
+    if output_format == JSONL:
+        # Keep the original objects so nested values and fields outside the header survive
+        out = "".join(
+            json.dumps({**objects[i], "cap_rate": cap, "noi": income}) + "\n"
+            for i, cap, income in zip(matches, cap_rate.round(2).tolist(), noi.round(2).tolist())
+        )
+        return len(rows), len(matches), out
+    return len(rows), len(matches), _format_rows(fields, rows, matches, cap_rate, noi, output_format)
+
+
+def screen_parquet_chunk(path: str, row_group: int, fields: List[str], criteria: ScreenCriteria, output_format: str) -> Tuple[int, int, str]:
+    """Read and screen one Parquet row group; runs in a worker process."""
+    table = pq.ParquetFile(path).read_row_group(row_group)
+    columns = [table.column(name).to_pylist() for name in fields]
+    rows = list(zip(*columns))
+    matches, cap_rate, noi = screen_rows(fields, rows, criteria)
+    return len(rows), len(matches), _format_rows(fields, rows, matches, cap_rate, noi, output_format)
+
+
+def _csv_records(f: TextIO) -> Iterator[str]:
+    """Yield raw CSV records, joining lines inside quoted fields, without parsing them."""
+    record = ""
+    for line in f:
+        record += line
+        if record.count('"') % 2 == 0:
+            yield record
+            record = ""
+    if record:
+        yield record
+
+
+def _chunks(items: Iterator[str], size: int) -> Iterator[List[str]]:
+    chunk = []
+    for item in items:
+        chunk.append(item)
+        if len(chunk) >= size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def _jsonl_fields(path: str, sample: int = 1000) -> List[str]:
+    """Field names from the first JSON lines, in first-seen order."""
+    fields: Dict[str, None] = {}
+    with open(path, encoding="utf-8") as f:
+        for _, line in zip(range(sample), f):
+            if line.strip():
+                fields.update(dict.fromkeys(json.loads(line)))
+    return list(fields)
+
+
+def _tasks(path: str, input_format: str, chunk_size: int, criteria: ScreenCriteria, output_format: str):
+    """Yield (fields, task arguments); the first item is the output field list."""
+    if input_format == PARQUET:
+        if pq is None:
+            raise RuntimeError("Parquet input requires the pyarrow package")
+        parquet = pq.ParquetFile(path)
+        fields = parquet.schema_arrow.names
+        yield fields
+        # Row groups are the natural chunk: each worker reads its own without the parent touching the data
+        for row_group in range(parquet.num_row_groups):
+            yield screen_parquet_chunk, (path, row_group, fields, criteria, output_format)
+        return
+
+    if input_format == JSONL:
+        fields = _jsonl_fields(path)
+        yield fields
+        with open(path, encoding="utf-8") as f:
+            for chunk in _chunks(f, chunk_size):
+                yield screen_jsonl_chunk, (fields, chunk, criteria, output_format)
+        return
+
+    with open(path, newline="", encoding="utf-8") as f:
+        records = _csv_records(f)
+        header = next(records, None)
+        if header is None:
+            return
+        fields = [name.strip() for name in next(csv.reader([header]))]
+        yield fields
+        for chunk in _chunks(records, chunk_size):
+            yield screen_csv_chunk, (fields, chunk, criteria, output_format)
+
+
+def screen_file(
+    input_path: str,
+    output: TextIO,
+    criteria: ScreenCriteria,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    workers: Optional[int] = None,
+    input_format: Optional[str] = None,
+    output_format: str = CSV
+) -> Dict[str, Any]:
+    """
+    Screen a listings file and write the matches to output.
+
+    Args:
+        input_path: CSV, JSONL or Parquet listings file
+        output: Text stream for the matches
+        criteria: Filter predicates
+        chunk_size: Listings per chunk (CSV and JSONL; Parquet uses its row groups)
+        workers: Worker processes; all cores by default, 1 screens in this process
+        input_format: csv, jsonl or parquet; taken from the file extension when None
+        output_format: csv or jsonl
+
+    Returns:
+        Dict with rows read, rows matched, chunks and elapsed seconds
+    """
+    start = time.perf_counter()
+    workers = workers or os.cpu_count() or 1
+    tasks = _tasks(input_path, input_format or detect_format(input_path), chunk_size, criteria, output_format)
+    fields = next(tasks, None)
+    stats = {"rows": 0, "matches": 0, "chunks": 0}
+    if fields is None:
+        return {**stats, "seconds": 0.0}
+    if output_format == CSV:
+        csv.writer(output, lineterminator="\n").writerow(list(fields) + list(RESULT_FIELDS))
+
+    def record(result: Tuple[int, int, str]):
+        rows, matches, text = result
+        stats["rows"] += rows
+        stats["matches"] += matches
+        stats["chunks"] += 1
+        output.write(text)
+
+    if workers == 1:
+        for function, args in tasks:
+            record(function(*args))
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            pending = []
+            # Two chunks per worker in flight keeps every core busy while bounding memory
+            for function, args in tasks:
+                pending.append(pool.submit(function, *args))
+                if len(pending) >= 2 * workers:
+                    record(pending.pop(0).result())
+            while pending:
+                record(pending.pop(0).result())
+    return {**stats, "seconds": time.perf_counter() - start}
+
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("input", help="listings file (.csv, .jsonl or .parquet)")
+    parser.add_argument("-o", "--output", help="matches file (.csv or .jsonl); stdout when omitted")
+    parser.add_argument("--min-cap-rate", type=float, help="minimum cap rate, percent")
+    parser.add_argument("--max-price", type=float, help="maximum purchase price")
+    parser.add_argument("--property-type", action="append", help="property type to keep; repeat for several")
+    parser.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE, help="listings per chunk")
+    parser.add_argument("--workers", type=int, help="worker processes (default: all cores)")
+    parser.add_argument("--format", choices=(CSV, JSONL, PARQUET), help="input format (default: from the extension)")
+    args = parser.parse_args(argv)
+
+    property_types = frozenset(t.strip().lower() for t in args.property_type) if args.property_type else None
+    criteria = ScreenCriteria(args.min_cap_rate, args.max_price, property_types)
+    output_format = detect_format(args.output) if args.output else CSV
+    if output_format == PARQUET:
+        parser.error("matches are written as CSV or JSONL")
+    output = open(args.output, "w", newline="", encoding="utf-8") if args.output else sys.stdout
+    try:
+        stats = screen_file(args.input, output, criteria, args.chunk_size, args.workers, args.format, output_format)
+    except (RuntimeError, ValueError) as e:
+        sys.exit(f"error: {e}")
+    finally:
+        if output is not sys.stdout:
+            output.close()
+    rate = stats["rows"] / stats["seconds"] if stats["seconds"] else 0
+    print(
+        f"screened {stats['rows']:,} listings in {stats['chunks']:,} chunks, "
+        f"{stats['matches']:,} matches, {stats['seconds']:.1f} s ({rate:,.0f} listings/s)",
+        file=sys.stderr,
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,387 @@
+import csv
+import re
+from bisect import bisect_left
+from functools import lru_cache
+from typing import Any, Dict, List, NamedTuple, Optional, Tuple
+
+# USPS standard street suffix abbreviations and their common variants
+_SUFFIX_VARIANTS = {
+    "Aly": ("ALLEY", "ALLY", "ALY"),
+    "Ave": ("AVENUE", "AVE", "AV", "AVEN", "AVENU", "AVN", "AVNUE"),
+    "Blvd": ("BOULEVARD", "BLVD", "BOULV", "BOUL"),
+    "Br": ("BRANCH", "BR", "BRNCH"),
+    "Byp": ("BYPASS", "BYP", "BYPA", "BYPAS", "BYPS"),
+    "Cir": ("CIRCLE", "CIR", "CIRC", "CIRCL", "CRCL", "CRCLE"),
+    "Ct": ("COURT", "CT", "CRT"),
+    "Cv": ("COVE", "CV"),
+    "Crk": ("CREEK", "CRK"),
+    "Cres": ("CRESCENT", "CRES", "CRSENT", "CRSNT"),
+    "Xing": ("CROSSING", "XING", "CRSSNG"),
+    "Dr": ("DRIVE", "DR", "DRIV", "DRV"),
+    "Expy": ("EXPRESSWAY", "EXPY", "EXP", "EXPR", "EXPRESS", "EXPW"),
+    "Fwy": ("FREEWAY", "FWY", "FREEWY", "FRWAY", "FRWY"),
+    "Gdns": ("GARDENS", "GDNS", "GARDNS"),
+    "Hbr": ("HARBOR", "HBR", "HARB", "HARBR"),
+    "Hts": ("HEIGHTS", "HTS", "HT"),
+    "Hwy": ("HIGHWAY", "HWY", "HIGHWY", "HIWAY", "HIWY", "HWAY"),
+    "Holw": ("HOLLOW", "HOLW", "HLLW", "HOLWS"),
+    "Is": ("ISLAND", "IS", "ISLND"),
+    "Jct": ("JUNCTION", "JCT", "JCTION", "JCTN", "JUNCTN", "JUNCTON"),
+    "Ln": ("LANE", "LN"),
+    "Lndg": ("LANDING", "LNDG", "LNDNG"),
+    "Loop": ("LOOP", "LOOPS"),
+    "Mall": ("MALL",),
+    "Mnr": ("MANOR", "MNR"),
+    "Mdws": ("MEADOWS", "MDWS", "MDW", "MEDOWS"),
+    "Mtwy": ("MOTORWAY", "MTWY"),
+    "Mt": ("MOUNT", "MT", "MNT"),
+    "Pkwy": ("PARKWAY", "PKWY", "PARKWY", "PKWAY", "PKY"),
+    "Pass": ("PASS",),
+    "Path": ("PATH", "PATHS"),
+    "Pike": ("PIKE", "PIKES"),
+    "Pl": ("PLACE", "PL"),
+    "Plz": ("PLAZA", "PLZ", "PLZA"),
+    "Pt": ("POINT", "PT"),
+    "Rd": ("ROAD", "RD"),
+    "Rdg": ("RIDGE", "RDG", "RDGE"),
+    "Row": ("ROW",),
+    "Run": ("RUN",),
+    "Sq": ("SQUARE", "SQ", "SQR", "SQRE", "SQU"),
+    "St": ("STREET", "ST", "STRT", "STR"),
+    "Ter": ("TERRACE", "TER", "TERR"),
+    "Trce": ("TRACE", "TRCE", "TRACES"),
+    "Trl": ("TRAIL", "TRL", "TRAILS", "TRLS"),
+    "Tpke": ("TURNPIKE", "TPKE", "TRNPK", "TURNPK"),
+    "Vly": ("VALLEY", "VLY", "VALLY", "VLLY"),
+    "Via": ("VIADUCT", "VIA", "VDCT", "VIADCT"),
+    "Vw": ("VIEW", "VW"),
+    "Vis": ("VISTA", "VIS", "VIST", "VST", "VSTA"),
+    "Walk": ("WALK", "WALKS"),
+    "Way": ("WAY", "WY"),
+}
+STREET_SUFFIXES = {variant: standard for standard, variants in _SUFFIX_VARIANTS.items() for variant in variants}
+SUFFIX_NAMES = {standard: variants[0].title() for standard, variants in _SUFFIX_VARIANTS.items()}
+
+DIRECTIONALS = {
+    "N": "N", "NORTH": "N", "S": "S", "SOUTH": "S", "E": "E", "EAST": "E", "W": "W", "WEST": "W",
+    "NE": "NE", "NORTHEAST": "NE", "NW": "NW", "NORTHWEST": "NW",
+    "SE": "SE", "SOUTHEAST": "SE", "SW": "SW", "SOUTHWEST": "SW",
+}
+
+# Street names that begin with a spelled-out directional; the word is part of the name,
+# not a predirectional ("500 West End Ave" is not "500 W End Ave")
+DIRECTIONAL_STREET_NAMES = {
+    ("WEST", "END"), ("EAST", "END"), ("NORTH", "END"), ("SOUTH", "END"),
+    ("WEST", "SIDE"), ("EAST", "SIDE"), ("NORTH", "SHORE"), ("SOUTH", "SHORE"),
+}
+
+UNIT_DESIGNATORS = {
+    "APARTMENT": "Apt", "APT": "Apt", "UNIT": "Unit", "SUITE": "Ste", "STE": "Ste", "BUILDING": "Bldg",
+    "BLDG": "Bldg", "FLOOR": "Fl", "FL": "Fl", "ROOM": "Rm", "RM": "Rm", "SPACE": "Spc", "SPC": "Spc",
+    "LOT": "Lot", "TRAILER": "Trlr", "TRLR": "Trlr", "DEPARTMENT": "Dept", "DEPT": "Dept", "#": "#",
+}
+
+STATE_CODES = {
+    "ALABAMA": "AL", "ALASKA": "AK", "ARIZONA": "AZ", "ARKANSAS": "AR", "CALIFORNIA": "CA", "COLORADO": "CO",
+    "CONNECTICUT": "CT", "DELAWARE": "DE", "DISTRICT OF COLUMBIA": "DC", "FLORIDA": "FL", "GEORGIA": "GA",
+    "HAWAII": "HI", "IDAHO": "ID", "ILLINOIS": "IL", "INDIANA": "IN", "IOWA": "IA", "KANSAS": "KS",
+    "KENTUCKY": "KY", "LOUISIANA": "LA", "MAINE": "ME", "MARYLAND": "MD", "MASSACHUSETTS": "MA",
+    "MICHIGAN": "MI", "MINNESOTA": "MN", "MISSISSIPPI": "MS", "MISSOURI": "MO", "MONTANA": "MT",
+    "NEBRASKA": "NE", "NEVADA": "NV", "NEW HAMPSHIRE": "NH", "NEW JERSEY": "NJ", "NEW MEXICO": "NM",
+    "NEW YORK": "NY", "NORTH CAROLINA": "NC", "NORTH DAKOTA": "ND", "OHIO": "OH", "OKLAHOMA": "OK",
+    "OREGON": "OR", "PENNSYLVANIA": "PA", "PUERTO RICO": "PR", "RHODE ISLAND": "RI", "SOUTH CAROLINA": "SC",
+    "SOUTH DAKOTA": "SD", "TENNESSEE": "TN", "TEXAS": "TX", "UTAH": "UT", "VERMONT": "VT", "VIRGINIA": "VA",
+    "WASHINGTON": "WA", "WEST VIRGINIA": "WV", "WISCONSIN": "WI", "WYOMING": "WY",
+}
+STATE_CODES.update({code: code for code in list(STATE_CODES.values())})
+
+_ZIP = re.compile(r"[\s,]*\b(\d{5})(?:-?\d{4})?\s*$")
+_CLEAN = re.compile(r"[^\w\s,#/-]")
+_SPACES = re.compile(r"\s+")
+_HOUSE_NUMBER = re.compile(r"^\d+[A-Z]?(?:-\d+[A-Z]?)?$|^\d+/\d+$")
+_AFTER_DIGIT = re.compile(r"(?<=\d)[A-Z]+")
+
+class InvalidAddressError(ValueError):
+    """Raised when an address has nothing to parse (no street, city, state or ZIP)."""
+
+class ParsedAddress(NamedTuple):
+    """Components of a parsed, normalized US street address (empty strings when absent)."""
+    number: str = ""
+    predirectional: str = ""
+    street_name: str = ""
+    suffix: str = ""
+    postdirectional: str = ""
+    unit: str = ""
+    city: str = ""
+    state: str = ""
+    zip_code: str = ""
+
+    @property
+    def street(self) -> str:
+        parts = (self.number, self.predirectional, self.street_name, self.suffix, self.postdirectional, self.unit)
+        return " ".join(part for part in parts if part)
+
+    @property
+    def full_address(self) -> str:
+        region = " ".join(part for part in (self.state, self.zip_code) if part)
+        return ", ".join(part for part in (self.street, self.city, region) if part)
+
+    @property
+    def key(self) -> str:
+        """Canonical lowercase form, identical for every spelling of the same address."""
+        # "Apt 4B", "Unit 4B" and "#4B" name the same unit
+        address = self._replace(unit=f"#{self.unit.split()[-1].lstrip('#')}") if self.unit else self
+        return address.full_address.lower().replace(",", "")
+
+    def to_dict(self) -> Dict[str, str]:
+        return {
+            "street": self.street,
+            "unit": self.unit,
+            "city": self.city,
+            "state": self.state,
+            "zip_code": self.zip_code,
+            "full_address": self.full_address,
+        }
+
+def _tokens(text: str) -> List[str]:
+    return _SPACES.sub(" ", _CLEAN.sub("", text.upper()).replace("#", " # ")).split()
+
+def _title(tokens: List[str]) -> str:
+    """Title-case name tokens, keeping ordinals lowercase ("5TH" -> "5th", not "5Th")."""
+    return _AFTER_DIGIT.sub(lambda match: match.group().lower(), " ".join(tokens).title())
+
+def _split_state(tokens: List[str]) -> Tuple[List[str], str]:
+    """Remove a trailing state code or (up to three word) state name from tokens."""
+    for width in (3, 2, 1):
+        if len(tokens) >= width:
+            state = STATE_CODES.get(" ".join(tokens[-width:]))
+            if state is not None:
+                return tokens[:-width], state
+    return tokens, ""
+
+def _split_unit(tokens: List[str]) -> Tuple[List[str], str, List[str]]:
+    """Find the first unit designator and its identifier; returns (tokens before, unit, tokens after)."""
+    for i in range(len(tokens) - 1):
+        designator = UNIT_DESIGNATORS.get(tokens[i])
+        if designator is not None:
+            unit = f"#{tokens[i + 1]}" if designator == "#" else f"{designator} {tokens[i + 1]}"
+            return tokens[:i], unit, tokens[i + 2:]
+    return tokens, "", []
+
+def _parse_street(tokens: List[str]) -> Tuple[ParsedAddress, List[str]]:
+    """
+    Parse the street line from the front of tokens.
+
+    Returns:
+        The street components and the tokens following the street (the city, when
+        the address was not comma separated)
+    """
+    number = ""
+    if tokens and _HOUSE_NUMBER.match(tokens[0]):
+        number, tokens = tokens[0], tokens[1:]
+
+    # A directional only when a street name follows it ("12 West St" is West Street)
+    predirectional = ""
+    if (
+        len(tokens) > 2 and tokens[0] in DIRECTIONALS and tokens[1] not in STREET_SUFFIXES
+        and tokens[1] not in UNIT_DESIGNATORS and (tokens[0], tokens[1]) not in DIRECTIONAL_STREET_NAMES
+    ):
+        predirectional, tokens = DIRECTIONALS[tokens[0]], tokens[1:]
+
+    # The suffix is the first suffix word after the name that is not itself part of
+    # a longer name ("Trail Ridge Rd"), so city words like "Gardens" are not taken
+    suffix_at = 0
+    for i in range(1, len(tokens)):
+        if tokens[i] in STREET_SUFFIXES and (i + 1 == len(tokens) or tokens[i + 1] not in STREET_SUFFIXES):
+            suffix_at = i
+            break
+
+    if suffix_at:
+        name_tokens, suffix, rest = tokens[:suffix_at], STREET_SUFFIXES[tokens[suffix_at]], tokens[suffix_at + 1:]
+        postdirectional = ""
+        if rest and rest[0] in DIRECTIONALS and (len(rest) == 1 or len(rest[0]) <= 2 or rest[1] in UNIT_DESIGNATORS):
+            postdirectional, rest = DIRECTIONALS[rest[0]], rest[1:]
+        before, unit, after = _split_unit(rest)
+        rest = before + after
+    else:
+        # Without a suffix ("Broadway # 4") a unit ends the street name
+        name_tokens, unit, rest = _split_unit(tokens)
+        suffix = postdirectional = ""
+
+    street = ParsedAddress(
+        number=number,
+        predirectional=predirectional,
+        street_name=_title(name_tokens),
+        suffix=suffix,
+        postdirectional=postdirectional,
+        unit=unit,
+    )
+    return street, rest
+
+@lru_cache(maxsize=65536)
+def _parse(address: str, index: Optional["AddressIndex"]) -> ParsedAddress:
+    zip_code = ""
+    match = _ZIP.search(address)
+    if match:
+        zip_code, address = match.group(1), address[:match.start()]
+
+    parts = [part for part in (_tokens(part) for part in address.split(",")) if part]
+    state = ""
+    if parts:
+        parts[-1], state = _split_state(parts[-1])
+        if not parts[-1]:
+            parts.pop()
+
+    if len(parts) > 1:
+        # "street[, unit], city": the last part is the city
+        street, rest = _parse_street([token for part in parts[:-1] for token in part])
+        city_tokens = parts[-1]
+        if len(rest) == 1 and not street.unit and any(char.isdigit() for char in rest[0]):
+            # A bare unit in its own part, e.g. "12 Main St, 4B, Springfield"
+            street = street._replace(unit=rest[0])
+    else:
+        street, city_tokens = _parse_street(parts[0] if parts else [])
+    city = _title(city_tokens)
+
+    if index is not None and zip_code and (not city or not state):
+        reference = index.zip_codes.get(zip_code)
+        if reference is not None:
+            city, state = city or reference[0], state or reference[1]
+    return street._replace(city=city, state=state, zip_code=zip_code)
+
+def parse_address(address: str, index: Optional["AddressIndex"] = None) -> ParsedAddress:
+    """
+    Parse and normalize a free-form US street address.
+
+    Handles casing, punctuation, street suffix, directional, unit and state
+    spelling variants, ZIP+4 codes, and comma or whitespace separated input, so
+    "123 north main street apt. 4b, springfield, illinois 62701" and
+    "123 N Main St #4B Springfield IL 62701-1234" have the same key.
+    Results are memoized, so repeated addresses cost a dict lookup.
+
+    Args:
+        address: Free-form address
+        index: Reference index used to fill in the city and state from the ZIP code
+
+    Returns:
+        ParsedAddress with normalized components
+
+    Raises:
+        InvalidAddressError: If the address is empty (has no street, city, state or ZIP)
+    """
+    parsed = _parse(address.strip(), index if index is not None else default_index)
+    # Blank addresses would otherwise all share the empty key
+    if not parsed.key:
+        raise InvalidAddressError("Address is empty")
+    return parsed
+
+def normalize_address(address: str) -> str:
+    """Canonical lowercase key for an address (see ParsedAddress.key)."""
+    return parse_address(address).key
+
+def normalize_street_name(street: str) -> str:
+    """Normalize a street name without house number, e.g. "north main street" -> "N Main St"."""
+    return _parse_street(_tokens(street))[0].street
+
+class AddressIndex:
+    """
+    Prefix index over a local street reference file for autocomplete and ZIP lookups.
+
+    The reference file is a CSV with street, city, state and zip_code columns,
+    one row per street and ZIP, ordered by preference (e.g. population). Keys are
+    kept in a sorted list and searched by binary search, which answers prefix
+    queries in O(log n) while staying compact for large reference files.
+
+    Args:
+        path: Reference CSV file; an empty index when None
+        max_suggestions: Largest number of suggestions returned per query
+    """
+
+    def __init__(self, path: Optional[str] = None, max_suggestions: int = 10):
+        self.max_suggestions = max_suggestions
+        self.entries: List[Dict[str, str]] = []
+        self.zip_codes: Dict[str, Tuple[str, str]] = {}
+        self._keys: List[Tuple[str, int]] = []
+        if path:
+            with open(path, newline="", encoding="utf-8") as f:
+                self.add_many(csv.DictReader(f))
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def add_many(self, rows):
+        """Add reference rows (dicts with street, city, state and zip_code) and rebuild the index."""
+        for row in rows:
+            street = normalize_street_name(row["street"])
+            city = _title(_tokens(row.get("city", "")))
+            state = STATE_CODES.get(" ".join(_tokens(row.get("state", ""))), "")
+            zip_code = (row.get("zip_code") or "").strip()[:5]
+            entry_id = len(self.entries)
+            self.entries.append({"street": street, "city": city, "state": state, "zip_code": zip_code})
+            if zip_code and city:
+                self.zip_codes.setdefault(zip_code, (city, state))
+            tail = f" {city} {state} {zip_code}".lower()
+            # Index the abbreviated and spelled-out suffix so partially typed words match either
+            abbreviated = street.lower()
+            self._keys.append((abbreviated + tail, entry_id))
+            parsed = _parse_street(_tokens(street))[0]
+            if parsed.suffix:
+                spelled = parsed._replace(suffix=SUFFIX_NAMES[parsed.suffix]).street.lower()
+                self._keys.append((spelled + tail, entry_id))
+        self._keys.sort()
+        _parse.cache_clear()
+
+    def autocomplete(self, query: str, limit: Optional[int] = None) -> List[Dict[str, str]]:
+        """
+        Suggest reference addresses for a partially typed address.
+
+        A leading house number is carried over to the suggestions.
+
+        Args:
+            query: Partially typed address, e.g. "12 main stre"
+            limit: Number of suggestions (at most max_suggestions)
+
+        Returns:
+            Suggestion dicts with street, city, state, zip_code and full_address
+        """
+        limit = min(limit or self.max_suggestions, self.max_suggestions)
+        tokens = _tokens(query.replace(",", " "))
+        number = ""
+        if tokens and _HOUSE_NUMBER.match(tokens[0]):
+            number, tokens = tokens[0], tokens[1:]
+        if not tokens:
+            return []
+
+        # Normalize the complete words; the last one may still be being typed
+        complete = _parse_street(tokens[:-1])[0].street if len(tokens) > 1 else ""
+        candidates = [" ".join(tokens).lower()]
+        if complete:
+            candidates.insert(0, f"{complete} {tokens[-1]}".lower())
+
+        suggestions, seen = [], set()
+        for prefix in candidates:
+            i = bisect_left(self._keys, (prefix, -1))
+            while i < len(self._keys) and len(suggestions) < limit and self._keys[i][0].startswith(prefix):
+                entry_id = self._keys[i][1]
+                i += 1
+                if entry_id in seen:
+                    continue
+                seen.add(entry_id)
+                entry = self.entries[entry_id]
+                street = f"{number} {entry['street']}" if number else entry["street"]
+                suggestions.append({
+                    **entry,
+                    "street": street,
+                    "full_address": f"{street}, {entry['city']}, {entry['state']} {entry['zip_code']}".strip(),
+                })
+        return suggestions
+
+# Reference index used by parse_address for ZIP lookups; replaced by load_address_index
+default_index: Optional[AddressIndex] = None
+
+def load_address_index(path: Optional[str], max_suggestions: int = 10) -> AddressIndex:
+    """Load the reference file and make it the default index for parse_address."""
+    global default_index
+    default_index = AddressIndex(path, max_suggestions=max_suggestions)
+    _parse.cache_clear()
+    return default_index
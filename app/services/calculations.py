@@ -1,4 +1,9 @@
-from typing import Optional
+from typing import Any, Dict, Optional, Sequence, Union
+
+import numpy as np
+
+ArrayLike = Union[float, Sequence[Optional[float]], np.ndarray]
+
 
 def calculate_property_metrics(
     purchase_price: float,
@@ -117,3 +122,206 @@ def calculate_property_metrics(
             "other_expenses": round(other_expenses, 2)
         }
     }
+
+
+# Expense fields that are estimated from defaults when not provided
+ESTIMATED_EXPENSE_FIELDS = ("property_taxes", "insurance", "property_management", "maintenance_repairs")
+
+# Expense fields that default to zero when not provided
+FIXED_EXPENSE_FIELDS = (
+    "utilities",
+    "advertising_marketing",
+    "legal_accounting",
+    "landscaping",
+    "pest_control",
+    "other_expenses",
+)
+
+EXPENSE_FIELDS = ESTIMATED_EXPENSE_FIELDS + FIXED_EXPENSE_FIELDS
+
+
+def metric_inputs_from_property_data(property_data) -> Dict[str, Optional[float]]:
+    """
+    Map a PropertyData record onto the annual inputs of calculate_property_metrics.
+
+    Monthly figures are annualized. Missing (or zero) estimated expenses are passed
+    as None so the default estimation rules apply.
+
+    Args:
+        property_data: PropertyData object from the property data provider
+
+    Returns:
+        Dict of keyword arguments for calculate_property_metrics
+    """
+    financial = property_data.financial
+    return {
+        "purchase_price": financial.current_market_value,
+        "annual_rental_income": financial.annual_rental_income,
+        "other_income": financial.other_monthly_income * 12,
+        "property_taxes": financial.monthly_property_taxes * 12 if financial.monthly_property_taxes else None,
+        "insurance": financial.monthly_insurance * 12 if financial.monthly_insurance else None,
+        "property_management": financial.monthly_property_management * 12 if financial.monthly_property_management else None,
+        "maintenance_repairs": financial.monthly_maintenance * 12 if financial.monthly_maintenance else None,
+        "utilities": financial.monthly_utilities * 12,
+        "vacancy_rate": property_data.market.vacancy_rate,
+    }
+
+
+def property_data_to_columns(properties: Sequence[Any]) -> Dict[str, np.ndarray]:
+    """
+    Convert a list of PropertyData records into column arrays for the batch calculation.
+
+    Args:
+        properties: List of PropertyData objects
+
+    Returns:
+        Dict of float64 arrays keyed by calculate_property_metrics_batch argument name.
+        Missing estimated expenses are stored as NaN.
+    """
+    rows = [metric_inputs_from_property_data(p) for p in properties]
+    columns = {}
+    for name in ("purchase_price", "annual_rental_income", "other_income", "utilities", "vacancy_rate") + ESTIMATED_EXPENSE_FIELDS:
+        columns[name] = np.array(
+            [np.nan if row[name] is None else row[name] for row in rows],
+            dtype=np.float64,
+        )
+    return columns
+
+
+def _as_column(value: Any, size: int, name: str, default: Optional[float]) -> np.ndarray:
+    """Broadcast a scalar, list or array argument to a float64 column of the given size."""
+    if value is None:
+        return np.full(size, np.nan if default is None else default, dtype=np.float64)
+    if np.ndim(value) == 0:
+        return np.full(size, value, dtype=np.float64)
+    if isinstance(value, np.ndarray) and value.dtype != object:
+        column = value.astype(np.float64, copy=False)
+    else:
+        # Lists may contain None for "not provided"
+        column = np.array([np.nan if v is None else v for v in value], dtype=np.float64)
+    if column.shape != (size,):
+        raise ValueError(f"{name} has {column.shape[0]} values, expected {size}")
+    return column
+
+
+def calculate_property_metrics_batch(
+    purchase_price: ArrayLike,
+    annual_rental_income: ArrayLike,
+    other_income: ArrayLike = 0.0,
+    property_taxes: Optional[ArrayLike] = None,
+    insurance: Optional[ArrayLike] = None,
+    property_management: Optional[ArrayLike] = None,
+    maintenance_repairs: Optional[ArrayLike] = None,
+    utilities: ArrayLike = 0.0,
+    advertising_marketing: ArrayLike = 0.0,
+    legal_accounting: ArrayLike = 0.0,
+    landscaping: ArrayLike = 0.0,
+    pest_control: ArrayLike = 0.0,
+    other_expenses: ArrayLike = 0.0,
+    vacancy_rate: ArrayLike = 0.05,
+    default_property_tax_rate: ArrayLike = 0.015,
+    default_insurance_rate: ArrayLike = 0.003,
+    default_management_rate: ArrayLike = 0.08,
+    default_maintenance_rate: ArrayLike = 0.10,
+) -> Dict[str, Any]:
+    """
+    Vectorized version of calculate_property_metrics for whole portfolios.
+
+    Every argument accepts a scalar (applied to all properties) or a column with one
+    value per property. Estimated expenses (property_taxes, insurance,
+    property_management, maintenance_repairs) follow the same default rules as the
+    scalar version, per element: a None argument, or a None/NaN entry in a column,
+    is replaced by the default estimate for that property.
+
+    Args:
+        purchase_price: Acquisition cost per property
+        annual_rental_income: Annual rental income per property
+        other_income .. default_maintenance_rate: Same meaning as in calculate_property_metrics
+
+    Returns:
+        dict: Columnar float64 arrays for cap_rate, noi, gross_income,
+        effective_gross_income, vacancy_loss, total_expenses, and an
+        expense_breakdown dict of arrays. Values are not rounded.
+    """
+    # The batch size comes from every argument, so a column may be given for any of them
+    arguments = {
+        "purchase_price": purchase_price, "annual_rental_income": annual_rental_income, "other_income": other_income,
+        "property_taxes": property_taxes, "insurance": insurance, "property_management": property_management,
+        "maintenance_repairs": maintenance_repairs, "utilities": utilities, "advertising_marketing": advertising_marketing,
+        "legal_accounting": legal_accounting, "landscaping": landscaping, "pest_control": pest_control,
+        "other_expenses": other_expenses, "vacancy_rate": vacancy_rate,
+        "default_property_tax_rate": default_property_tax_rate, "default_insurance_rate": default_insurance_rate,
+        "default_management_rate": default_management_rate, "default_maintenance_rate": default_maintenance_rate,
+    }
+    shapes = {
+        name: (len(value),) if isinstance(value, (list, tuple)) else np.shape(value)
+        for name, value in arguments.items() if value is not None
+    }
+    try:
+        shape = np.broadcast_shapes(*shapes.values())
+    except ValueError:
+        lengths = {name: shape[0] for name, shape in shapes.items() if shape}
+        raise ValueError(f"Column lengths differ: {lengths}") from None
+    if len(shape) > 1:
+        raise ValueError(f"Arguments must be scalars or 1-D columns, got shape {shape}")
+    size = shape[0] if shape else 1
+    purchase_price = _as_column(purchase_price, size, "purchase_price", 0.0)
+    annual_rental_income = _as_column(annual_rental_income, size, "annual_rental_income", 0.0)
+    other_income = _as_column(other_income, size, "other_income", 0.0)
+    vacancy_rate = _as_column(vacancy_rate, size, "vacancy_rate", 0.05)
+
+    # Calculate gross income
+    gross_income = annual_rental_income + other_income
+    vacancy_loss = gross_income * vacancy_rate
+    effective_gross_income = gross_income - vacancy_loss
+
+    # Estimate missing expenses using defaults
+    estimate_bases = {
+        "property_taxes": (property_taxes, purchase_price, default_property_tax_rate),
+        "insurance": (insurance, purchase_price, default_insurance_rate),
+        "property_management": (property_management, effective_gross_income, default_management_rate),
+        "maintenance_repairs": (maintenance_repairs, effective_gross_income, default_maintenance_rate),
+    }
+    expenses = {}
+    for name, (provided, base, rate) in estimate_bases.items():
+        estimate = base * _as_column(rate, size, f"default rate for {name}", None)
+        if provided is None:
+            expenses[name] = estimate
+        else:
+            column = _as_column(provided, size, name, None)
+            expenses[name] = np.where(np.isnan(column), estimate, column)
+
+    fixed_values = {
+        "utilities": utilities,
+        "advertising_marketing": advertising_marketing,
+        "legal_accounting": legal_accounting,
+        "landscaping": landscaping,
+        "pest_control": pest_control,
+        "other_expenses": other_expenses,
+    }
+    for name, value in fixed_values.items():
+        expenses[name] = _as_column(value, size, name, 0.0)
+
+    # Calculate total operating expenses
+    total_expenses = np.zeros(size, dtype=np.float64)
+    for name in EXPENSE_FIELDS:
+        total_expenses += expenses[name]
+
+    # Calculate Net Operating Income (NOI)
+    noi = effective_gross_income - total_expenses
+
+    # Calculate Cap Rate (0 where there is no purchase price)
+    positive_price = purchase_price > 0
+    cap_rate = np.zeros(size, dtype=np.float64)
+    np.divide(noi, purchase_price, out=cap_rate, where=positive_price)
+    cap_rate *= 100
+
+    return {
+        "cap_rate": cap_rate,
+        "noi": noi,
+        "gross_income": gross_income,
+        "effective_gross_income": effective_gross_income,
+        "vacancy_loss": vacancy_loss,
+        "total_expenses": total_expenses,
+        "expense_breakdown": expenses,
+    }
@@ -0,0 +1,190 @@
+from typing import Any, Dict, Optional
+
+import numpy as np
+
+from app.services.calculations import ArrayLike, calculate_property_metrics_batch
+
+MAX_HOLD_YEARS = 30
+
+# Expenses estimated from income grow with rents; everything else grows with expense inflation
+INCOME_DRIVEN_EXPENSES = ("property_management", "maintenance_repairs")
+
+
+def _column(value: ArrayLike, size: int) -> np.ndarray:
+    return np.broadcast_to(np.asarray(value, dtype=np.float64), (size,))
+
+
+def npv_batch(cash_flows: np.ndarray, rates: ArrayLike) -> np.ndarray:
+    """
+    Net present value of each row of a cash-flow matrix.
+
+    Args:
+        cash_flows: Array of shape (n, periods); column 0 is the time-0 flow
+        rates: Discount rate per row (or a scalar for all rows)
+
+    Returns:
+        Array of n net present values
+    """
+    periods = np.arange(cash_flows.shape[1], dtype=np.float64)
+    rates = _column(rates, cash_flows.shape[0])
+    discount = (1 + rates)[:, None] ** -periods
+    return np.einsum("ij,ij->i", cash_flows, discount)
+
+
+def _npv_and_slope(cash_flows: np.ndarray, t: np.ndarray, rates: np.ndarray):
+    """NPV and its derivative with respect to the rate for each row."""
+    discount = np.exp(-np.log1p(rates)[:, None] * t)
+    npv = np.einsum("ij,ij->i", cash_flows, discount)
+    slope = -np.einsum("ij,ij->i", cash_flows * t, discount) / (1 + rates)
+    return npv, slope
+
+
+def irr_batch(
+    cash_flows: np.ndarray,
+    tol: float = 1e-10,
+    max_iter: int = 100,
+    lower: float = -0.99,
+    upper: float = 10.0,
+) -> np.ndarray:
+    """
+    Solve the internal rate of return for every row of a cash-flow matrix at once.
+
+    Uses a safeguarded Newton iteration on all rows simultaneously: each row keeps
+    a bracket around its root and falls back to bisection whenever the Newton step
+    leaves it, so the solver is as robust as bisection and as fast as Newton.
+    Rows may be zero-padded past their horizon; trailing zeros do not change the IRR.
+
+    Args:
+        cash_flows: Array of shape (n, periods); column 0 is the (usually negative) time-0 flow
+        tol: Convergence tolerance on the rate
+        max_iter: Maximum number of iterations
+        lower: Lowest rate searched
+        upper: Highest rate searched
+
+    Returns:
+        Array of n IRRs as decimals; NaN where no root exists in [lower, upper]
+    """
+    cash_flows = np.asarray(cash_flows, dtype=np.float64)
+    n, periods = cash_flows.shape
+    t = np.arange(periods, dtype=np.float64)
+
+    lo = np.full(n, lower)
+    hi = np.full(n, upper)
+    npv_lo, _ = _npv_and_slope(cash_flows, t, lo)
+    npv_hi, _ = _npv_and_slope(cash_flows, t, hi)
+    solvable = np.sign(npv_lo) != np.sign(npv_hi)
+
+    # Start from a simple guess: the average annual return implied by total flows
+    invested = np.maximum(-cash_flows[:, 0], 1e-12)
+    total = cash_flows[:, 1:].sum(axis=1)
+    horizon = np.maximum((cash_flows[:, 1:] != 0).sum(axis=1), 1)
+    rate = np.clip(np.sign(total) * (np.abs(total) / invested) ** (1 / horizon) - 1, lower + 1e-6, upper - 1e-6)
+    rate = np.where(solvable, rate, np.nan)
+
+    active = solvable.copy()
+    for _ in range(max_iter):
+        if not active.any():
+            break
+        idx = np.nonzero(active)[0]
+        r = rate[idx]
+        npv, slope = _npv_and_slope(cash_flows[idx], t, r)
+
+        # Tighten the bracket: keep the endpoint whose NPV sign differs from the new point
+        same_as_lo = np.sign(npv) == np.sign(npv_lo[idx])
+        lo[idx] = np.where(same_as_lo, r, lo[idx])
+        npv_lo[idx] = np.where(same_as_lo, npv, npv_lo[idx])
+        hi[idx] = np.where(same_as_lo, hi[idx], r)
+
+        with np.errstate(divide="ignore", invalid="ignore"):
+            newton = r - npv / slope
+        in_bracket = np.isfinite(newton) & (newton > lo[idx]) & (newton < hi[idx])
+        new_rate = np.where(in_bracket, newton, 0.5 * (lo[idx] + hi[idx]))
+        new_rate = np.where(npv == 0, r, new_rate)
+
+        converged = (np.abs(new_rate - r) < tol) | (hi[idx] - lo[idx] < tol) | (npv == 0)
+        rate[idx] = new_rate
+        active[idx[converged]] = False
+
+    return rate
+
+
+def project_hold_period_batch(
+    purchase_price: ArrayLike,
+    annual_rental_income: ArrayLike,
+    horizon_years: ArrayLike,
+    rent_growth_rate: ArrayLike = 0.03,
+    expense_growth_rate: ArrayLike = 0.03,
+    appreciation_rate: ArrayLike = 0.04,
+    discount_rate: ArrayLike = 0.08,
+    selling_cost_rate: ArrayLike = 0.06,
+    **metric_kwargs: Any,
+) -> Dict[str, Any]:
+    """
+    Project annual NOI, resale value, NPV and IRR for property/horizon pairs.
+
+    Year-1 income and expenses come from calculate_property_metrics_batch. Income
+    and the income-driven expenses (management, maintenance) grow at the rent growth
+    rate; all other expenses grow at the expense growth rate. The property is sold
+    at the end of the horizon at the appreciated value less selling costs. Cash
+    flows are unlevered: the purchase price is paid at time 0.
+
+    Args:
+        purchase_price: Acquisition cost per row
+        annual_rental_income: Year-1 rental income per row
+        horizon_years: Hold period per row, 1 to MAX_HOLD_YEARS
+        rent_growth_rate: Annual rent growth (MarketData.rent_growth_rate)
+        expense_growth_rate: Annual operating expense growth
+        appreciation_rate: Annual value appreciation (MarketData.market_appreciation_rate)
+        discount_rate: Discount rate for NPV
+        selling_cost_rate: Selling costs as a fraction of the resale value
+        **metric_kwargs: Other calculate_property_metrics_batch arguments (expenses, vacancy_rate, ...)
+
+    Returns:
+        dict: projected_noi (n, max_horizon) with zeros past each horizon, resale_value,
+        net_sale_proceeds, npv, irr (decimal, NaN if undefined), equity_multiple
+        (NaN without a purchase price) and cash_flows (n, max_horizon + 1)
+    """
+    horizon = np.atleast_1d(np.asarray(horizon_years, dtype=np.int64))
+    if horizon.size and (horizon.min() < 1 or horizon.max() > MAX_HOLD_YEARS):
+        raise ValueError(f"horizon_years must be between 1 and {MAX_HOLD_YEARS}")
+    n = horizon.size
+    purchase_price = _column(purchase_price, n)
+
+    year_one = calculate_property_metrics_batch(
+        purchase_price=purchase_price,
+        annual_rental_income=_column(annual_rental_income, n),
+        **metric_kwargs,
+    )
+    breakdown = year_one["expense_breakdown"]
+    income_expenses = sum(breakdown[name] for name in INCOME_DRIVEN_EXPENSES)
+    other_expenses = year_one["total_expenses"] - income_expenses
+    income_net = year_one["effective_gross_income"] - income_expenses
+
+    max_horizon = int(horizon.max()) if n else 0
+    years = np.arange(max_horizon, dtype=np.float64)
+    rent_growth = (1 + _column(rent_growth_rate, n))[:, None] ** years
+    expense_growth = (1 + _column(expense_growth_rate, n))[:, None] ** years
+    projected_noi = income_net[:, None] * rent_growth - other_expenses[:, None] * expense_growth
+    # Zero out years past each row's horizon
+    projected_noi *= years < horizon[:, None]
+
+    resale_value = purchase_price * (1 + _column(appreciation_rate, n)) ** horizon
+    net_sale_proceeds = resale_value * (1 - _column(selling_cost_rate, n))
+
+    cash_flows = np.zeros((n, max_horizon + 1), dtype=np.float64)
+    cash_flows[:, 0] = -purchase_price
+    cash_flows[:, 1:] = projected_noi
+    cash_flows[np.arange(n), horizon] += net_sale_proceeds
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        equity_multiple = np.where(purchase_price > 0, cash_flows[:, 1:].sum(axis=1) / purchase_price, np.nan)
+
+    return {
+        "projected_noi": projected_noi,
+        "resale_value": resale_value,
+        "net_sale_proceeds": net_sale_proceeds,
+        "npv": npv_batch(cash_flows, discount_rate),
+        "irr": irr_batch(cash_flows),
+        "equity_multiple": equity_multiple,
+        "cash_flows": cash_flows,
+    }
@@ -0,0 +1,343 @@
+import csv
+import hashlib
+import json
+import math
+import os
+from typing import Any, Dict, Iterable, List, Optional
+
+import numpy as np
+
+from app.services.address_parser import parse_address
+from app.services.property_data_provider import PropertyData
+
+PROPERTY_TYPES = ["single_family", "condo", "townhouse", "multi_family", "other"]
+_TYPE_CODES = {name: code for code, name in enumerate(PROPERTY_TYPES)}
+
+# Relative weight of each difference in the similarity score (lower score = more similar)
+DEFAULT_WEIGHTS = {
+    "distance": 1.0,       # per distance_scale_km
+    "bedrooms": 0.5,       # per bedroom
+    "bathrooms": 0.3,      # per bathroom
+    "square_feet": 2.0,    # per 100% size difference
+    "year_built": 0.1,     # per decade
+    "property_type": 2.0,  # type mismatch
+}
+
+KM_PER_DEGREE_LAT = 110.57
+KM_PER_DEGREE_LON = 111.32
+
+# Numeric columns of the store; rows are sorted by grid cell
+_COLUMNS = {
+    "cell": np.int64,
+    "latitude": np.float32,
+    "longitude": np.float32,
+    "bedrooms": np.float32,
+    "bathrooms": np.float32,
+    "square_feet": np.float32,
+    "year_built": np.float32,
+    "property_type": np.int8,
+    "zip_code": np.int32,
+    "address_hash": np.uint64,
+}
+
+def address_hash(address: str) -> int:
+    """64-bit hash of the canonical address key."""
+    digest = hashlib.blake2b(parse_address(address).key.encode("utf-8"), digest_size=8).digest()
+    return int.from_bytes(digest, "little")
+
+def _zip_int(zip_code: Any) -> int:
+    digits = str(zip_code or "").strip()[:5]
+    return int(digits) if digits.isdigit() else -1
+
+def _float(value: Any) -> float:
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return float("nan")
+
+class ComparablesIndex:
+    """
+    Columnar store of properties with a grid index for location and feature k-NN.
+
+    Properties live in NumPy columns sorted by a lat/lon grid cell, so every grid
+    row of a search window is one contiguous slice found by binary search, and
+    candidates are scored in a single vectorized pass. Addresses are kept as one
+    UTF-8 blob plus offsets. save() writes the columns as .npy files and load()
+    memory-maps them, so all uvicorn workers share one copy in the page cache.
+
+    insert() appends to a small in-memory delta that queries scan alongside the
+    main store; compact() (automatic past compact_threshold) merges it in.
+
+    Args:
+        cell_degrees: Grid cell size in degrees (0.01 is about 1 km)
+        compact_threshold: Delta size that triggers compaction
+    """
+
+    def __init__(self, cell_degrees: float = 0.01, compact_threshold: int = 10000):
+        self.cell_degrees = cell_degrees
+        self.compact_threshold = compact_threshold
+        self._n_cols = int(math.ceil(360.0 / cell_degrees)) + 1
+        self.columns: Dict[str, np.ndarray] = {name: np.empty(0, dtype=dtype) for name, dtype in _COLUMNS.items()}
+        self.address_offsets = np.zeros(1, dtype=np.int64)
+        self.address_blob = np.empty(0, dtype=np.uint8)
+        self._hash_order = np.empty(0, dtype=np.int64)
+        self._delta: List[Dict[str, Any]] = []
+        self._delta_columns: Optional[Dict[str, np.ndarray]] = None
+        self._zip_centroids: Optional[tuple] = None
+
+    def __len__(self) -> int:
+        return len(self.columns["cell"]) + len(self._delta)
+
+    def _cells(self, latitude, longitude):
+        row = np.floor((np.asarray(latitude, dtype=np.float64) + 90.0) / self.cell_degrees).astype(np.int64)
+        col = np.floor((np.asarray(longitude, dtype=np.float64) + 180.0) / self.cell_degrees).astype(np.int64)
+        return row * self._n_cols + col
+
+    @staticmethod
+    def _record(row: Dict[str, Any]) -> Dict[str, Any]:
+        """Normalize one input row (CSV strings or typed values)."""
+        return {
+            "address": str(row["address"]),
+            "latitude": float(row["latitude"]),
+            "longitude": float(row["longitude"]),
+            "bedrooms": _float(row.get("bedrooms")),
+            "bathrooms": _float(row.get("bathrooms")),
+            "square_feet": _float(row.get("square_feet")),
+            "year_built": _float(row.get("year_built")),
+            "property_type": _TYPE_CODES.get(str(row.get("property_type") or "other"), _TYPE_CODES["other"]),
+            "zip_code": _zip_int(row.get("zip_code")),
+            "address_hash": address_hash(str(row["address"])),
+        }
+
+    def _records_to_columns(self, records: List[Dict[str, Any]]) -> Dict[str, np.ndarray]:
+        columns = {name: np.array([r[name] for r in records], dtype=dtype) for name, dtype in _COLUMNS.items() if name != "cell"}
+        columns["cell"] = self._cells(columns["latitude"], columns["longitude"])
+        return columns
+
+    def build(self, rows: Iterable[Dict[str, Any]]):
+        """Replace the store with the given property rows and sort them into grid order."""
+        self._delta = [self._record(row) for row in rows]
+        self._set_columns({name: np.empty(0, dtype=dtype) for name, dtype in _COLUMNS.items()}, [])
+        self.compact()
+
+    def _set_columns(self, columns: Dict[str, np.ndarray], addresses: List[bytes]):
+        self.columns = columns
+        lengths = np.fromiter((len(a) for a in addresses), dtype=np.int64, count=len(addresses))
+        self.address_offsets = np.concatenate(([0], np.cumsum(lengths)))
+        self.address_blob = np.frombuffer(b"".join(addresses), dtype=np.uint8)
+        self._hash_order = np.argsort(columns["address_hash"], kind="stable")
+        self._zip_centroids = None
+
+    def address(self, i: int) -> str:
+        return bytes(self.address_blob[self.address_offsets[i]:self.address_offsets[i + 1]]).decode("utf-8")
+
+    def insert(self, row: Dict[str, Any]):
+        """Add one property; it is searchable immediately."""
+        self._delta.append(self._record(row))
+        self._delta_columns = None
+        self._zip_centroids = None
+        if len(self._delta) >= self.compact_threshold:
+            self.compact()
+
+    def compact(self):
+        """Merge inserted properties into the grid-sorted main store (copies a memory-mapped store into memory)."""
+        if not self._delta:
+            return
+        addresses = [self.address(i).encode("utf-8") for i in range(len(self.columns["cell"]))]
+        addresses += [r["address"].encode("utf-8") for r in self._delta]
+        delta = self._records_to_columns(self._delta)
+        merged = {name: np.concatenate((np.asarray(self.columns[name]), delta[name])) for name in _COLUMNS}
+        order = np.argsort(merged["cell"], kind="stable")
+        self._set_columns({name: column[order] for name, column in merged.items()}, [addresses[i] for i in order])
+        self._delta = []
+        self._delta_columns = None
+
+    def save(self, path: str):
+        """Write the store as a directory of .npy files (pending inserts are compacted first)."""
+        self.compact()
+        os.makedirs(path, exist_ok=True)
+        for name, column in self.columns.items():
+            np.save(os.path.join(path, f"{name}.npy"), column)
+        np.save(os.path.join(path, "address_offsets.npy"), self.address_offsets)
+        np.save(os.path.join(path, "address_blob.npy"), self.address_blob)
+        np.save(os.path.join(path, "address_hash_order.npy"), self._hash_order)
+        with open(os.path.join(path, "meta.json"), "w") as f:
+            json.dump({"cell_degrees": self.cell_degrees, "count": len(self.columns["cell"])}, f)
+
+    @classmethod
+    def load(cls, path: str, compact_threshold: int = 10000) -> "ComparablesIndex":
+        """Memory-map a store written by save()."""
+        with open(os.path.join(path, "meta.json")) as f:
+            meta = json.load(f)
+        index = cls(cell_degrees=meta["cell_degrees"], compact_threshold=compact_threshold)
+        index.columns = {name: np.load(os.path.join(path, f"{name}.npy"), mmap_mode="r") for name in _COLUMNS}
+        index.address_offsets = np.load(os.path.join(path, "address_offsets.npy"), mmap_mode="r")
+        index.address_blob = np.load(os.path.join(path, "address_blob.npy"), mmap_mode="r")
+        index._hash_order = np.load(os.path.join(path, "address_hash_order.npy"), mmap_mode="r")
+        return index
+
+    @classmethod
+    def from_csv(cls, path: str, **kwargs) -> "ComparablesIndex":
+        """
+        Build a store from a CSV with address, latitude, longitude, property_type,
+        bedrooms, bathrooms, square_feet, year_built and zip_code columns.
+        """
+        index = cls(**kwargs)
+        with open(path, newline="", encoding="utf-8") as f:
+            index.build(csv.DictReader(f))
+        return index
+
+    def locate(self, address: str) -> Optional[tuple]:
+        """Coordinates of a known address as (latitude, longitude), or None."""
+        target = np.uint64(address_hash(address))
+        hashes = self.columns["address_hash"]
+        i = np.searchsorted(hashes, target, sorter=self._hash_order)
+        if i < len(hashes) and hashes[self._hash_order[i]] == target:
+            row = self._hash_order[i]
+            return float(self.columns["latitude"][row]), float(self.columns["longitude"][row])
+        for record in self._delta:
+            if record["address_hash"] == target:
+                return record["latitude"], record["longitude"]
+        return None
+
+    def zip_centroid(self, zip_code: str) -> Optional[tuple]:
+        """Mean coordinates of the stored properties in a ZIP code, or None."""
+        if self._zip_centroids is None:
+            zips = np.concatenate((np.asarray(self.columns["zip_code"]), np.array([r["zip_code"] for r in self._delta], dtype=np.int32)))
+            lats = np.concatenate((np.asarray(self.columns["latitude"], dtype=np.float64), [r["latitude"] for r in self._delta]))
+            lons = np.concatenate((np.asarray(self.columns["longitude"], dtype=np.float64), [r["longitude"] for r in self._delta]))
+            keys, inverse, counts = np.unique(zips, return_inverse=True, return_counts=True)
+            self._zip_centroids = (keys, np.bincount(inverse, lats) / counts, np.bincount(inverse, lons) / counts)
+        keys, lats, lons = self._zip_centroids
+        i = np.searchsorted(keys, _zip_int(zip_code))
+        if i < len(keys) and keys[i] == _zip_int(zip_code) and keys[i] >= 0:
+            return float(lats[i]), float(lons[i])
+        return None
+
+    def _candidates(self, latitude: float, longitude: float, k: int, max_rings: int) -> np.ndarray:
+        """Row indices in the grid window around a point, widened until it holds enough rows."""
+        cells = self.columns["cell"]
+        center = int(self._cells(latitude, longitude))
+        row, col = divmod(center, self._n_cols)
+        for rings in range(1, max_rings + 1):
+            rows = np.arange(row - rings, row + rings + 1, dtype=np.int64)
+            starts = np.searchsorted(cells, rows * self._n_cols + col - rings, side="left")
+            ends = np.searchsorted(cells, rows * self._n_cols + col + rings, side="right")
+            total = int((ends - starts).sum())
+            if total >= 4 * k or rings == max_rings:
+                break
+        if total == 0:
+            return np.empty(0, dtype=np.int64)
+        return np.concatenate([np.arange(s, e) for s, e in zip(starts, ends) if e > s])
+
+    def _score(self, columns: Dict[str, np.ndarray], rows, latitude, longitude, target, weights, distance_scale_km):
+        lat = np.asarray(columns["latitude"][rows], dtype=np.float64)
+        lon = np.asarray(columns["longitude"][rows], dtype=np.float64)
+        dy = (lat - latitude) * KM_PER_DEGREE_LAT
+        dx = (lon - longitude) * KM_PER_DEGREE_LON * math.cos(math.radians(latitude))
+        distance = np.sqrt(dx * dx + dy * dy)
+        score = weights["distance"] * distance / distance_scale_km
+        for name in ("bedrooms", "bathrooms"):
+            if target.get(name) is not None:
+                score += weights[name] * np.nan_to_num(np.abs(columns[name][rows] - target[name]), nan=2.0)
+        if target.get("square_feet"):
+            relative = np.abs(columns["square_feet"][rows] - target["square_feet"]) / target["square_feet"]
+            score += weights["square_feet"] * np.nan_to_num(relative, nan=1.0)
+        if target.get("year_built"):
+            score += weights["year_built"] * np.nan_to_num(np.abs(columns["year_built"][rows] - target["year_built"]) / 10.0, nan=2.0)
+        if target.get("property_type") is not None:
+            score += weights["property_type"] * (columns["property_type"][rows] != _TYPE_CODES.get(target["property_type"], _TYPE_CODES["other"]))
+        return score, distance
+
+    def query(
+        self,
+        latitude: float,
+        longitude: float,
+        target: Dict[str, Any],
+        k: int = 5,
+        weights: Optional[Dict[str, float]] = None,
+        distance_scale_km: float = 1.0,
+        max_rings: int = 8,
+        exclude_address: Optional[str] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Top-k most similar properties around a location.
+
+        Args:
+            latitude, longitude: Search center
+            target: Features to match: bedrooms, bathrooms, square_feet, year_built, property_type
+            k: Number of results
+            weights: Overrides for DEFAULT_WEIGHTS
+            distance_scale_km: Distance that costs as much as one unit of weights["distance"]
+            max_rings: Largest search window, in grid cells around the center
+            exclude_address: Address to leave out (usually the subject property)
+
+        Returns:
+            Result dicts ordered from most to least similar
+        """
+        weights = {**DEFAULT_WEIGHTS, **(weights or {})}
+        excluded = np.uint64(address_hash(exclude_address)) if exclude_address else None
+        results = []
+
+        rows = self._candidates(latitude, longitude, k, max_rings) if len(self.columns["cell"]) else np.empty(0, dtype=np.int64)
+        if len(rows):
+            score, distance = self._score(self.columns, rows, latitude, longitude, target, weights, distance_scale_km)
+            if excluded is not None:
+                score[self.columns["address_hash"][rows] == excluded] = np.inf
+            top = np.argpartition(score, min(k, len(score) - 1))[:k]
+            results += [(float(score[i]), float(distance[i]), self.columns, int(rows[i])) for i in top if np.isfinite(score[i])]
+
+        if self._delta:
+            if self._delta_columns is None:
+                self._delta_columns = self._records_to_columns(self._delta)
+            delta_rows = np.arange(len(self._delta))
+            score, distance = self._score(self._delta_columns, delta_rows, latitude, longitude, target, weights, distance_scale_km)
+            if excluded is not None:
+                score[self._delta_columns["address_hash"] == excluded] = np.inf
+            top = np.argpartition(score, min(k, len(score) - 1))[:k]
+            results += [(float(score[i]), float(distance[i]), None, int(i)) for i in top if np.isfinite(score[i])]
+
+        results.sort(key=lambda result: result[0])
+        return [self._result(*result) for result in results[:k]]
+
+    def _result(self, score: float, distance: float, columns: Optional[Dict[str, np.ndarray]], i: int) -> Dict[str, Any]:
+        if columns is None:
+            record = self._delta[i]
+            address = record["address"]
+        else:
+            record = {name: columns[name][i] for name in ("bedrooms", "bathrooms", "square_feet", "year_built", "property_type")}
+            address = self.address(i)
+
+        def optional(value):
+            return None if np.isnan(value) else float(value)
+
+        return {
+            "address": address,
+            "distance_km": round(distance, 3),
+            "similarity_score": round(score, 4),
+            "property_type": PROPERTY_TYPES[int(record["property_type"])],
+            "bedrooms": optional(record["bedrooms"]),
+            "bathrooms": optional(record["bathrooms"]),
+            "square_feet": optional(record["square_feet"]),
+            "year_built": optional(record["year_built"]),
+        }
+
+    def similar_to(self, property_data: PropertyData, k: int = 5, **kwargs) -> List[Dict[str, Any]]:
+        """
+        Comparables for a property, located by its address or else its ZIP code centroid.
+
+        Returns:
+            Result dicts from query(); empty when the property cannot be located
+        """
+        location = self.locate(property_data.address.full_address) or self.zip_centroid(property_data.address.zip_code)
+        if location is None:
+            return []
+        details = property_data.details
+        target = {
+            "bedrooms": details.bedrooms,
+            "bathrooms": details.bathrooms,
+            "square_feet": details.square_feet,
+            "year_built": details.year_built,
+            "property_type": details.property_type,
+        }
+        return self.query(location[0], location[1], target, k=k, exclude_address=property_data.address.full_address, **kwargs)
@@ -0,0 +1,181 @@
+from typing import Any, Dict, Optional, Sequence
+
+import numpy as np
+
+from app.services.calculations import ArrayLike
+
+PAYMENTS_PER_YEAR = 12
+
+# Largest grid evaluated in one call (rates x LTVs x amortization periods x interest-only periods)
+MAX_FINANCING_SCENARIOS = 200_000
+
+
+def _broadcast(*values: ArrayLike):
+    return np.broadcast_arrays(*(np.asarray(v, dtype=np.float64) for v in values))
+
+
+def _payment_factor(periodic_rate: np.ndarray, periods: np.ndarray) -> np.ndarray:
+    """Level payment per unit of principal; straight-line repayment at a zero rate."""
+    with np.errstate(divide="ignore", invalid="ignore"):
+        factor = periodic_rate / -np.expm1(-periods * np.log1p(periodic_rate))
+    return np.where(periodic_rate == 0, 1 / np.maximum(periods, 1), factor)
+
+
+def loan_balance_batch(
+    loan_amount: ArrayLike,
+    annual_rate: ArrayLike,
+    amortization_years: ArrayLike,
+    interest_only_years: ArrayLike,
+    after_years: ArrayLike,
+    payments_per_year: int = PAYMENTS_PER_YEAR,
+) -> np.ndarray:
+    """
+    Outstanding loan balance after a number of years, for many loans at once.
+
+    The loan pays interest only for interest_only_years, then amortizes with level
+    payments over the full amortization_years. All arguments broadcast together.
+
+    Returns:
+        Array of balances (the balloon due if the loan is repaid at after_years)
+    """
+    loan, rate, amortization, interest_only, after = _broadcast(
+        loan_amount, annual_rate, amortization_years, interest_only_years, after_years
+    )
+    i = rate / payments_per_year
+    periods = amortization * payments_per_year
+    paid = np.clip(after - interest_only, 0, amortization) * payments_per_year
+    growth = np.exp(paid * np.log1p(i))
+    payment = loan * _payment_factor(i, periods)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        balance = loan * growth - payment * np.where(i == 0, paid, np.expm1(paid * np.log1p(i)) / i)
+    return np.maximum(balance, 0.0)
+
+
+def amortization_schedule_batch(
+    loan_amount: ArrayLike,
+    annual_rate: ArrayLike,
+    amortization_years: ArrayLike,
+    interest_only_years: ArrayLike,
+    years: int,
+    payments_per_year: int = PAYMENTS_PER_YEAR,
+) -> Dict[str, np.ndarray]:
+    """
+    Annual amortization schedules for many loans at once.
+
+    Args:
+        loan_amount: Principal per loan
+        annual_rate: Nominal annual interest rate per loan, as a decimal
+        amortization_years: Amortization period per loan
+        interest_only_years: Whole years of interest-only payments before amortization starts
+        years: Number of years to schedule
+        payments_per_year: Payments per year (monthly by default)
+
+    Returns:
+        dict of (n, years) arrays: debt_service, interest and principal paid in each
+        year, and balance at the end of each year
+    """
+    loan, rate, amortization, interest_only = (
+        np.atleast_1d(v) for v in _broadcast(loan_amount, annual_rate, amortization_years, interest_only_years)
+    )
+    year_ends = np.arange(years + 1, dtype=np.float64)
+    balance = loan_balance_batch(
+        loan[:, None], rate[:, None], amortization[:, None], interest_only[:, None], year_ends, payments_per_year
+    )
+    principal = balance[:, :-1] - balance[:, 1:]
+
+    i = rate / payments_per_year
+    amortizing_payment = loan * _payment_factor(i, amortization * payments_per_year) * payments_per_year
+    year = year_ends[1:]
+    in_interest_only = year <= interest_only[:, None]
+    repaid = year > (interest_only + amortization)[:, None]
+    debt_service = np.where(in_interest_only, (loan * rate)[:, None], amortizing_payment[:, None])
+    debt_service = np.where(repaid, 0.0, debt_service)
+    return {
+        "debt_service": debt_service,
+        "interest": debt_service - principal,
+        "principal": principal,
+        "balance": balance[:, 1:],
+    }
+
+
+def financing_scenarios(
+    noi: float,
+    purchase_price: float,
+    gross_income: float,
+    operating_expenses: float,
+    interest_rates: Sequence[float],
+    ltvs: Sequence[float],
+    amortization_years: Sequence[float] = (30,),
+    interest_only_years: Sequence[float] = (0,),
+    closing_cost_rate: float = 0.03,
+    balance_after_years: Optional[float] = None,
+    payments_per_year: int = PAYMENTS_PER_YEAR,
+) -> Dict[str, Any]:
+    """
+    Evaluate a grid of loan terms for one property.
+
+    Every combination of rate, LTV, amortization period and interest-only period
+    is evaluated at once. Year-1 figures use the interest-only payment when the
+    loan starts interest only; the amortizing figures use the level payment that
+    follows.
+
+    Args:
+        noi: Year-1 net operating income
+        purchase_price: Acquisition price; loans are sized as ltv * purchase_price
+        gross_income: Gross potential income (rent plus other income, before vacancy)
+        operating_expenses: Year-1 total operating expenses
+        interest_rates: Annual interest rates, as decimals
+        ltvs: Loan-to-value ratios, 0 <= ltv < 1
+        amortization_years: Amortization periods in years
+        interest_only_years: Interest-only periods in whole years
+        closing_cost_rate: Closing costs paid in cash, as a fraction of the price
+        balance_after_years: Also return the loan balance after this many years (e.g. the hold period)
+
+    Returns:
+        dict: the grid axes, its shape [rate][ltv][amortization][interest_only], and
+        flat arrays in that order: loan_amount, annual_debt_service,
+        amortizing_debt_service, dscr, amortizing_dscr, cash_flow, cash_on_cash
+        (percent), break_even_occupancy (percent) and, if requested, loan_balance.
+        DSCR is NaN for an all-cash purchase.
+    """
+    axes = [np.asarray(axis, dtype=np.float64) for axis in (interest_rates, ltvs, amortization_years, interest_only_years)]
+    shape = tuple(len(axis) for axis in axes)
+    if int(np.prod(shape)) > MAX_FINANCING_SCENARIOS:
+        raise ValueError(f"{int(np.prod(shape))} scenarios requested; the limit is {MAX_FINANCING_SCENARIOS}")
+    if (axes[1] < 0).any() or (axes[1] >= 1).any():
+        raise ValueError("ltvs must be between 0 and 1")
+    if (axes[2] <= 0).any() or (axes[3] < 0).any():
+        raise ValueError("amortization_years must be positive and interest_only_years non-negative")
+    rate, ltv, amortization, interest_only = (grid.ravel() for grid in np.meshgrid(*axes, indexing="ij"))
+
+    loan = ltv * purchase_price
+    i = rate / payments_per_year
+    amortizing_debt_service = loan * _payment_factor(i, amortization * payments_per_year) * payments_per_year
+    annual_debt_service = np.where(interest_only >= 1, loan * rate, amortizing_debt_service)
+
+    equity = purchase_price - loan + closing_cost_rate * purchase_price
+    cash_flow = noi - annual_debt_service
+    with np.errstate(divide="ignore", invalid="ignore"):
+        dscr = np.where(annual_debt_service > 0, noi / annual_debt_service, np.nan)
+        amortizing_dscr = np.where(amortizing_debt_service > 0, noi / amortizing_debt_service, np.nan)
+        cash_on_cash = np.where(equity > 0, cash_flow / equity * 100, np.nan)
+        break_even = np.where(gross_income > 0, (operating_expenses + annual_debt_service) / gross_income * 100, np.nan)
+
+    result = {
+        "interest_rates": axes[0].tolist(),
+        "ltvs": axes[1].tolist(),
+        "amortization_years": axes[2].tolist(),
+        "interest_only_years": axes[3].tolist(),
+        "shape": list(shape),
+        "loan_amount": loan,
+        "annual_debt_service": annual_debt_service,
+        "amortizing_debt_service": amortizing_debt_service,
+        "dscr": dscr,
+        "amortizing_dscr": amortizing_dscr,
+        "cash_flow": cash_flow,
+        "cash_on_cash": cash_on_cash,
+        "break_even_occupancy": break_even,
+    }
+    if balance_after_years is not None:
+        result["loan_balance"] = loan_balance_batch(loan, rate, amortization, interest_only, balance_after_years, payments_per_year)
+    return result
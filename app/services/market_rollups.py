@@ -0,0 +1,358 @@
+import csv
+import fcntl
+import math
+import os
+from contextlib import contextmanager
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+from app.services.property_data_provider import PropertyData
+
+# Relative error of the quantile sketches: a reported median is within 1% of a true sample value
+RELATIVE_ACCURACY = 0.01
+_GAMMA = (1 + RELATIVE_ACCURACY) / (1 - RELATIVE_ACCURACY)
+_LOG_GAMMA = math.log(_GAMMA)
+
+# Rollup key scopes, most specific first; ALL_TYPES aggregates every property type of a region
+SCOPES = ("zip", "county")
+ALL_TYPES = "*"
+
+# MarketData fields materialized for every key, in file column order
+FIELDS = ("median_rent_per_sqft", "average_rent_nearby", "vacancy_rate")
+# Running aggregates per key, in file column order
+_AGGREGATES = ("listings", "rent_sum", "rent_count", "vacancy_sum", "vacancy_count", "zero_count")
+
+RollupKey = Tuple[str, str, str]
+
+@contextmanager
+def _file_lock(path: str):
+    """Exclusive lock shared by every process that opens the same lock file."""
+    with open(path, "a") as f:
+        fcntl.flock(f, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(f, fcntl.LOCK_UN)
+
+def _float(value: Any) -> float:
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return float("nan")
+
+class QuantileSketch:
+    """
+    Streaming quantile sketch with relative accuracy (DDSketch-style).
+
+    Positive values are counted in logarithmic buckets, so every quantile is
+    answered within RELATIVE_ACCURACY of an actual value, memory grows with the
+    value range rather than the number of values, and sketches merge exactly.
+    """
+
+    __slots__ = ("counts", "zero_count", "count")
+
+    def __init__(self, counts: Optional[Dict[int, int]] = None, zero_count: int = 0):
+        self.counts: Dict[int, int] = counts or {}
+        self.zero_count = zero_count
+        self.count = zero_count + sum(self.counts.values())
+
+    def add(self, value: float, weight: int = 1):
+        if value > 0:
+            bucket = math.ceil(math.log(value) / _LOG_GAMMA)
+            self.counts[bucket] = self.counts.get(bucket, 0) + weight
+        else:
+            self.zero_count += weight
+        self.count += weight
+
+    def merge(self, other: "QuantileSketch"):
+        for bucket, count in other.counts.items():
+            self.counts[bucket] = self.counts.get(bucket, 0) + count
+        self.zero_count += other.zero_count
+        self.count += other.count
+
+    def quantile(self, q: float) -> Optional[float]:
+        """Estimated q-quantile (q in [0, 1]), or None for an empty sketch."""
+        if not self.count:
+            return None
+        rank = q * (self.count - 1)
+        seen = self.zero_count
+        if rank < seen:
+            return 0.0
+        for bucket in sorted(self.counts):
+            seen += self.counts[bucket]
+            if rank < seen:
+                return 2 * _GAMMA ** bucket / (_GAMMA + 1)
+        return 2 * _GAMMA ** max(self.counts) / (_GAMMA + 1)
+
+class _Rollup:
+    __slots__ = ("rent_per_sqft", "listings", "rent_sum", "rent_count", "vacancy_sum", "vacancy_count")
+
+    def __init__(self, rent_per_sqft: Optional[QuantileSketch] = None, aggregates: Optional[Dict[str, float]] = None):
+        self.rent_per_sqft = rent_per_sqft or QuantileSketch()
+        aggregates = aggregates or {}
+        for name in self.__slots__[1:]:
+            setattr(self, name, aggregates.get(name, 0.0))
+
+    def fields(self) -> Tuple[Optional[float], ...]:
+        median = self.rent_per_sqft.quantile(0.5)
+        return (
+            round(median, 4) if median is not None else None,
+            self.rent_sum / self.rent_count if self.rent_count else None,
+            self.vacancy_sum / self.vacancy_count if self.vacancy_count else None,
+        )
+
+class MarketRollupStore:
+    """
+    Materialized market statistics per (ZIP or county, property type).
+
+    Each key keeps a quantile sketch of rent per square foot and running sums for
+    average rent and vacancy, so add() folds a new listing into the four keys it
+    belongs to (its ZIP and county, with and without its property type) without
+    rescanning earlier listings. The MarketData fields of every key are kept
+    materialized, so lookup() is a few dict lookups.
+
+    save() writes one uncompressed .npz file of flat arrays. load() reads the
+    materialized fields into a dict and leaves the sketches in their arrays until
+    a key is next updated, so startup does not rebuild every sketch.
+
+    Every process (e.g. uvicorn worker) holds its own store, so a listing is only
+    seen by the store that received it. merge_into() folds the listings added
+    since the store was loaded into the file under a lock, so several processes
+    sharing a file each contribute their listings instead of overwriting each
+    other's; the others see them after their next load.
+    """
+
+    def __init__(self, track_changes: bool = True):
+        self._fields: Dict[RollupKey, Tuple[Optional[float], ...]] = {}
+        self._rollups: Dict[RollupKey, _Rollup] = {}
+        # Sketch and aggregate arrays of a loaded file, decoded into _rollups on first update of a key
+        self._loaded: Optional[Dict[str, np.ndarray]] = None
+        self._loaded_rows: Dict[RollupKey, int] = {}
+        self.listings = 0
+        self.modified = False
+        # Rollups of only the listings added since load or the last merge_into(), for merge_into()
+        self._track_changes = track_changes
+        self._changes: Optional[MarketRollupStore] = None
+
+    def __len__(self) -> int:
+        return len(self._fields)
+
+    @staticmethod
+    def keys_for(zip_code: Optional[str], county: Optional[str], property_type: Optional[str]) -> List[RollupKey]:
+        """Rollup keys for a location, most specific first."""
+        keys = []
+        property_type = str(property_type or "").strip().lower() or None
+        for scope, region in zip(SCOPES, (str(zip_code or "").strip()[:5], str(county or "").strip().lower())):
+            if region:
+                if property_type and property_type != ALL_TYPES:
+                    keys.append((scope, region, property_type))
+                keys.append((scope, region, ALL_TYPES))
+        return keys
+
+    def _rollup(self, key: RollupKey) -> _Rollup:
+        rollup = self._rollups.get(key)
+        if rollup is None:
+            row = self._loaded_rows.pop(key, None)
+            if row is None:
+                rollup = _Rollup()
+            else:
+                loaded = self._loaded
+                start, end = loaded["sketch_offsets"][row], loaded["sketch_offsets"][row + 1]
+                aggregates = dict(zip(_AGGREGATES, loaded["aggregates"][row].tolist()))
+                sketch = QuantileSketch(
+                    dict(zip(loaded["sketch_buckets"][start:end].tolist(), loaded["sketch_counts"][start:end].tolist())),
+                    zero_count=int(aggregates["zero_count"])
+                )
+                rollup = _Rollup(sketch, aggregates)
+            self._rollups[key] = rollup
+        return rollup
+
+    def _add(self, listing: Dict[str, Any]) -> List[RollupKey]:
+        keys = self.keys_for(listing.get("zip_code"), listing.get("county"), listing.get("property_type"))
+        if not keys:
+            return keys
+        rent = _float(listing.get("monthly_rent"))
+        square_feet = _float(listing.get("square_feet"))
+        vacancy = _float(listing.get("vacancy_rate"))
+        for key in keys:
+            rollup = self._rollup(key)
+            rollup.listings += 1
+            if not math.isnan(rent):
+                rollup.rent_sum += rent
+                rollup.rent_count += 1
+                if square_feet > 0:
+                    rollup.rent_per_sqft.add(rent / square_feet)
+            if not math.isnan(vacancy):
+                rollup.vacancy_sum += vacancy
+                rollup.vacancy_count += 1
+        self.listings += 1
+        self.modified = True
+        if self._track_changes:
+            if self._changes is None:
+                self._changes = MarketRollupStore(track_changes=False)
+            self._changes._add(listing)
+        return keys
+
+    def add(self, listing: Dict[str, Any]) -> bool:
+        """
+        Fold one listing into its rollups.
+
+        Args:
+            listing: Dict (or CSV row) with zip_code and/or county, property_type,
+                monthly_rent, square_feet and optionally vacancy_rate (a decimal)
+
+        Returns:
+            False if the listing has no ZIP code or county and was skipped
+        """
+        keys = self._add(listing)
+        for key in keys:
+            self._fields[key] = self._rollups[key].fields()
+        return bool(keys)
+
+    def ingest(self, listings: Iterable[Dict[str, Any]]) -> int:
+        """Add listings, refreshing each touched key's fields once at the end; returns how many were added."""
+        added = 0
+        touched = set()
+        for listing in listings:
+            keys = self._add(listing)
+            touched.update(keys)
+            added += bool(keys)
+        for key in touched:
+            self._fields[key] = self._rollups[key].fields()
+        return added
+
+    def merge(self, other: "MarketRollupStore"):
+        """Fold every rollup of another store into this one (sketches merge exactly)."""
+        for key in set(other._fields).union(other._rollups):
+            rollup, theirs = self._rollup(key), other._rollup(key)
+            rollup.rent_per_sqft.merge(theirs.rent_per_sqft)
+            for name in _Rollup.__slots__[1:]:
+                setattr(rollup, name, getattr(rollup, name) + getattr(theirs, name))
+            self._fields[key] = rollup.fields()
+        self.listings += other.listings
+        self.modified = True
+
+    def lookup(self, zip_code: Optional[str] = None, county: Optional[str] = None, property_type: Optional[str] = None) -> Dict[str, float]:
+        """
+        Market fields for a location, each from the most specific rollup that has it.
+
+        Keys are tried in order: ZIP and property type, ZIP, county and property
+        type, county.
+
+        Returns:
+            Dict of the FIELDS that have data (empty when no rollup matches)
+        """
+        result: Dict[str, float] = {}
+        for key in self.keys_for(zip_code, county, property_type):
+            values = self._fields.get(key)
+            if values is None:
+                continue
+            for name, value in zip(FIELDS, values):
+                if value is not None and name not in result:
+                    result[name] = value
+            if len(result) == len(FIELDS):
+                break
+        return result
+
+    def apply(self, property_data: PropertyData) -> PropertyData:
+        """Copy of property_data whose market fields are replaced by the rollups for its ZIP, county and type."""
+        fields = self.lookup(property_data.address.zip_code, property_data.address.county, property_data.details.property_type)
+        if not fields:
+            return property_data
+        market = property_data.market.model_copy(update=fields)
+        return property_data.model_copy(update={"market": market})
+
+    def save(self, path: str):
+        """Write the store to one .npz file, replacing it atomically."""
+        keys = sorted(self._fields)
+        offsets = [0]
+        buckets: List[int] = []
+        counts: List[int] = []
+        aggregates = np.zeros((len(keys), len(_AGGREGATES)), dtype=np.float64)
+        for row, key in enumerate(keys):
+            rollup = self._rollup(key)
+            sketch = rollup.rent_per_sqft
+            for bucket in sorted(sketch.counts):
+                buckets.append(bucket)
+                counts.append(sketch.counts[bucket])
+            offsets.append(len(buckets))
+            aggregates[row] = [getattr(rollup, name) for name in _AGGREGATES[:-1]] + [sketch.zero_count]
+        fields = np.array([[np.nan if v is None else v for v in self._fields[key]] for key in keys], dtype=np.float64).reshape(-1, len(FIELDS))
+
+        temporary = f"{path}.tmp"
+        with open(temporary, "wb") as f:
+            np.savez(
+                f,
+                key_scopes=np.array([key[0] for key in keys], dtype=np.str_),
+                key_regions=np.array([key[1] for key in keys], dtype=np.str_),
+                key_types=np.array([key[2] for key in keys], dtype=np.str_),
+                fields=fields,
+                aggregates=aggregates,
+                sketch_offsets=np.array(offsets, dtype=np.int64),
+                sketch_buckets=np.array(buckets, dtype=np.int16),
+                sketch_counts=np.array(counts, dtype=np.uint32),
+                meta=np.array([RELATIVE_ACCURACY, self.listings], dtype=np.float64),
+            )
+        os.replace(temporary, path)
+        self.modified = False
+
+    def merge_into(self, path: str):
+        """
+        Add the listings added to this store since it was loaded (or last merged)
+        to the store in path, under a lock, and adopt the merged result.
+
+        Unlike save(), which replaces the file with this store, listings that other
+        processes merged into the file in the meantime are kept.
+        """
+        with _file_lock(f"{path}.lock"):
+            if os.path.exists(path):
+                merged = MarketRollupStore.load(path)
+                if self._changes is not None:
+                    merged.merge(self._changes)
+            else:
+                merged = self
+            merged.save(path)
+        if merged is not self:
+            self._fields, self._rollups = merged._fields, merged._rollups
+            self._loaded, self._loaded_rows = merged._loaded, merged._loaded_rows
+            self.listings = merged.listings
+        self._changes = None
+        self.modified = False
+
+    @classmethod
+    def load(cls, path: str) -> "MarketRollupStore":
+        """Load a store written by save()."""
+        store = cls()
+        with np.load(path) as data:
+            loaded = {name: data[name] for name in data.files}
+        if loaded["meta"][0] != RELATIVE_ACCURACY:
+            raise ValueError(f"{path} was written with relative accuracy {loaded['meta'][0]}, expected {RELATIVE_ACCURACY}")
+        if "key_regions" in loaded:
+            keys = list(zip(loaded["key_scopes"].tolist(), loaded["key_regions"].tolist(), loaded["key_types"].tolist()))
+        else:
+            # Files written before the key columns: "scope|region|type"
+            keys = [tuple(key.split("|", 2)) for key in loaded["keys"].tolist()]
+        fields = [tuple(None if math.isnan(v) else v for v in row) for row in loaded["fields"].tolist()]
+        store._fields = dict(zip(keys, fields))
+        store._loaded_rows = {key: row for row, key in enumerate(keys)}
+        store._loaded = loaded
+        store.listings = int(loaded["meta"][1])
+        return store
+
+    @classmethod
+    def from_csv(cls, path: str) -> "MarketRollupStore":
+        """Build a store from a listings CSV with the columns add() reads."""
+        store = cls()
+        with open(path, newline="", encoding="utf-8") as f:
+            store.ingest(csv.DictReader(f))
+        return store
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "keys": len(self._fields),
+            "listings": self.listings,
+            "zip_codes": sum(1 for scope, _, property_type in self._fields if scope == "zip" and property_type == ALL_TYPES),
+            "counties": sum(1 for scope, _, property_type in self._fields if scope == "county" and property_type == ALL_TYPES),
+            "modified": self.modified,
+        }
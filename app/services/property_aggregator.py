@@ -0,0 +1,194 @@
+import asyncio
+import random
+import time
+from abc import ABC, abstractmethod
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional, Union
+
+from app.services.property_data_provider import PropertyData
+
+# PropertyData sections a provider can contribute fields to
+SECTIONS = ("address", "details", "financial", "market")
+
+class PropertyDataUnavailableError(Exception):
+    """Raised when the sources that answered in time do not add up to a complete PropertyData."""
+
+class PropertyDataSource(ABC):
+    """
+    Base class for an async property data provider.
+
+    Subclasses implement fetch() and return the fields they know as a partial
+    PropertyData dict keyed by section, e.g. {"financial": {"monthly_rent": 2500.0}}.
+    An optional top-level "last_updated" datetime reports how fresh the data is.
+
+    Args:
+        name: Source name recorded in PropertyData.data_sources
+        priority: Higher priority sources win when two sources provide the same field
+        timeout: Per-source deadline in seconds; the aggregator deadline applies when None
+    """
+
+    def __init__(self, name: str, priority: int = 0, timeout: Optional[float] = None):
+        self.name = name
+        self.priority = priority
+        self.timeout = timeout
+
+    @abstractmethod
+    async def fetch(self, address: Union[str, Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+        """Return this source's fields for the address, or None if it has none."""
+
+class FunctionSource(PropertyDataSource):
+    """
+    Source backed by a synchronous loader returning PropertyData, e.g. get_property_data.
+
+    The loader runs in a worker thread so it does not block the event loop.
+    """
+
+    def __init__(self, name: str, loader: Callable[[Union[str, Dict[str, Any]]], PropertyData], priority: int = 0, timeout: Optional[float] = None):
+        super().__init__(name, priority, timeout)
+        self.loader = loader
+
+    async def fetch(self, address: Union[str, Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+        property_data = await asyncio.to_thread(self.loader, address)
+        return property_data.model_dump(include=set(SECTIONS) | {"last_updated"})
+
+class StubSource(PropertyDataSource):
+    """
+    Local stand-in for a remote provider with injected latency and failures.
+
+    Args:
+        name: Source name
+        fields: Partial PropertyData dict returned on success
+        priority: Merge priority
+        delay: Response latency in seconds
+        jitter: Extra random latency, uniform in [0, jitter] seconds
+        failure_rate: Probability that a call raises instead of answering
+        timeout: Per-source deadline in seconds
+    """
+
+    def __init__(
+        self,
+        name: str,
+        fields: Dict[str, Any],
+        priority: int = 0,
+        delay: float = 0.0,
+        jitter: float = 0.0,
+        failure_rate: float = 0.0,
+        timeout: Optional[float] = None
+    ):
+        super().__init__(name, priority, timeout)
+        self.fields = fields
+        self.delay = delay
+        self.jitter = jitter
+        self.failure_rate = failure_rate
+
+    async def fetch(self, address: Union[str, Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+        await asyncio.sleep(self.delay + random.uniform(0, self.jitter))
+        if random.random() < self.failure_rate:
+            raise ConnectionError(f"{self.name} is unavailable")
+        return self.fields
+
+def merge_source_fields(responses: List[tuple]) -> Dict[str, Any]:
+    """
+    Merge partial PropertyData dicts field by field.
+
+    Args:
+        responses: (priority, fields) tuples; for each field the highest priority
+            non-None value wins
+
+    Returns:
+        Merged PropertyData dict (without last_updated and data_sources)
+    """
+    merged: Dict[str, Dict[str, Any]] = {section: {} for section in SECTIONS}
+    for _, fields in sorted(responses, key=lambda response: response[0]):
+        for section in SECTIONS:
+            for field, value in (fields.get(section) or {}).items():
+                if value is not None:
+                    merged[section][field] = value
+    return merged
+
+class PropertyDataAggregator:
+    """
+    Fans a property lookup out to all registered sources in parallel.
+
+    Every source gets min(its own timeout, deadline) to answer, so a lookup takes
+    at most `deadline` seconds however many sources are slow. Fields are merged by
+    source priority. Sources that time out or fail are listed in
+    PropertyData.missing_sources and the rest of the data is returned as is.
+
+    Args:
+        sources: Registered sources
+        deadline: Overall deadline for one lookup in seconds
+    """
+
+    def __init__(self, sources: Optional[List[PropertyDataSource]] = None, deadline: float = 2.0):
+        self.sources = list(sources or [])
+        self.deadline = deadline
+        self._counters: Dict[str, Dict[str, int]] = {}
+
+    def register(self, source: PropertyDataSource):
+        self.sources.append(source)
+
+    def _count(self, source: PropertyDataSource, outcome: str):
+        counters = self._counters.setdefault(source.name, {"ok": 0, "timeout": 0, "error": 0})
+        counters[outcome] += 1
+
+    async def _query(self, source: PropertyDataSource, address: Union[str, Dict[str, Any]], deadline: float):
+        timeout = min(source.timeout, deadline) if source.timeout is not None else deadline
+        try:
+            fields = await asyncio.wait_for(source.fetch(address), timeout)
+        except asyncio.TimeoutError:
+            self._count(source, "timeout")
+            return None
+        except Exception:
+            self._count(source, "error")
+            return None
+        self._count(source, "ok")
+        return fields
+
+    async def get(self, address: Union[str, Dict[str, Any]]) -> PropertyData:
+        """
+        Retrieve property data from all sources that answer within the deadline.
+
+        Args:
+            address: Property address as string or address components dict
+
+        Returns:
+            PropertyData merged from the responding sources
+
+        Raises:
+            PropertyDataUnavailableError: If the responding sources miss required fields
+        """
+        started = time.monotonic()
+        results = await asyncio.gather(*(self._query(source, address, self.deadline) for source in self.sources))
+
+        responded, missing, responses, timestamps = [], [], [], []
+        for source, fields in zip(self.sources, results):
+            if fields is None:
+                missing.append(source.name)
+                continue
+            responded.append(source.name)
+            responses.append((source.priority, fields))
+            if fields.get("last_updated") is not None:
+                timestamps.append(fields["last_updated"])
+
+        merged = merge_source_fields(responses)
+        # The merged record is only as fresh as its oldest contributing source
+        merged["last_updated"] = min(timestamps) if timestamps else datetime.now()
+        merged["data_sources"] = responded
+        merged["missing_sources"] = missing
+        try:
+            return PropertyData.model_validate(merged)
+        except ValueError as e:
+            elapsed = time.monotonic() - started
+            raise PropertyDataUnavailableError(
+                f"Incomplete property data after {elapsed:.2f}s (responded: {responded}, missing: {missing})"
+            ) from e
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "deadline": self.deadline,
+            "sources": {
+                source.name: {"priority": source.priority, **self._counters.get(source.name, {"ok": 0, "timeout": 0, "error": 0})}
+                for source in self.sources
+            },
+        }
@@ -0,0 +1,170 @@
+import asyncio
+import inspect
+import time
+from typing import Any, Awaitable, Callable, Dict, Optional, Union
+
+from app.core.cache import LRUCache, SQLiteCache
+from app.core.shared_cache import SharedMemoryCache
+from app.services.address_parser import parse_address
+from app.services.property_data_provider import PropertyData
+
+# How long data from each source stays fresh, in seconds, counted from PropertyData.last_updated
+DEFAULT_SOURCE_TTLS = {
+    "mls": 3600,                      # listing status and price change intraday
+    "rental_listings": 6 * 3600,
+    "market_analytics": 24 * 3600,
+    "public_records": 7 * 24 * 3600,
+    "tax_assessor": 30 * 24 * 3600,
+}
+DEFAULT_TTL = 3600
+# Records missing some sources are only kept briefly so the next lookup retries them
+PARTIAL_TTL = 60
+
+def normalize_address_key(address: Union[str, Dict[str, Any]]) -> str:
+    """
+    Build the cache key for an address: the canonical form from parse_address.
+
+    Address dicts are keyed by their street, city, state and ZIP components.
+    """
+    if not isinstance(address, str):
+        address = ", ".join(str(address.get(part, "")) for part in ("street", "city", "state", "zip_code"))
+    return parse_address(address).key
+
+class PropertyDataCache:
+    """
+    Tiered PropertyData cache with single-flight request coalescing.
+
+    Entries expire at PropertyData.last_updated plus the shortest TTL among their
+    data_sources. Lookups go to an in-process LRU first, then to an optional
+    second tier: a SQLite file, or a SharedMemoryCache that all worker processes
+    read and fill together. Concurrent misses for the same address share a single upstream
+    fetch instead of each calling the providers.
+
+    Args:
+        path: SQLite file for the persistent tier; memory only when None
+        max_entries: Size of the in-process LRU tier
+        shared_path: Memory-mapped SharedMemoryCache file used as the second tier instead of SQLite
+        shared_max_bytes: Byte budget of the shared tier
+        source_ttls: Freshness per data source in seconds
+        default_ttl: Freshness for sources not listed in source_ttls
+    """
+
+    def __init__(
+        self,
+        path: Optional[str] = None,
+        max_entries: int = 10000,
+        source_ttls: Optional[Dict[str, float]] = None,
+        default_ttl: float = DEFAULT_TTL,
+        shared_path: Optional[str] = None,
+        shared_max_bytes: int = 64 * 1024 * 1024
+    ):
+        self.memory = LRUCache(max_entries=max_entries)
+        if shared_path:
+            self.persistent = SharedMemoryCache(shared_path, max_bytes=shared_max_bytes)
+        else:
+            self.persistent = SQLiteCache(path, table="property_data") if path else None
+        self.source_ttls = source_ttls or DEFAULT_SOURCE_TTLS
+        self.default_ttl = default_ttl
+        self.memory_hits = 0
+        self.persistent_hits = 0
+        self.misses = 0
+        self.coalesced = 0
+        self._inflight: Dict[str, asyncio.Future] = {}
+
+    def remaining_ttl(self, property_data: PropertyData) -> float:
+        """Seconds until the data is stale (may be negative)."""
+        ttls = [self.source_ttls.get(source, self.default_ttl) for source in property_data.data_sources]
+        ttl = min(ttls) if ttls else self.default_ttl
+        if property_data.missing_sources:
+            ttl = min(ttl, PARTIAL_TTL)
+        return property_data.last_updated.timestamp() + ttl - time.time()
+
+    def _lookup(self, key: str) -> Optional[PropertyData]:
+        property_data = self.memory.get(key)
+        if property_data is not None:
+            self.memory_hits += 1
+            return property_data
+        if self.persistent is not None:
+            stored = self.persistent.get(key)
+            if stored is not None:
+                property_data = PropertyData.model_validate(stored)
+                remaining = self.remaining_ttl(property_data)
+                if remaining > 0:
+                    self.persistent_hits += 1
+                    self.memory.set(key, property_data, ttl=remaining)
+                    return property_data
+        return None
+
+    def store(self, key: str, property_data: PropertyData):
+        remaining = self.remaining_ttl(property_data)
+        if remaining <= 0:
+            return
+        self.memory.set(key, property_data, ttl=remaining)
+        if self.persistent is not None:
+            self.persistent.set(key, property_data.model_dump(mode="json"), ttl=remaining)
+
+    def invalidate(self, address: Union[str, Dict[str, Any]]):
+        key = normalize_address_key(address)
+        self.memory.delete(key)
+        if self.persistent is not None:
+            self.persistent.delete(key)
+
+    async def get(
+        self,
+        address: Union[str, Dict[str, Any]],
+        fetch: Callable[[Union[str, Dict[str, Any]]], Union[PropertyData, Awaitable[PropertyData]]]
+    ) -> PropertyData:
+        """
+        Return cached property data for an address, fetching it on a miss.
+
+        Args:
+            address: Property address as string or address components dict
+            fetch: Upstream loader (sync or async), e.g. get_property_data. Sync
+                loaders run in a worker thread so they do not block the event loop.
+
+        Returns:
+            PropertyData for the address
+        """
+        key = normalize_address_key(address)
+        property_data = self._lookup(key)
+        if property_data is not None:
+            return property_data
+
+        inflight = self._inflight.get(key)
+        if inflight is not None:
+            self.coalesced += 1
+        else:
+            self.misses += 1
+            # The fetch runs as its own task, so a cancelled caller (e.g. a client disconnect)
+            # does not cancel it for the other callers waiting on the same address
+            inflight = asyncio.ensure_future(self._fetch(key, address, fetch))
+            self._inflight[key] = inflight
+            inflight.add_done_callback(lambda task: self._fetch_done(key, task))
+        return await asyncio.shield(inflight)
+
+    async def _fetch(self, key: str, address: Union[str, Dict[str, Any]], fetch) -> PropertyData:
+        if inspect.iscoroutinefunction(fetch):
+            property_data = await fetch(address)
+        else:
+            property_data = await asyncio.to_thread(fetch, address)
+        self.store(key, property_data)
+        return property_data
+
+    def _fetch_done(self, key: str, task: asyncio.Future):
+        if self._inflight.get(key) is task:
+            del self._inflight[key]
+        # Callers re-raise a failure; mark it retrieved in case every caller was cancelled
+        if not task.cancelled():
+            task.exception()
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.memory_hits + self.persistent_hits + self.misses + self.coalesced
+        return {
+            "memory_hits": self.memory_hits,
+            "persistent_hits": self.persistent_hits,
+            "misses": self.misses,
+            "coalesced": self.coalesced,
+            "hit_rate": round((self.memory_hits + self.persistent_hits) / lookups, 4) if lookups else 0.0,
+            "memory_entries": len(self.memory),
+            **({"shared": self.persistent.stats()} if isinstance(self.persistent, SharedMemoryCache) else {}),
+        }
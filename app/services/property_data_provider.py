@@ -1,6 +1,7 @@
 from typing import Optional, List, Union, Dict, Any
 from pydantic import BaseModel
 from datetime import datetime
+from app.services.address_parser import parse_address
 
 class PropertyAddress(BaseModel):
     street: str
@@ -56,6 +57,7 @@ class PropertyData(BaseModel):
     market: MarketData
     last_updated: datetime
     data_sources: List[str] = []
+    missing_sources: List[str] = []  # sources that timed out or failed for this record
 
 def get_property_data(address: Union[str, Dict[str, Any]]) -> PropertyData:
     """
@@ -76,14 +78,7 @@ def get_property_data(address: Union[str, Dict[str, Any]]) -> PropertyData:
     
     # Parse address if string
     if isinstance(address, str):
-        # TODO: Implement address parsing logic
-        parsed_address = {
-            "street": "123 Main St",
-            "city": "Anytown", 
-            "state": "CA",
-            "zip_code": "12345",
-            "county": "Sample County"
-        }
+        parsed_address = {key: value for key, value in parse_address(address).to_dict().items() if value}
     else:
         parsed_address = address
     
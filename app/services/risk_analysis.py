@@ -0,0 +1,201 @@
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, List, Optional, Sequence
+
+import numpy as np
+
+from app.services.calculations import calculate_property_metrics_batch
+
+DEFAULT_PERCENTILES = (5, 25, 50, 75, 95)
+
+# Largest sensitivity grid evaluated in one call (vacancy rates x rent changes x expense changes)
+MAX_SENSITIVITY_SCENARIOS = 10_000
+
+# Expenses that scale with expense inflation when provided (estimates are recomputed per scenario)
+INFLATED_EXPENSE_FIELDS = ("property_taxes", "insurance", "property_management", "maintenance_repairs", "utilities")
+
+
+def _resolve_fixed_estimates(inputs: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Resolve the price-based default estimates (taxes, insurance) up front.
+
+    They do not depend on the scenario, so resolving them once lets expense inflation
+    apply to them like any other provided expense. Income-based estimates
+    (management, maintenance) stay None and are re-estimated from each scenario's
+    effective gross income.
+    """
+    resolved = dict(inputs)
+    purchase_price = resolved["purchase_price"]
+    if resolved.get("property_taxes") is None:
+        resolved["property_taxes"] = purchase_price * resolved.get("default_property_tax_rate", 0.015)
+    if resolved.get("insurance") is None:
+        resolved["insurance"] = purchase_price * resolved.get("default_insurance_rate", 0.003)
+    return resolved
+
+
+def _scenario_metrics(
+    inputs: Dict[str, Any],
+    vacancy_rate: np.ndarray,
+    rent_multiplier: np.ndarray,
+    expense_multiplier: np.ndarray,
+) -> Dict[str, Any]:
+    """Evaluate the cap-rate model for arrays of vacancy, rent and expense scenarios."""
+    scenario_inputs = _resolve_fixed_estimates(inputs)
+    scenario_inputs["annual_rental_income"] = inputs["annual_rental_income"] * rent_multiplier
+    scenario_inputs["vacancy_rate"] = vacancy_rate
+    for name in INFLATED_EXPENSE_FIELDS:
+        value = scenario_inputs.get(name)
+        if value is not None:
+            scenario_inputs[name] = value * expense_multiplier
+    # Broadcast scalars so every column has one value per scenario
+    size = np.broadcast(vacancy_rate, rent_multiplier, expense_multiplier).size
+    scenario_inputs["purchase_price"] = np.full(size, inputs["purchase_price"], dtype=np.float64)
+    return calculate_property_metrics_batch(**scenario_inputs)
+
+
+def _percentile_bands(values: np.ndarray, percentiles: Sequence[float]) -> Dict[str, float]:
+    bands = np.percentile(values, percentiles)
+    return {f"p{p:g}": round(float(v), 2) for p, v in zip(percentiles, bands)}
+
+
+def simulate_property_risk(
+    inputs: Dict[str, Any],
+    n_scenarios: int = 10_000,
+    rent_growth_rate: Optional[float] = None,
+    rent_volatility: float = 0.05,
+    vacancy_volatility: float = 0.02,
+    expense_inflation: float = 0.03,
+    expense_volatility: float = 0.01,
+    max_vacancy_rate: float = 0.5,
+    percentiles: Sequence[float] = DEFAULT_PERCENTILES,
+    seed: Optional[int] = None,
+) -> Dict[str, Any]:
+    """
+    Run a Monte Carlo simulation of next-year NOI and cap rate for one property.
+
+    Each scenario draws a vacancy rate around the property's expected vacancy, a
+    lognormal rent multiplier around the market rent growth, and an expense
+    inflation factor. All scenarios are evaluated in a single vectorized call.
+
+    Args:
+        inputs: Keyword arguments for calculate_property_metrics (see metric_inputs_from_property_data)
+        n_scenarios: Number of scenarios to sample
+        rent_growth_rate: Expected annual rent growth (MarketData.rent_growth_rate), 0 if unknown
+        rent_volatility: Standard deviation of the annual rent change
+        vacancy_volatility: Standard deviation of the vacancy rate
+        expense_inflation: Expected annual expense inflation
+        expense_volatility: Standard deviation of expense inflation
+        max_vacancy_rate: Upper bound for sampled vacancy rates
+        percentiles: Percentiles to report for NOI and cap rate
+        seed: Random seed for reproducible results
+
+    Returns:
+        dict: Percentile bands, mean and standard deviation for NOI and cap rate,
+        and the probability of negative NOI
+    """
+    rng = np.random.default_rng(seed)
+    growth = rent_growth_rate or 0.0
+
+    vacancy_rate = np.clip(
+        rng.normal(inputs.get("vacancy_rate", 0.05), vacancy_volatility, n_scenarios), 0.0, max_vacancy_rate
+    )
+    # Lognormal keeps rents positive while matching the requested mean growth
+    sigma = np.sqrt(np.log1p((rent_volatility / (1 + growth)) ** 2))
+    rent_multiplier = (1 + growth) * np.exp(rng.normal(-0.5 * sigma ** 2, sigma, n_scenarios))
+    expense_multiplier = 1 + rng.normal(expense_inflation, expense_volatility, n_scenarios)
+
+    metrics = _scenario_metrics(inputs, vacancy_rate, rent_multiplier, expense_multiplier)
+    noi = metrics["noi"]
+    cap_rate = metrics["cap_rate"]
+
+    return {
+        "n_scenarios": n_scenarios,
+        "noi": {
+            **_percentile_bands(noi, percentiles),
+            "mean": round(float(noi.mean()), 2),
+            "std": round(float(noi.std()), 2),
+        },
+        "cap_rate": {
+            **_percentile_bands(cap_rate, percentiles),
+            "mean": round(float(cap_rate.mean()), 2),
+            "std": round(float(cap_rate.std()), 2),
+        },
+        "probability_negative_noi": round(float((noi < 0).mean()), 4),
+    }
+
+
+def sensitivity_grid(
+    inputs: Dict[str, Any],
+    vacancy_rates: Sequence[float],
+    rent_changes: Sequence[float] = (0.0,),
+    expense_changes: Sequence[float] = (0.0,),
+) -> Dict[str, Any]:
+    """
+    Sweep a deterministic grid of vacancy, rent and expense assumptions.
+
+    Args:
+        inputs: Keyword arguments for calculate_property_metrics
+        vacancy_rates: Vacancy rates to evaluate
+        rent_changes: Relative rent changes to evaluate (e.g. -0.05 for -5%)
+        expense_changes: Relative expense changes to evaluate
+
+    Returns:
+        dict: The grid axes and nested lists of NOI and cap rate indexed as
+        [vacancy][rent_change][expense_change]
+
+    Raises:
+        ValueError: If the grid has more than MAX_SENSITIVITY_SCENARIOS points
+    """
+    size = len(vacancy_rates) * len(rent_changes) * len(expense_changes)
+    if size > MAX_SENSITIVITY_SCENARIOS:
+        raise ValueError(f"{size} sensitivity scenarios requested; the limit is {MAX_SENSITIVITY_SCENARIOS}")
+    vacancy, rent, expense = np.meshgrid(
+        np.asarray(vacancy_rates, dtype=np.float64),
+        1 + np.asarray(rent_changes, dtype=np.float64),
+        1 + np.asarray(expense_changes, dtype=np.float64),
+        indexing="ij",
+    )
+    metrics = _scenario_metrics(inputs, vacancy.ravel(), rent.ravel(), expense.ravel())
+
+    return {
+        "vacancy_rates": list(vacancy_rates),
+        "rent_changes": list(rent_changes),
+        "expense_changes": list(expense_changes),
+        "noi": np.round(metrics["noi"].reshape(vacancy.shape), 2).tolist(),
+        "cap_rate": np.round(metrics["cap_rate"].reshape(vacancy.shape), 2).tolist(),
+    }
+
+
+def _simulate_one(args):
+    inputs, kwargs = args
+    return simulate_property_risk(inputs, **kwargs)
+
+
+def simulate_portfolio_risk(
+    properties: List[Dict[str, Any]],
+    processes: Optional[int] = None,
+    **kwargs,
+) -> List[Dict[str, Any]]:
+    """
+    Run simulate_property_risk for many properties, optionally across a process pool.
+
+    Args:
+        properties: List of calculate_property_metrics keyword arguments, one per property
+        processes: Number of worker processes; None or 1 runs in the current process
+        **kwargs: Passed through to simulate_property_risk. When a seed is given,
+            property i uses seed + i so results do not depend on the worker count.
+
+    Returns:
+        List of simulation results in the same order as properties
+    """
+    seed = kwargs.pop("seed", None)
+    jobs = [
+        (inputs, {**kwargs, "seed": None if seed is None else seed + i})
+        for i, inputs in enumerate(properties)
+    ]
+    if not processes or processes <= 1 or len(jobs) <= 1:
+        return [_simulate_one(job) for job in jobs]
+
+    with ProcessPoolExecutor(max_workers=processes) as pool:
+        # Larger chunks amortize pickling for portfolios with many small simulations
+        chunksize = max(1, len(jobs) // (processes * 4))
+        return list(pool.map(_simulate_one, jobs, chunksize=chunksize))
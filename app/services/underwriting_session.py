@@ -0,0 +1,213 @@
+import inspect
+import time
+import uuid
+from collections import OrderedDict
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from app.services.calculations import (
+    ESTIMATED_EXPENSE_FIELDS,
+    EXPENSE_FIELDS,
+    FIXED_EXPENSE_FIELDS,
+    calculate_property_metrics,
+)
+
+# Inputs of calculate_property_metrics and their defaults (None: estimated when not given)
+INPUT_DEFAULTS: Dict[str, Any] = {
+    name: parameter.default for name, parameter in inspect.signature(calculate_property_metrics).parameters.items()
+    if parameter.default is not inspect.Parameter.empty
+}
+INPUTS = ("purchase_price", "annual_rental_income", *INPUT_DEFAULTS)
+
+
+# Bases of the default estimates: (value estimated from, default rate input)
+_ESTIMATE_BASES = {
+    "property_taxes": ("purchase_price", "default_property_tax_rate"),
+    "insurance": ("purchase_price", "default_insurance_rate"),
+    "property_management": ("effective_gross_income", "default_management_rate"),
+    "maintenance_repairs": ("effective_gross_income", "default_maintenance_rate"),
+}
+
+
+def _estimated(given: Optional[float], base: float, rate: float) -> float:
+    return base * rate if given is None else given
+
+
+def _given(value: float) -> float:
+    return value
+
+
+def _total(*expenses: float) -> float:
+    return sum(expenses)
+
+
+# Derived values of calculate_property_metrics as (name, dependencies, function), in dependency order
+NODES: List[Tuple[str, Tuple[str, ...], Callable[..., float]]] = [
+    ("gross_income", ("annual_rental_income", "other_income"), lambda rent, other: rent + other),
+    ("vacancy_loss", ("gross_income", "vacancy_rate"), lambda gross, rate: gross * rate),
+    ("effective_gross_income", ("gross_income", "vacancy_loss"), lambda gross, loss: gross - loss),
+    *((f"expense_breakdown.{name}", (name, *_ESTIMATE_BASES[name]), _estimated) for name in ESTIMATED_EXPENSE_FIELDS),
+    *((f"expense_breakdown.{name}", (name,), _given) for name in FIXED_EXPENSE_FIELDS),
+    ("total_expenses", tuple(f"expense_breakdown.{name}" for name in EXPENSE_FIELDS), _total),
+    ("noi", ("effective_gross_income", "total_expenses"), lambda income, expenses: income - expenses),
+    ("cap_rate", ("noi", "purchase_price"), lambda noi, price: (noi / price) * 100 if price > 0 else 0),
+]
+OUTPUTS = tuple(name for name, _, _ in NODES)
+
+
+def _downstream(input_name: str) -> List[int]:
+    """Indices of the nodes that depend on an input directly or transitively, in evaluation order."""
+    dirty = {input_name}
+    indices = []
+    for i, (name, dependencies, _) in enumerate(NODES):
+        if dirty.intersection(dependencies):
+            dirty.add(name)
+            indices.append(i)
+    return indices
+
+
+_AFFECTED: Dict[str, List[int]] = {name: _downstream(name) for name in INPUTS}
+
+
+def nest_outputs(values: Dict[str, float]) -> Dict[str, Any]:
+    """Outputs shaped like calculate_property_metrics (expense lines under expense_breakdown)."""
+    result: Dict[str, Any] = {}
+    for name, value in values.items():
+        if name.startswith("expense_breakdown."):
+            result.setdefault("expense_breakdown", {})[name[len("expense_breakdown."):]] = value
+        else:
+            result[name] = value
+    return result
+
+
+class UnderwritingSession:
+    """
+    Pinned inputs of one property and every intermediate value computed from them.
+
+    update() applies input changes and re-evaluates only the nodes downstream of
+    the changed inputs, e.g. a new vacancy_rate recomputes vacancy loss, effective
+    gross income, the management and maintenance estimates, total expenses, NOI
+    and cap rate, but not taxes or insurance.
+    """
+
+    def __init__(self, session_id: str, inputs: Dict[str, Any], address: Optional[str] = None):
+        self.session_id = session_id
+        self.address = address
+        self.values: Dict[str, Any] = {**INPUT_DEFAULTS, **inputs}
+        self.last_used = time.monotonic()
+        for name, dependencies, function in NODES:
+            self.values[name] = function(*[self.values[d] for d in dependencies])
+        # Outputs as reported, rounded to cents like calculate_property_metrics
+        self.rounded: Dict[str, float] = {name: round(self.values[name], 2) for name in OUTPUTS}
+
+    def inputs(self) -> Dict[str, Any]:
+        return {name: self.values[name] for name in INPUTS}
+
+    def metrics(self) -> Dict[str, Any]:
+        """All outputs, equal to calculate_property_metrics(**self.inputs())."""
+        return nest_outputs(self.rounded)
+
+    def update(self, changes: Dict[str, Optional[float]]) -> Tuple[Dict[str, Any], int]:
+        """
+        Apply input changes and recompute what depends on them.
+
+        Args:
+            changes: New values by input name; None restores the default estimate
+                of property_taxes, insurance, property_management or maintenance_repairs
+
+        Returns:
+            (outputs whose rounded value changed, shaped like calculate_property_metrics;
+            number of nodes recomputed)
+
+        Raises:
+            ValueError: For an unknown input or None for an input that cannot be estimated
+        """
+        for name, value in changes.items():
+            if name not in _AFFECTED:
+                raise ValueError(f"Unknown input: {name}")
+            if value is None and name not in ESTIMATED_EXPENSE_FIELDS:
+                raise ValueError(f"{name} cannot be None")
+
+        values = self.values
+        dirty = [name for name, value in changes.items() if values[name] != value]
+        affected = _AFFECTED[dirty[0]] if len(dirty) == 1 else sorted({i for name in dirty for i in _AFFECTED[name]})
+        values.update(changes)
+        rounded = self.rounded
+        changed = {}
+        for i in affected:
+            name, dependencies, function = NODES[i]
+            value = function(*[values[d] for d in dependencies])
+            if value != values[name]:
+                values[name] = value
+                value = round(value, 2)
+                if value != rounded[name]:
+                    rounded[name] = value
+                    changed[name] = value
+        self.last_used = time.monotonic()
+        return nest_outputs(changed), len(affected)
+
+
+class UnderwritingSessionStore:
+    """
+    In-memory what-if sessions with a size bound and idle expiry.
+
+    Sessions are kept in least-recently-used order: creating one beyond
+    max_sessions evicts the least recently used, and sessions unused for
+    idle_timeout seconds are dropped on the next store access.
+
+    Args:
+        max_sessions: Sessions kept at most
+        idle_timeout: Seconds without use before a session expires
+    """
+
+    def __init__(self, max_sessions: int = 10000, idle_timeout: float = 1800.0):
+        self.max_sessions = max_sessions
+        self.idle_timeout = idle_timeout
+        self._sessions: "OrderedDict[str, UnderwritingSession]" = OrderedDict()
+        self.created = 0
+        self.evicted = 0
+        self.expired = 0
+
+    def _expire_idle(self):
+        deadline = time.monotonic() - self.idle_timeout
+        while self._sessions:
+            session = next(iter(self._sessions.values()))
+            if session.last_used > deadline:
+                break
+            del self._sessions[session.session_id]
+            self.expired += 1
+
+    def create(self, inputs: Dict[str, Any], address: Optional[str] = None) -> UnderwritingSession:
+        self._expire_idle()
+        session = UnderwritingSession(uuid.uuid4().hex, inputs, address)
+        self._sessions[session.session_id] = session
+        self.created += 1
+        while len(self._sessions) > self.max_sessions:
+            self._sessions.popitem(last=False)
+            self.evicted += 1
+        return session
+
+    def get(self, session_id: str) -> Optional[UnderwritingSession]:
+        """The session, marked as used, or None if it never existed or has expired."""
+        self._expire_idle()
+        session = self._sessions.get(session_id)
+        if session is not None:
+            session.last_used = time.monotonic()
+            self._sessions.move_to_end(session_id)
+        return session
+
+    def delete(self, session_id: str) -> bool:
+        return self._sessions.pop(session_id, None) is not None
+
+    def __len__(self) -> int:
+        return len(self._sessions)
+
+    def stats(self) -> Dict[str, Any]:
+        self._expire_idle()
+        return {
+            "sessions": len(self._sessions),
+            "max_sessions": self.max_sessions,
+            "idle_timeout": self.idle_timeout,
+            "created": self.created,
+            "evicted": self.evicted,
+            "expired": self.expired,
+        }
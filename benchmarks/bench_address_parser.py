@@ -0,0 +1,85 @@
+"""
+Throughput of address normalization and autocomplete.
+
+Cold parses bypass the memo cache (every address is unique); warm parses repeat
+a small working set, as on the insight hot path. Fails if a spelling variant in
+SAME_ADDRESSES parses to a different key than its group.
+
+Usage:
+    python -m benchmarks.bench_address_parser [--addresses 50000] [--streets 200000]
+"""
+import argparse
+import random
+import time
+
+from app.services import address_parser
+from app.services.address_parser import AddressIndex, parse_address
+
+NAMES = ["Main", "Oak", "Pine", "Maple", "Cedar", "Elm", "Lake", "Hill", "Park", "Washington", "Lincoln", "Sunset", "Forest Hill", "Trail Ridge", "West End"]
+SUFFIXES = ["St", "Street", "Ave", "avenue", "Blvd", "Rd", "road", "Dr", "Ln", "Ct", "Pkwy", "Way"]
+DIRECTIONS = ["", "", "", "N", "South", "E", "w"]
+UNITS = ["", "", "", "Apt 4B", "#12", "Suite 200", "unit 7"]
+# Spellings that must share one key per group; "West End" is a street name, not W + End
+SAME_ADDRESSES = [
+    ("123 north main street apt. 4b, springfield, illinois 62701", "123 N Main St #4B Springfield IL 62701-1234"),
+    ("500 West End Ave, New York, NY 10024", "500 west end avenue new york ny 10024-3316"),
+    ("12 West St, Springfield, IL 62701", "12 west street springfield il 62701"),
+]
+CITIES = [("Springfield", "IL", "62701"), ("Austin", "Texas", "78701"), ("San Francisco", "CA", "94103"), ("Palm Beach Gardens", "FL", "33410")]
+
+
+def random_address(rng: random.Random) -> str:
+    city, state, zip_code = rng.choice(CITIES)
+    street = " ".join(part for part in (str(rng.randint(1, 99999)), rng.choice(DIRECTIONS), rng.choice(NAMES), rng.choice(SUFFIXES), rng.choice(UNITS)) if part)
+    if rng.random() < 0.5:
+        return f"{street}, {city}, {state} {zip_code}"
+    return f"{street.upper()} {city.upper()} {state} {zip_code}-{rng.randint(1000, 9999)}"
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--addresses", type=int, default=50_000)
+    parser.add_argument("--streets", type=int, default=200_000, help="reference index size")
+    args = parser.parse_args()
+
+    for group in SAME_ADDRESSES:
+        keys = {parse_address(address).key for address in group}
+        assert len(keys) == 1, f"{group} parse to different keys: {sorted(keys)}"
+    assert parse_address(SAME_ADDRESSES[1][0]).street == "500 West End Ave"
+
+    rng = random.Random(0)
+    addresses = [random_address(rng) for _ in range(args.addresses)]
+
+    address_parser._parse.cache_clear()
+    start = time.perf_counter()
+    for address in addresses:
+        parse_address(address)
+    cold = time.perf_counter() - start
+
+    working_set = addresses[:1000]
+    start = time.perf_counter()
+    for i in range(args.addresses):
+        parse_address(working_set[i % len(working_set)])
+    warm = time.perf_counter() - start
+
+    start = time.perf_counter()
+    index = AddressIndex()
+    index.add_many(
+        {"street": f"{rng.choice(DIRECTIONS)} {rng.choice(NAMES)}{i} {rng.choice(SUFFIXES)}", "city": city, "state": state, "zip_code": zip_code}
+        for i, (city, state, zip_code) in ((i, rng.choice(CITIES)) for i in range(args.streets))
+    )
+    build = time.perf_counter() - start
+
+    queries = [f"{rng.randint(1, 999)} {rng.choice(NAMES).lower()}{rng.randint(1, 999)} st"[:rng.randint(6, 16)] for _ in range(10_000)]
+    start = time.perf_counter()
+    suggestions = sum(len(index.autocomplete(query)) for query in queries)
+    lookup = time.perf_counter() - start
+
+    print(f"cold parses:    {args.addresses / cold:,.0f} addresses/s")
+    print(f"warm parses:    {args.addresses / warm:,.0f} addresses/s")
+    print(f"index build:    {args.streets:,} streets in {build:.2f} s")
+    print(f"autocomplete:   {len(queries) / lookup:,.0f} queries/s ({suggestions / len(queries):.1f} suggestions/query)")
+
+
+if __name__ == "__main__":
+    main()
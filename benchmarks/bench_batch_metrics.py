@@ -0,0 +1,70 @@
+"""
+Throughput of calculate_property_metrics_batch versus the scalar calculate_property_metrics.
+
+Usage:
+    python -m benchmarks.bench_batch_metrics [--sizes 1,100,10000,100000,1000000]
+"""
+import argparse
+import time
+
+import numpy as np
+
+from app.services.calculations import calculate_property_metrics, calculate_property_metrics_batch
+
+
+def make_portfolio(size: int, seed: int = 0) -> dict:
+    """Build random portfolio columns with roughly half of the estimated expenses missing."""
+    rng = np.random.default_rng(seed)
+    purchase_price = rng.uniform(150_000, 1_500_000, size)
+    missing = rng.random(size) < 0.5
+    property_taxes = np.where(missing, np.nan, purchase_price * rng.uniform(0.008, 0.02, size))
+    return {
+        "purchase_price": purchase_price,
+        "annual_rental_income": purchase_price * rng.uniform(0.05, 0.09, size),
+        "other_income": rng.uniform(0, 3_000, size),
+        "property_taxes": property_taxes,
+        "utilities": rng.uniform(0, 2_400, size),
+        "vacancy_rate": rng.uniform(0.02, 0.12, size),
+    }
+
+
+def time_batch(columns: dict, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        calculate_property_metrics_batch(**columns)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def time_scalar(columns: dict, limit: int) -> float:
+    """Time the scalar loop on up to `limit` rows and return seconds per row."""
+    size = min(limit, len(columns["purchase_price"]))
+    rows = [
+        {name: (None if np.isnan(values[i]) else float(values[i])) for name, values in columns.items()}
+        for i in range(size)
+    ]
+    start = time.perf_counter()
+    for row in rows:
+        calculate_property_metrics(**row)
+    return (time.perf_counter() - start) / size
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", default="1,10,100,1000,10000,100000,1000000")
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    print(f"{'batch size':>12} {'batch ms':>10} {'batch rows/s':>14} {'scalar rows/s':>14} {'speedup':>8}")
+    for size in (int(s) for s in args.sizes.split(",")):
+        columns = make_portfolio(size)
+        batch_seconds = time_batch(columns, args.repeat)
+        scalar_per_row = time_scalar(columns, limit=20_000)
+        batch_rate = size / batch_seconds
+        scalar_rate = 1 / scalar_per_row
+        print(f"{size:>12,} {batch_seconds * 1000:>10.3f} {batch_rate:>14,.0f} {scalar_rate:>14,.0f} {batch_rate / scalar_rate:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
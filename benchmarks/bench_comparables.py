@@ -0,0 +1,80 @@
+"""
+Build, memory-map and query a synthetic comparables store.
+
+Usage:
+    python -m benchmarks.bench_comparables [--properties 1000000] [--queries 2000]
+"""
+import argparse
+import tempfile
+import time
+
+import numpy as np
+
+from app.services.comparables import PROPERTY_TYPES, ComparablesIndex
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--properties", type=int, default=1_000_000)
+    parser.add_argument("--queries", type=int, default=2000)
+    parser.add_argument("-k", type=int, default=5)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    n = args.properties
+    # Clustered around a few metro areas, like real listings
+    metros = np.array([[37.77, -122.42], [30.27, -97.74], [40.71, -74.0], [41.88, -87.63], [33.45, -112.07]])
+    centers = metros[rng.integers(0, len(metros), n)]
+    latitude = centers[:, 0] + rng.normal(0, 0.15, n)
+    longitude = centers[:, 1] + rng.normal(0, 0.15, n)
+    bedrooms = rng.integers(1, 6, n)
+    bathrooms = rng.integers(2, 8, n) / 2
+    square_feet = rng.integers(500, 4000, n)
+    year_built = rng.integers(1900, 2024, n)
+    property_type = rng.integers(0, len(PROPERTY_TYPES), n)
+    rows = (
+        {
+            "address": f"{i} Main St, Anytown, CA {10000 + i % 90000}",
+            "latitude": latitude[i], "longitude": longitude[i], "bedrooms": bedrooms[i], "bathrooms": bathrooms[i],
+            "square_feet": square_feet[i], "year_built": year_built[i], "property_type": PROPERTY_TYPES[property_type[i]],
+            "zip_code": 10000 + i % 90000,
+        }
+        for i in range(n)
+    )
+
+    start = time.perf_counter()
+    index = ComparablesIndex()
+    index.build(rows)
+    build = time.perf_counter() - start
+
+    with tempfile.TemporaryDirectory() as path:
+        index.save(path)
+        start = time.perf_counter()
+        mapped = ComparablesIndex.load(path)
+        load = time.perf_counter() - start
+
+        target = {"bedrooms": 3, "bathrooms": 2.0, "square_feet": 1500, "year_built": 1995, "property_type": "single_family"}
+        picks = rng.integers(0, n, args.queries)
+        latencies = []
+        for i in picks:
+            start = time.perf_counter()
+            mapped.query(float(latitude[i]), float(longitude[i]), target, k=args.k)
+            latencies.append(time.perf_counter() - start)
+
+        for i in range(1000):
+            mapped.insert({"address": f"{i} New St, Anytown, CA 94103", "latitude": 37.77, "longitude": -122.42, "bedrooms": 3, "zip_code": "94103"})
+        start = time.perf_counter()
+        for i in picks[:500]:
+            mapped.query(float(latitude[i]), float(longitude[i]), target, k=args.k)
+        with_delta = (time.perf_counter() - start) / 500
+
+    latencies = np.array(latencies) * 1000
+    print(f"properties:        {n:,}")
+    print(f"build:             {build:.1f} s")
+    print(f"mmap load:         {load * 1000:.1f} ms")
+    print(f"query p50 / p99:   {np.percentile(latencies, 50):.3f} / {np.percentile(latencies, 99):.3f} ms")
+    print(f"query, 1k inserts: {with_delta * 1000:.3f} ms mean")
+
+
+if __name__ == "__main__":
+    main()
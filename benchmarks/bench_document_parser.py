@@ -0,0 +1,106 @@
+"""
+Page-by-page parsing of a generated multi-page lease PDF and DOCX.
+
+Builds the documents locally (plain PDF text objects and a minimal DOCX
+package), then reports pages/s for PDF extraction with one worker process and
+with all cores, DOCX streaming, and the parent's peak RSS, which should not grow
+with the page count.
+
+Usage:
+    python -m benchmarks.bench_document_parser [--pages 300]
+"""
+import argparse
+import multiprocessing
+import os
+import resource
+import tempfile
+import time
+import zipfile
+from xml.sax.saxutils import escape
+
+from app.ai.tools import document_parser
+from app.ai.tools.document_parser import iter_docx_pages, iter_pdf_pages
+
+CLAUSE = "The Tenant shall pay monthly rent of $2,500 on the first day of each month. Late payments incur a fee of 5%."
+
+
+def page_lines(page: int):
+    return [f"Section {page}.{line}. {CLAUSE}" for line in range(1, 31)]
+
+
+def write_pdf(path: str, pages: int):
+    objects = ["<< /Type /Catalog /Pages 2 0 R >>", None, "<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>"]
+    kids = []
+    for page in range(1, pages + 1):
+        text = " ".join(f"({line.replace('(', '').replace(')', '')}) Tj T*" for line in page_lines(page))
+        stream = f"BT /F1 9 Tf 11 TL 36 800 Td {text} ET"
+        objects.append(f"<< /Length {len(stream)} >>\nstream\n{stream}\nendstream")
+        objects.append(f"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 842] /Resources << /Font << /F1 3 0 R >> >> /Contents {len(objects)} 0 R >>")
+        kids.append(f"{len(objects)} 0 R")
+    objects[1] = f"<< /Type /Pages /Kids [{' '.join(kids)}] /Count {pages} >>"
+
+    with open(path, "wb") as f:
+        f.write(b"%PDF-1.4\n")
+        offsets = []
+        for number, body in enumerate(objects, start=1):
+            offsets.append(f.tell())
+            f.write(f"{number} 0 obj\n{body}\nendobj\n".encode("latin-1"))
+        xref = f.tell()
+        f.write(f"xref\n0 {len(objects) + 1}\n0000000000 65535 f \n".encode())
+        for offset in offsets:
+            f.write(f"{offset:010d} 00000 n \n".encode())
+        f.write(f"trailer\n<< /Size {len(objects) + 1} /Root 1 0 R >>\nstartxref\n{xref}\n%%EOF\n".encode())
+
+
+def write_docx(path: str, pages: int):
+    w = "http://schemas.openxmlformats.org/wordprocessingml/2006/main"
+    body = []
+    for page in range(1, pages + 1):
+        body += [f"<w:p><w:r><w:t>{escape(line)}</w:t></w:r></w:p>" for line in page_lines(page)]
+        body.append('<w:p><w:r><w:br w:type="page"/></w:r></w:p>')
+    document = f'<?xml version="1.0" encoding="UTF-8"?><w:document xmlns:w="{w}"><w:body>{"".join(body)}</w:body></w:document>'
+    with zipfile.ZipFile(path, "w", zipfile.ZIP_DEFLATED) as archive:
+        archive.writestr("[Content_Types].xml", '<?xml version="1.0"?><Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types"/>')
+        archive.writestr("word/document.xml", document)
+
+
+def write_documents(pdf_path: str, docx_path: str, pages: int):
+    write_pdf(pdf_path, pages)
+    write_docx(docx_path, pages)
+
+
+def timed_pages(pages_iter):
+    start = time.perf_counter()
+    count = sum(1 for _ in pages_iter)
+    return count, time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--pages", type=int, default=300)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        pdf_path = os.path.join(directory, "lease.pdf")
+        docx_path = os.path.join(directory, "lease.docx")
+        # Generate the fixtures in a child process so the parent's RSS reflects parsing only
+        writer = multiprocessing.Process(target=write_documents, args=(pdf_path, docx_path, args.pages))
+        writer.start()
+        writer.join()
+
+        results = []
+        for workers in sorted({1, os.cpu_count() or 1}):
+            document_parser.shutdown_parser_pool()
+            count, seconds = timed_pages(iter_pdf_pages(pdf_path, max_workers=workers))
+            results.append((f"PDF, {workers} worker(s)", count, seconds))
+        document_parser.shutdown_parser_pool()
+        results.append(("DOCX, streamed", *timed_pages(iter_docx_pages(docx_path))))
+
+        print(f"PDF size:  {os.path.getsize(pdf_path) / 1024:.0f} KB, DOCX size: {os.path.getsize(docx_path) / 1024:.0f} KB")
+        for label, count, seconds in results:
+            print(f"{label:<22} {count} pages in {seconds:.2f} s ({count / seconds:,.0f} pages/s)")
+        print(f"parent peak RSS:       {resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024:.0f} MB")
+
+
+if __name__ == "__main__":
+    main()
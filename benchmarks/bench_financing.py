@@ -0,0 +1,64 @@
+"""
+Evaluate a 10,000-scenario financing grid for one property.
+
+Times financing_scenarios on a grid of 25 rates x 10 LTVs x 4 amortization
+periods x 10 interest-only periods and, for comparison, the same metrics
+computed one scenario at a time in plain Python.
+
+Usage:
+    python -m benchmarks.bench_financing [--repeats 50]
+"""
+import argparse
+import itertools
+import time
+
+import numpy as np
+
+from app.services.calculations import calculate_property_metrics, metric_inputs_from_property_data
+from app.services.financing import financing_scenarios
+from app.services.property_data_provider import get_property_data
+
+ADDRESS = "123 Main St, Anytown, CA 12345"
+
+
+def scalar_scenario(noi, price, gross_income, expenses, rate, ltv, amortization, interest_only, closing_cost_rate=0.03):
+    loan = ltv * price
+    i = rate / 12
+    payment = loan * i / (1 - (1 + i) ** -(amortization * 12)) * 12 if i else loan / amortization
+    debt_service = loan * rate if interest_only >= 1 else payment
+    cash_flow = noi - debt_service
+    return (
+        noi / debt_service if debt_service else None,
+        cash_flow / (price - loan + closing_cost_rate * price) * 100,
+        (expenses + debt_service) / gross_income * 100,
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--repeats", type=int, default=50)
+    args = parser.parse_args()
+
+    inputs = metric_inputs_from_property_data(get_property_data(ADDRESS))
+    metrics = calculate_property_metrics(**inputs)
+    property_args = (metrics["noi"], inputs["purchase_price"], metrics["gross_income"], metrics["total_expenses"])
+    axes = (np.linspace(0.04, 0.09, 25), np.linspace(0.5, 0.8, 10), [20, 25, 30, 40], range(10))
+
+    timings = []
+    for _ in range(args.repeats):
+        start = time.perf_counter()
+        grid = financing_scenarios(*property_args, *axes, balance_after_years=10)
+        timings.append(time.perf_counter() - start)
+    scenarios = int(np.prod(grid["shape"]))
+    best = min(timings)
+    print(f"vectorized: {scenarios:,} scenarios in {best * 1000:.2f} ms ({scenarios / best:,.0f} scenarios/s)")
+
+    start = time.perf_counter()
+    for terms in itertools.product(*axes):
+        scalar_scenario(*property_args, *terms)
+    elapsed = time.perf_counter() - start
+    print(f"scalar loop: {scenarios:,} scenarios in {elapsed * 1000:.2f} ms ({elapsed / best:.0f}x slower)")
+
+
+if __name__ == "__main__":
+    main()
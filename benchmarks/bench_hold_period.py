@@ -0,0 +1,51 @@
+"""
+Throughput of the batched hold-period projection and IRR solver.
+
+Usage:
+    python -m benchmarks.bench_hold_period [--pairs 100000]
+"""
+import argparse
+import time
+
+import numpy as np
+
+from app.services.cash_flow_projection import MAX_HOLD_YEARS, irr_batch, npv_batch, project_hold_period_batch
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--pairs", type=int, default=100_000, help="number of property-horizon pairs")
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    purchase_price = rng.uniform(150_000, 1_500_000, args.pairs)
+    columns = {
+        "purchase_price": purchase_price,
+        "annual_rental_income": purchase_price * rng.uniform(0.05, 0.09, args.pairs),
+        "horizon_years": rng.integers(1, MAX_HOLD_YEARS + 1, args.pairs),
+        "rent_growth_rate": rng.uniform(0.0, 0.05, args.pairs),
+        "appreciation_rate": rng.uniform(-0.01, 0.06, args.pairs),
+        "vacancy_rate": rng.uniform(0.02, 0.12, args.pairs),
+    }
+
+    best_total = best_irr = float("inf")
+    for _ in range(args.repeat):
+        start = time.perf_counter()
+        result = project_hold_period_batch(**columns)
+        best_total = min(best_total, time.perf_counter() - start)
+
+        start = time.perf_counter()
+        irr = irr_batch(result["cash_flows"])
+        best_irr = min(best_irr, time.perf_counter() - start)
+
+    solved = ~np.isnan(irr)
+    residual = np.abs(npv_batch(result["cash_flows"][solved], irr[solved])) / purchase_price[solved]
+    print(f"pairs:                  {args.pairs:,}")
+    print(f"projection + IRR + NPV: {best_total * 1000:.1f} ms ({args.pairs / best_total:,.0f} pairs/s)")
+    print(f"IRR solve only:         {best_irr * 1000:.1f} ms ({args.pairs / best_irr:,.0f} pairs/s)")
+    print(f"solved:                 {solved.sum():,} (max |NPV(IRR)| / price = {residual.max():.2e})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,94 @@
+"""
+Microbenchmarks for the per-request hot paths.
+
+Times individual calls of calculate_property_metrics, PropertyData model
+construction (validating a provider record, and get_property_data end to end),
+and format_contract_review_response on a valid and on an unparseable model
+response. Reports p50/p95/p99 per call and calls/s from the least disturbed of
+several rounds.
+
+Usage:
+    python -m benchmarks.bench_micro [--iterations 20000]
+"""
+import argparse
+import json
+import time
+from typing import Callable, Dict
+
+from app.ai.tools.contract_reviewer import format_contract_review_response
+from app.services.calculations import calculate_property_metrics, metric_inputs_from_property_data
+from app.services.property_data_provider import PropertyData, get_property_data
+from benchmarks.stats import HIGHER, latency_summary, metric
+from benchmarks.stub_llm_server import STUB_REVIEW
+
+ADDRESS = "123 Main St, Anytown, CA 12345"
+
+
+def cases() -> Dict[str, Callable[[], object]]:
+    record = get_property_data(ADDRESS)
+    inputs = metric_inputs_from_property_data(record)
+    payload = record.model_dump()
+    review = json.dumps(STUB_REVIEW, indent=2)
+    truncated = review[: len(review) // 2]
+    return {
+        "calculate_property_metrics": lambda: calculate_property_metrics(**inputs),
+        "property_data_validate": lambda: PropertyData.model_validate(payload),
+        "get_property_data": lambda: get_property_data(ADDRESS),
+        "format_review_valid": lambda: format_contract_review_response(review),
+        "format_review_invalid": lambda: format_contract_review_response(truncated),
+    }
+
+
+def time_calls(call: Callable[[], object], iterations: int, warmup_seconds: float = 0.25):
+    """Per-call latencies in microseconds and the overall calls/s."""
+    # Warm up for a fixed time rather than a call count; a few thousand calls are not enough to reach steady state
+    deadline = time.perf_counter() + warmup_seconds
+    while time.perf_counter() < deadline:
+        call()
+    clock = time.perf_counter_ns
+    latencies = []
+    started = clock()
+    for _ in range(iterations):
+        start = clock()
+        call()
+        latencies.append((clock() - start) / 1000)
+    return latencies, iterations / ((clock() - started) / 1e9)
+
+
+def run(iterations: int, rounds: int = 5) -> Dict[str, dict]:
+    """
+    Run every case and return suite metrics keyed micro.<case>.<stat>.
+
+    Each case runs in several rounds and the round with the lowest median is
+    reported, which filters out rounds disturbed by other load on the machine.
+    """
+    results = {}
+    for name, call in cases().items():
+        measured = [time_calls(call, max(1, iterations // rounds)) for _ in range(rounds)]
+        latencies, rate = min(measured, key=lambda m: latency_summary(m[0])["p50"])
+        summary = latency_summary(latencies)
+        results[f"micro.{name}.p50_us"] = metric(summary["p50"], "us")
+        # Microsecond tails mostly measure scheduler noise; they are reported but not gated on
+        for stat in ("p95", "p99"):
+            results[f"micro.{name}.{stat}_us"] = metric(summary[stat], "us", better=None)
+        results[f"micro.{name}.calls_per_s"] = metric(rate, "calls/s", HIGHER)
+    return results
+
+
+def report(results: Dict[str, dict]):
+    names = sorted({key.split(".")[1] for key in results if key.startswith("micro.")})
+    print(f"{'case':<28} {'p50 us':>9} {'p95 us':>9} {'p99 us':>9} {'calls/s':>12}")
+    for name in names:
+        values = {stat: results[f"micro.{name}.{stat}"]["value"] for stat in ("p50_us", "p95_us", "p99_us", "calls_per_s")}
+        print(f"{name:<28} {values['p50_us']:>9.2f} {values['p95_us']:>9.2f} {values['p99_us']:>9.2f} {values['calls_per_s']:>12,.0f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--iterations", type=int, default=20_000)
+    args = parser.parse_args()
+    report(run(args.iterations))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,69 @@
+"""
+Screen a generated statewide listings CSV with the deal screener.
+
+Writes a CSV of random listings (some with quoted multi-line descriptions) in a
+child process, then screens it with one worker process and with all cores, and
+reports listings/s and the parent's peak RSS, which should not grow with the
+number of listings.
+
+Usage:
+    python -m benchmarks.bench_screener [--listings 1000000] [--chunk-size 50000]
+"""
+import argparse
+import csv
+import multiprocessing
+import os
+import random
+import resource
+import tempfile
+
+from app.screener import ScreenCriteria, screen_file
+
+PROPERTY_TYPES = ["single_family", "condo", "multi_family", "townhouse"]
+
+
+def write_listings(path: str, listings: int, seed: int = 7):
+    rng = random.Random(seed)
+    with open(path, "w", newline="", encoding="utf-8") as f:
+        writer = csv.writer(f)
+        writer.writerow(["address", "property_type", "list_price", "monthly_rent", "property_taxes", "insurance", "description"])
+        for i in range(listings):
+            price = rng.randint(80, 900) * 1000
+            writer.writerow([
+                f"{i} Main St, Austin, TX 78701",
+                rng.choice(PROPERTY_TYPES),
+                price,
+                round(price * rng.uniform(0.004, 0.012)),
+                "" if i % 3 else round(price * 0.02),
+                "",
+                'Updated kitchen,\n"walk to transit"' if i % 1000 == 0 else "Move-in ready",
+            ])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--listings", type=int, default=1_000_000)
+    parser.add_argument("--chunk-size", type=int, default=50_000)
+    args = parser.parse_args()
+
+    criteria = ScreenCriteria(min_cap_rate=7.0, max_price=500_000, property_types=frozenset({"single_family"}))
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "listings.csv")
+        # Generate the fixture in a child process so the parent's RSS reflects screening only
+        writer = multiprocessing.Process(target=write_listings, args=(path, args.listings))
+        writer.start()
+        writer.join()
+
+        print(f"input: {args.listings:,} listings, {os.path.getsize(path) / 2**20:.0f} MB")
+        for workers in sorted({1, os.cpu_count() or 1}):
+            with open(os.devnull, "w") as output:
+                stats = screen_file(path, output, criteria, chunk_size=args.chunk_size, workers=workers)
+            print(
+                f"{workers} worker(s): {stats['rows'] / stats['seconds']:,.0f} listings/s, "
+                f"{stats['matches']:,} matches in {stats['seconds']:.1f} s"
+            )
+        print(f"parent peak RSS: {resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024:.0f} MB")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,65 @@
+"""
+Per-request serialization cost of get_property_insight.
+
+Times building the response body from already computed property data, metrics
+and comparables: validated (PropertyInsightResponse model validation plus
+model_dump_json, the path before the fast path) against the fast path (a plain
+dict encoded with orjson), and the ETag computation every request now pays.
+Fails if the two paths produce different bodies or if inputs with missing
+expenses cannot be hashed.
+
+Usage:
+    python -m benchmarks.bench_serialization [--iterations 50000]
+"""
+import argparse
+
+from app.routes.http_server import (
+    PLACEHOLDER_SIMILAR_PROPERTIES,
+    property_insight_etag,
+    property_insight_payload,
+    serialize_property_insight,
+)
+from app.services.calculations import calculate_property_metrics, metric_inputs_from_property_data
+from app.services.property_data_provider import get_property_data
+from benchmarks.bench_micro import time_calls
+from benchmarks.stats import latency_summary
+
+ADDRESS = "123 Main St, Anytown, CA 12345"
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--iterations", type=int, default=50_000)
+    args = parser.parse_args()
+
+    property_data = get_property_data(ADDRESS)
+    inputs = metric_inputs_from_property_data(property_data)
+    metrics = calculate_property_metrics(**inputs)
+    similar_properties = [{**similar, "distance_km": 0.4, "similarity_score": 1.25} for similar in PLACEHOLDER_SIMILAR_PROPERTIES]
+
+    def payload():
+        return property_insight_payload(property_data, metrics, similar_properties)
+
+    cases = {
+        "validated": lambda: serialize_property_insight(payload(), fast_path=False),
+        "fast_path": lambda: serialize_property_insight(payload(), fast_path=True),
+        "etag": lambda: property_insight_etag(property_data, inputs),
+    }
+    assert cases["validated"]() == cases["fast_path"](), "both paths must produce the same body"
+    # Expenses left to the default estimates are None in the inputs and must still hash
+    estimated = {**inputs, "insurance": None, "property_taxes": None}
+    assert property_insight_etag(property_data, estimated) != property_insight_etag(property_data, inputs), \
+        "estimated expenses must change the ETag"
+
+    print(f"{'case':<12} {'p50 us':>9} {'p99 us':>9} {'calls/s':>12}")
+    medians = {}
+    for name, call in cases.items():
+        latencies, rate = time_calls(call, args.iterations)
+        summary = latency_summary(latencies)
+        medians[name] = summary["p50"]
+        print(f"{name:<12} {summary['p50']:>9.2f} {summary['p99']:>9.2f} {rate:>12,.0f}")
+    print(f"\nfast path: {medians['validated'] / medians['fast_path']:.1f}x faster than validated serialization")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,124 @@
+"""
+Scrape listing pages from a local fixture server.
+
+Compares one-connection-per-page sequential scraping (scrape_web_page) with
+AsyncWebScraper on a cold cache and on a warm cache, where every page
+revalidates with a 304. The fixture server adds a fixed per-request latency to
+stand in for network round trips.
+
+Usage:
+    python -m benchmarks.bench_web_scraper [--pages 1000] [--latency 0.02]
+"""
+import argparse
+import asyncio
+import hashlib
+import multiprocessing
+import time
+import resource
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from app.ai.tools.web_scraper import AsyncWebScraper, scrape_web_page
+
+LAST_MODIFIED = "Mon, 03 Jun 2024 12:00:00 GMT"
+
+
+def listing_page(i: int) -> bytes:
+    rows = "".join(
+        f"<tr><td>Feature {j}</td><td>Updated kitchen, {j} parking spaces, close to transit</td></tr>" for j in range(150)
+    )
+    return (
+        f"<!DOCTYPE html><html><head><title>Listing {i}</title><style>td {{ padding: 4px }}</style>"
+        f"<script>window.listing = {{id: {i}}};</script></head><body>"
+        f"<h1>{i} Main St, Anytown, CA 12345</h1><p>3 bd &middot; 2 ba &middot; 1,500 sqft &middot; ${2400 + i % 500}/mo</p>"
+        f"<table>{rows}</table><footer>Listing data for benchmark use</footer></body></html>"
+    ).encode("utf-8")
+
+
+class ListingHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    # Headers and body are separate writes; without this, delayed ACKs stall keep-alive responses
+    disable_nagle_algorithm = True
+
+    def log_message(self, format, *args):
+        pass
+
+    def do_GET(self):
+        time.sleep(self.server.latency)
+        i = int(self.path.rstrip("/").rsplit("/", 1)[-1])
+        body = listing_page(i)
+        etag = '"' + hashlib.md5(body).hexdigest() + '"'
+        if self.headers.get("If-None-Match") == etag:
+            self.send_response(304)
+            self.send_header("ETag", etag)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+        self.send_response(200)
+        self.send_header("Content-Type", "text/html; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.send_header("ETag", etag)
+        self.send_header("Last-Modified", LAST_MODIFIED)
+        self.end_headers()
+        self.wfile.write(body)
+
+
+def serve_fixture(latency: float, ports: multiprocessing.Queue):
+    server = ThreadingHTTPServer(("127.0.0.1", 0), ListingHandler)
+    server.daemon_threads = True
+    server.request_queue_size = 1024
+    server.latency = latency
+    ports.put(server.server_address[1])
+    server.serve_forever()
+
+
+def start_fixture_server(latency: float):
+    """Run the fixture server in its own process so it does not compete with the scraper for the GIL."""
+    ports = multiprocessing.Queue()
+    process = multiprocessing.Process(target=serve_fixture, args=(latency, ports), daemon=True)
+    process.start()
+    return process, ports.get(timeout=10)
+
+
+async def scrape_async(urls, max_per_host):
+    async with AsyncWebScraper(max_per_host=max_per_host, cache_size=len(urls)) as scraper:
+        start = time.perf_counter()
+        cold = await scraper.scrape_many(urls)
+        cold_time = time.perf_counter() - start
+        start = time.perf_counter()
+        warm = await scraper.scrape_many(urls)
+        warm_time = time.perf_counter() - start
+    return cold, cold_time, warm, warm_time
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--pages", type=int, default=1000)
+    parser.add_argument("--latency", type=float, default=0.02, help="fixture server latency per request, seconds")
+    parser.add_argument("--max-per-host", type=int, default=8)
+    parser.add_argument("--sequential-pages", type=int, default=200, help="pages for the sequential baseline")
+    args = parser.parse_args()
+
+    server, port = start_fixture_server(args.latency)
+    base = f"http://127.0.0.1:{port}/listings"
+    urls = [f"{base}/{i}" for i in range(args.pages)]
+    page_kb = len(listing_page(0)) / 1024
+
+    sequential = urls[:args.sequential_pages]
+    start = time.perf_counter()
+    texts = [scrape_web_page(url) for url in sequential]
+    sequential_rate = len(sequential) / (time.perf_counter() - start)
+
+    cold, cold_time, warm, warm_time = asyncio.run(scrape_async(urls, args.max_per_host))
+    server.terminate()
+
+    assert all(result.error is None for result in cold + warm)
+    assert cold[0].text == texts[0]
+    print(f"pages:                {args.pages:,} x {page_kb:.0f} KB, {args.latency * 1000:.0f} ms server latency")
+    print(f"sequential, no pool:  {sequential_rate:,.0f} pages/s (first {len(sequential)} pages)")
+    print(f"async pooled, cold:   {args.pages / cold_time:,.0f} pages/s")
+    print(f"async pooled, 304s:   {args.pages / warm_time:,.0f} pages/s ({sum(r.from_cache for r in warm):,} revalidated)")
+    print(f"peak RSS:             {resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024:.0f} MB")
+
+
+if __name__ == "__main__":
+    main()
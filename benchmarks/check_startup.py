@@ -0,0 +1,79 @@
+"""
+Import-time budget check for API workers.
+
+Imports app.main in fresh interpreters and fails (exit status 1) when the
+median import time exceeds the budget, or when a module
+that should only load on first use (openai, pypdf) is imported at startup.
+Autoscaled workers pay this cost on every cold start. The interpreters inherit
+the environment, so run it with the deployment's data paths set
+(ADDRESS_REFERENCE_PATH, COMPARABLES_INDEX_PATH, MARKET_ROLLUPS_PATH, ...):
+reference data is loaded by the application lifespan, never at import.
+
+Usage:
+    python -m benchmarks.check_startup [--budget-ms 1000] [--runs 5]
+"""
+import argparse
+import statistics
+import subprocess
+import sys
+from typing import Dict, List, Tuple
+
+from benchmarks.stats import metric
+
+MODULE = "app.main"
+
+# Heavy dependencies the app must import lazily
+DEFERRED_MODULES = ("openai", "pypdf", "pyarrow")
+
+DEFAULT_BUDGET_MS = 1000
+
+
+def import_profile(module: str = MODULE) -> Tuple[float, List[str]]:
+    """Time to import module in a fresh interpreter, in ms, and the deferred modules it loaded."""
+    code = (
+        "import sys, time\n"
+        "start = time.perf_counter()\n"
+        f"import {module}\n"
+        "print((time.perf_counter() - start) * 1000)\n"
+        f"print(','.join(m for m in {DEFERRED_MODULES!r} if m in sys.modules))"
+    )
+    completed = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True)
+    milliseconds, loaded = (completed.stdout.splitlines() + [""])[:2]
+    return float(milliseconds), [name for name in loaded.split(",") if name]
+
+
+def run(runs: int = 5) -> Tuple[Dict[str, dict], List[str]]:
+    """Median import time of app.main over fresh interpreters (keyed for the suite baseline), and the deferred modules loaded."""
+    timings = []
+    loaded = set()
+    for _ in range(runs):
+        milliseconds, modules = import_profile()
+        timings.append(milliseconds)
+        loaded.update(modules)
+    return {
+        "startup.import_app_main_ms": metric(statistics.median(timings), "ms"),
+        "startup.deferred_modules_loaded": metric(len(loaded), "modules"),
+    }, sorted(loaded)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--budget-ms", type=float, default=DEFAULT_BUDGET_MS)
+    parser.add_argument("--runs", type=int, default=5)
+    args = parser.parse_args()
+
+    results, loaded = run(args.runs)
+    milliseconds = results["startup.import_app_main_ms"]["value"]
+    print(f"import {MODULE}: {milliseconds:.0f} ms median over {args.runs} runs (budget {args.budget_ms:.0f} ms)")
+    failures = []
+    if milliseconds > args.budget_ms:
+        failures.append(f"import time {milliseconds:.0f} ms exceeds the {args.budget_ms:.0f} ms budget")
+    if loaded:
+        failures.append(f"imported at startup instead of on first use: {', '.join(loaded)}")
+    for failure in failures:
+        print(f"FAIL: {failure}")
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,198 @@
+"""
+Open-loop load generator for /api/get_property_insight and /api/ai_contract_review(/stream).
+
+Starts the stub LLM server and the API (uvicorn, one worker) in their own
+processes, then sends requests at a fixed target rate per endpoint for a set
+duration. Requests are issued on schedule whether or not earlier ones have
+finished, and latency is measured from the scheduled send time, so a stalled
+server shows up as latency instead of silently lowering the offered load.
+Reports p50/p95/p99, achieved throughput, errors and the API's peak RSS, plus
+time to the first event for the streaming review.
+
+Usage:
+    python -m benchmarks.load_generator [--insight-rps 50] [--review-rps 5] [--stream-rps 0] [--duration 20] [--llm-latency 0.5]
+"""
+import argparse
+import asyncio
+import multiprocessing
+import os
+import socket
+import subprocess
+import sys
+import time
+from typing import Callable, Dict, List
+
+import httpx
+
+from benchmarks.stats import HIGHER, latency_summary, metric, peak_rss_mb
+from benchmarks.stub_llm_server import start_stub_server
+
+CONTRACT_TEXT = "This lease agreement is made between Landlord and Tenant for the premises at 123 Main St. " * 20
+INSIGHT = {"address": "123 Main St, Anytown, CA 12345"}
+
+
+def contract_body(i: int) -> dict:
+    # A distinct contract per request, so reviews reach the LLM instead of the review cache
+    return {"file_content": f"Lease No. {i}. {CONTRACT_TEXT}"}
+
+
+def stream_contract_body(i: int) -> dict:
+    return {"file_content": f"Streamed lease No. {i}. {CONTRACT_TEXT}"}
+
+
+def insight_body(i: int) -> dict:
+    return INSIGHT
+
+
+def free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def serve_stub(port: int, latency: float):
+    start_stub_server(port, latency).serve_forever()
+
+
+def start_stub(latency: float):
+    """Run the stub LLM in its own process so it does not compete with the load generator for the GIL."""
+    port = free_port()
+    process = multiprocessing.Process(target=serve_stub, args=(port, latency), daemon=True)
+    process.start()
+    wait_for_port(port)
+    return process, port
+
+
+def start_api(port: int, llm_port: int) -> subprocess.Popen:
+    env = dict(
+        os.environ,
+        OPENAI_API_BASE=f"http://127.0.0.1:{llm_port}/v1",
+        OPENAI_API_KEY=os.environ.get("OPENAI_API_KEY", "stub-key"),
+        OPENAI_DEPLOYMENT_NAME="stub",
+    )
+    env.setdefault("OPENAI_MAX_CONCURRENT_REQUESTS", "64")
+    process = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "app.main:app", "--port", str(port), "--log-level", "warning", "--no-access-log"],
+        env=env,
+    )
+    wait_for_port(port, timeout=30)
+    return process
+
+
+def wait_for_port(port: int, timeout: float = 10):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            socket.create_connection(("127.0.0.1", port), timeout=0.5).close()
+            return
+        except OSError:
+            time.sleep(0.05)
+    raise RuntimeError(f"Nothing listening on port {port} after {timeout} s")
+
+
+async def drive(client: httpx.AsyncClient, path: str, body: Callable[[int], dict], rps: float, duration: float, results: Dict[str, List]):
+    """Send requests to path at rps for duration seconds; latencies (ms) are from each scheduled send time."""
+    if rps <= 0:
+        return
+    loop = asyncio.get_running_loop()
+    start = loop.time()
+
+    async def one(i: int, scheduled: float):
+        try:
+            async with client.stream("POST", path, json=body(i)) as response:
+                first = None
+                chunks = []
+                async for chunk in response.aiter_text():
+                    if first is None:
+                        first = loop.time()
+                    chunks.append(chunk)
+            text = "".join(chunks)
+            ok = response.status_code == 200 and '"summary":"Error' not in text and "event: error" not in text
+        except httpx.HTTPError:
+            ok = False
+        if ok:
+            results["latencies"].append((loop.time() - scheduled) * 1000)
+            results["first_byte"].append((first - scheduled) * 1000)
+        else:
+            results["errors"].append((loop.time() - scheduled) * 1000)
+
+    tasks = []
+    for i in range(int(rps * duration)):
+        scheduled = start + i / rps
+        delay = scheduled - loop.time()
+        if delay > 0:
+            await asyncio.sleep(delay)
+        tasks.append(asyncio.ensure_future(one(i, scheduled)))
+    await asyncio.gather(*tasks)
+    results["elapsed"] = loop.time() - start
+
+
+async def generate(base_url: str, insight_rps: float, review_rps: float, stream_rps: float, duration: float) -> Dict[str, Dict[str, List]]:
+    targets = {
+        "get_property_insight": ("/api/get_property_insight", insight_body, insight_rps),
+        "ai_contract_review": ("/api/ai_contract_review", contract_body, review_rps),
+        "ai_contract_review_stream": ("/api/ai_contract_review/stream", stream_contract_body, stream_rps),
+    }
+    results = {name: {"latencies": [], "first_byte": [], "errors": [], "elapsed": 0.0} for name in targets}
+    limits = httpx.Limits(max_connections=1000, max_keepalive_connections=1000)
+    async with httpx.AsyncClient(base_url=base_url, timeout=120, limits=limits) as client:
+        # Warm up connections and lazy initialization (e.g. the LLM client import) before measuring;
+        # cold-start cost is measured separately by check_startup
+        await client.post("/api/get_property_insight", json=INSIGHT)
+        await client.post("/api/ai_contract_review", json={"file_content": f"Warm-up. {CONTRACT_TEXT}"})
+        await asyncio.gather(*(
+            drive(client, path, body, rps, duration, results[name]) for name, (path, body, rps) in targets.items()
+        ))
+    return {name: result for name, result in results.items() if targets[name][2] > 0}
+
+
+def run(insight_rps: float, review_rps: float, stream_rps: float, duration: float, llm_latency: float) -> Dict[str, dict]:
+    """Run the load test and return suite metrics keyed load.<endpoint>.<stat>."""
+    stub, llm_port = start_stub(llm_latency)
+    port = free_port()
+    api = start_api(port, llm_port)
+    try:
+        raw = asyncio.run(generate(f"http://127.0.0.1:{port}", insight_rps, review_rps, stream_rps, duration))
+        api_rss = peak_rss_mb(api.pid)
+    finally:
+        api.terminate()
+        api.wait()
+        stub.terminate()
+
+    results = {}
+    for name, result in raw.items():
+        summary = latency_summary(result["latencies"])
+        for stat in ("p50", "p95", "p99"):
+            results[f"load.{name}.{stat}_ms"] = metric(summary[stat], "ms")
+        if name.endswith("_stream"):
+            results[f"load.{name}.first_byte_p50_ms"] = metric(latency_summary(result["first_byte"])["p50"], "ms")
+        results[f"load.{name}.throughput_rps"] = metric(len(result["latencies"]) / result["elapsed"], "req/s", HIGHER)
+        results[f"load.{name}.errors"] = metric(len(result["errors"]), "requests")
+    results["load.api_peak_rss_mb"] = metric(api_rss, "MB")
+    return results
+
+
+def report(results: Dict[str, dict]):
+    names = sorted({key.split(".")[1] for key in results if key.startswith("load.") and key.count(".") == 2})
+    print(f"{'endpoint':<26} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} {'req/s':>9} {'errors':>7}")
+    for name in names:
+        v = {key.split(".")[2]: value["value"] for key, value in results.items() if key.startswith(f"load.{name}.")}
+        print(f"{name:<26} {v['p50_ms']:>9.1f} {v['p95_ms']:>9.1f} {v['p99_ms']:>9.1f} {v['throughput_rps']:>9.1f} {v['errors']:>7.0f}")
+        if "first_byte_p50_ms" in v:
+            print(f"{'':<26} first event p50 {v['first_byte_p50_ms']:.1f} ms")
+    print(f"API peak RSS: {results['load.api_peak_rss_mb']['value']:.0f} MB")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--insight-rps", type=float, default=50, help="target rate for /api/get_property_insight")
+    parser.add_argument("--review-rps", type=float, default=5, help="target rate for /api/ai_contract_review")
+    parser.add_argument("--stream-rps", type=float, default=0, help="target rate for /api/ai_contract_review/stream")
+    parser.add_argument("--duration", type=float, default=20, help="seconds of load per endpoint")
+    parser.add_argument("--llm-latency", type=float, default=0.5, help="stub LLM response time, seconds")
+    args = parser.parse_args()
+    report(run(args.insight_rps, args.review_rps, args.stream_rps, args.duration, args.llm_latency))
+
+
+if __name__ == "__main__":
+    main()
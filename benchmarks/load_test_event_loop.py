@@ -0,0 +1,90 @@
+"""
+Show that in-flight contract reviews do not stall the event loop.
+
+Starts the stub LLM server and the API (uvicorn, one worker) in-process, measures
+/healthcheck and /api/get_property_insight latency at idle, then again while a
+burst of /api/ai_contract_review calls is waiting on the slow stub LLM.
+
+Usage:
+    python -m benchmarks.load_test_event_loop [--reviews 32] [--llm-latency 3.0]
+"""
+import argparse
+import asyncio
+import os
+import statistics
+import threading
+import time
+
+import httpx
+
+from benchmarks.stub_llm_server import start_stub_server
+
+
+def start_api(port: int):
+    import uvicorn
+    from app.main import app
+
+    server = uvicorn.Server(uvicorn.Config(app, host="127.0.0.1", port=port, log_level="warning"))
+    threading.Thread(target=server.run, daemon=True).start()
+    while not server.started:
+        time.sleep(0.05)
+    return server
+
+
+async def probe(client: httpx.AsyncClient, duration: float, interval: float = 0.05) -> dict:
+    """Poll the cheap endpoints for `duration` seconds and collect latencies in ms."""
+    latencies = {"healthcheck": [], "get_property_insight": []}
+    deadline = time.perf_counter() + duration
+    while time.perf_counter() < deadline:
+        start = time.perf_counter()
+        await client.get("/healthcheck")
+        latencies["healthcheck"].append((time.perf_counter() - start) * 1000)
+
+        start = time.perf_counter()
+        await client.post("/api/get_property_insight", json={"address": "123 Main St, Anytown, CA 12345"})
+        latencies["get_property_insight"].append((time.perf_counter() - start) * 1000)
+        await asyncio.sleep(interval)
+    return latencies
+
+
+def report(label: str, latencies: dict):
+    for name, values in latencies.items():
+        values = sorted(values)
+        p95 = values[int(len(values) * 0.95) - 1]
+        print(f"{label:<18} {name:<22} n={len(values):<4} p50={statistics.median(values):7.2f} ms  p95={p95:7.2f} ms  max={values[-1]:7.2f} ms")
+
+
+async def run(args):
+    async with httpx.AsyncClient(base_url=f"http://127.0.0.1:{args.port}", timeout=120) as client:
+        idle = await probe(client, duration=2.0)
+
+        contract = {"file_content": "This lease agreement is made between Landlord and Tenant. " * 50}
+        start = time.perf_counter()
+        reviews = asyncio.gather(*(client.post("/api/ai_contract_review", json=contract) for _ in range(args.reviews)))
+        busy = await probe(client, duration=args.llm_latency)
+        responses = await reviews
+        elapsed = time.perf_counter() - start
+
+    report("idle", idle)
+    report("reviews in flight", busy)
+    ok = sum(r.status_code == 200 and not r.json()["summary"].startswith("Error") for r in responses)
+    print(f"{ok}/{args.reviews} reviews succeeded in {elapsed:.2f} s (stub LLM latency {args.llm_latency} s)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--reviews", type=int, default=32, help="concurrent contract reviews")
+    parser.add_argument("--llm-latency", type=float, default=3.0)
+    parser.add_argument("--port", type=int, default=8902)
+    args = parser.parse_args()
+
+    stub = start_stub_server(latency=args.llm_latency)
+    os.environ["OPENAI_API_BASE"] = f"http://127.0.0.1:{stub.server_address[1]}/v1"
+    os.environ.setdefault("OPENAI_API_KEY", "stub-key")
+    os.environ.setdefault("OPENAI_MAX_CONCURRENT_REQUESTS", str(args.reviews))
+    start_api(args.port)
+    asyncio.run(run(args))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+"""
+Exercise the LLM rate limiter, retries, AIMD concurrency and hedging against a fake provider.
+
+Runs a burst of contract reviews against the stub LLM server with throttling
+(429 + Retry-After above a request rate) and a slow tail, once per agent
+configuration, and reports successes, throttled responses and latency. The
+limiter's correctness checks live in tests/test_rate_limiter.py.
+
+Usage:
+    python -m benchmarks.rate_limit_simulation [--reviews 150] [--provider-rps 10]
+"""
+import argparse
+import asyncio
+import statistics
+import time
+
+from app.core.advisor import AdvisorAgent
+from benchmarks.stub_llm_server import start_stub_server
+
+CONTRACT = "This lease agreement is made between Landlord and Tenant for the premises. " * 20
+
+
+async def run_burst(label: str, server, reviews: int, warmup: int = 0, **agent_options):
+    agent = AdvisorAgent(
+        openai_api_key="stub-key",
+        deployment_name="stub",
+        api_base=f"http://127.0.0.1:{server.server_address[1]}/v1",
+        **agent_options
+    )
+
+    async def review():
+        started = time.perf_counter()
+        result = await agent.analyze_contract(CONTRACT)
+        return not result["summary"].startswith("Error"), time.perf_counter() - started
+
+    # Warm-up calls give the latency tracker samples (hedging needs a baseline)
+    await asyncio.gather(*(review() for _ in range(warmup)))
+    server.throttled_count = server.request_count = 0
+
+    started = time.perf_counter()
+    results = await asyncio.gather(*(review() for _ in range(reviews)))
+    elapsed = time.perf_counter() - started
+    await agent.aclose()
+
+    ok = sum(ok for ok, _ in results)
+    latencies = sorted(latency for _, latency in results)
+    print(
+        f"{label:<34} ok={ok:>3}/{reviews}  "
+        f"provider calls={server.request_count:>4}  429s={server.throttled_count:>4}  "
+        f"p50={statistics.median(latencies):5.2f}s  p99={latencies[int(len(latencies) * 0.99) - 1]:5.2f}s  "
+        f"wall={elapsed:5.2f}s  final limit={agent.concurrency.limit:4.1f}"
+    )
+    return ok
+
+
+async def main_async(args):
+    throttled = start_stub_server(latency=args.latency, requests_per_second=args.provider_rps)
+    await run_burst("no limiter, no retries", throttled, args.reviews, max_concurrent_requests=64, max_retries=0)
+    await run_burst("retries + AIMD only", throttled, args.reviews, max_concurrent_requests=64, max_retries=6)
+    await run_burst(
+        "RPM limiter + retries + AIMD", throttled, args.reviews,
+        max_concurrent_requests=64, max_retries=6, requests_per_minute=args.provider_rps * 60 * 0.9
+    )
+
+    slow_tail = start_stub_server(latency=args.latency, slow_fraction=0.05)
+    await run_burst("slow tail, no hedging", slow_tail, args.reviews * 2, warmup=40, max_concurrent_requests=64)
+    await run_burst(
+        "slow tail, hedged at p95", slow_tail, args.reviews * 2, warmup=40,
+        max_concurrent_requests=64, hedge_requests=True
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--reviews", type=int, default=150)
+    parser.add_argument("--provider-rps", type=float, default=10, help="provider throttles above this request rate")
+    parser.add_argument("--latency", type=float, default=0.2)
+    args = parser.parse_args()
+    asyncio.run(main_async(args))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,71 @@
+"""
+Run the benchmark suite and flag regressions against a stored baseline.
+
+Measures the API's import time (check_startup), runs the microbenchmarks
+(bench_micro) and the end-to-end load test against the stub LLM
+(load_generator), prints p50/p95/p99, throughput and RSS, writes all
+metrics to a JSON file, and compares them with the baseline. Exits with status
+1 when any metric is worse than the baseline by more than the tolerance, so it
+can gate CI. Baselines are machine specific: record one with --update-baseline
+on the machine that runs the comparisons.
+
+Usage:
+    python -m benchmarks.run_suite [--quick] [--tolerance 0.25] [--update-baseline]
+"""
+import argparse
+import os
+import sys
+
+from benchmarks import bench_micro, check_startup, load_generator
+from benchmarks.stats import compare_with_baseline, load_baseline, save_results
+
+DEFAULT_BASELINE = os.path.join(os.path.dirname(__file__), "baseline.json")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--quick", action="store_true", help="fewer iterations and a shorter load test")
+    parser.add_argument("--skip-load", action="store_true", help="microbenchmarks only")
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE)
+    parser.add_argument("--output", default="benchmark_results.json", help="where to write this run's metrics")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="allowed relative change before a metric is flagged")
+    parser.add_argument("--update-baseline", action="store_true", help="store this run as the new baseline")
+    parser.add_argument("--insight-rps", type=float, default=50)
+    parser.add_argument("--review-rps", type=float, default=5)
+    parser.add_argument("--stream-rps", type=float, default=2)
+    parser.add_argument("--llm-latency", type=float, default=0.5)
+    args = parser.parse_args()
+
+    results, _ = check_startup.run(runs=3 if args.quick else 5)
+    print(f"import app.main: {results['startup.import_app_main_ms']['value']:.0f} ms\n")
+    results.update(bench_micro.run(iterations=5_000 if args.quick else 20_000))
+    bench_micro.report(results)
+    if not args.skip_load:
+        print()
+        load = load_generator.run(
+            args.insight_rps, args.review_rps, args.stream_rps, duration=5 if args.quick else 20, llm_latency=args.llm_latency
+        )
+        load_generator.report(load)
+        results.update(load)
+
+    save_results(results, args.output)
+    if args.update_baseline:
+        save_results(results, args.baseline)
+        print(f"\nbaseline updated: {args.baseline}")
+        return
+
+    baseline = load_baseline(args.baseline)
+    if not baseline:
+        print(f"\nno baseline at {args.baseline}; run with --update-baseline to record one")
+        return
+    regressions = compare_with_baseline(results, baseline, args.tolerance)
+    if regressions:
+        print(f"\n{len(regressions)} regression(s) beyond {args.tolerance:.0%}:")
+        for line in regressions:
+            print(f"  {line}")
+        sys.exit(1)
+    print(f"\nno regressions beyond {args.tolerance:.0%} against {args.baseline}")
+
+
+if __name__ == "__main__":
+    main()
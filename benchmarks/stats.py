@@ -0,0 +1,94 @@
+"""
+Shared helpers for the benchmark suite: latency percentiles, peak RSS and
+comparison of results against a stored baseline.
+
+Results are flat dicts of metric name -> {"value": float, "unit": str,
+"better": "lower" | "higher" | None}, so any benchmark can contribute to the
+baseline. Metrics with better=None are recorded but never flagged.
+"""
+import json
+import math
+import os
+import resource
+from typing import Dict, List, Optional, Sequence
+
+LOWER = "lower"
+HIGHER = "higher"
+
+
+def percentile(sorted_values: Sequence[float], q: float) -> float:
+    """Nearest-rank percentile of an already sorted sequence; q in [0, 100]."""
+    if not sorted_values:
+        return float("nan")
+    rank = max(1, math.ceil(q / 100 * len(sorted_values)))
+    return sorted_values[rank - 1]
+
+
+def latency_summary(latencies: Sequence[float]) -> Dict[str, float]:
+    """p50/p95/p99/max of a list of latencies, in the latencies' own unit."""
+    values = sorted(latencies)
+    return {
+        "p50": percentile(values, 50),
+        "p95": percentile(values, 95),
+        "p99": percentile(values, 99),
+        "max": values[-1] if values else float("nan"),
+    }
+
+
+def metric(value: float, unit: str, better: Optional[str] = LOWER) -> Dict[str, object]:
+    return {"value": float(value), "unit": unit, "better": better}
+
+
+def peak_rss_mb(pid: Optional[int] = None) -> float:
+    """Peak resident set size in MB of this process, or of another process by pid (Linux)."""
+    if pid is None:
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+    with open(f"/proc/{pid}/status") as f:
+        for line in f:
+            if line.startswith("VmHWM:"):
+                return int(line.split()[1]) / 1024
+    return float("nan")
+
+
+def load_baseline(path: str) -> Dict[str, dict]:
+    if not os.path.exists(path):
+        return {}
+    with open(path) as f:
+        return json.load(f)
+
+
+def save_results(results: Dict[str, dict], path: str):
+    with open(path, "w") as f:
+        json.dump(results, f, indent=2, sort_keys=True)
+        f.write("\n")
+
+
+def compare_with_baseline(results: Dict[str, dict], baseline: Dict[str, dict], tolerance: float) -> List[str]:
+    """
+    Describe the metrics that are worse than the baseline by more than tolerance.
+
+    Args:
+        results: Metrics from this run
+        baseline: Stored metrics from a reference run
+        tolerance: Allowed relative change, e.g. 0.25 for 25%
+
+    Returns:
+        One line per regressed metric; metrics missing from either side are skipped
+    """
+    regressions = []
+    for name, current in sorted(results.items()):
+        reference = baseline.get(name)
+        if reference is None or current["better"] is None or math.isnan(current["value"]):
+            continue
+        if not reference["value"]:
+            # e.g. errors: any increase from a zero baseline is a regression
+            if current["better"] == LOWER and current["value"] > 0:
+                regressions.append(f"{name}: {current['value']:.4g} {current['unit']} vs baseline 0")
+            continue
+        change = (current["value"] - reference["value"]) / reference["value"]
+        worse = change > tolerance if current["better"] == LOWER else change < -tolerance
+        if worse:
+            regressions.append(
+                f"{name}: {current['value']:.4g} {current['unit']} vs baseline {reference['value']:.4g} ({change:+.0%})"
+            )
+    return regressions
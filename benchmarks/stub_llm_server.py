@@ -0,0 +1,199 @@
+"""
+Local stub of an OpenAI-compatible chat completions endpoint.
+
+Responds to POST .../chat/completions after a configurable delay with a canned
+contract review, so the API can be load tested without a real LLM. Requests with
+"stream": true get the review as server-sent chunks spread over the same delay
+(and a final usage chunk when stream_options.include_usage is set).
+Optional throttling (429 with Retry-After above a request rate) and slow-tail
+responses simulate provider rate limits and latency outliers.
+
+Usage:
+    python -m benchmarks.stub_llm_server [--port 8901] [--latency 2.0]
+"""
+import argparse
+import json
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+STUB_REVIEW = {
+    "summary": "Twelve-month residential lease with standard terms.",
+    "highlights": ["Monthly rent of $2,500 due on the 1st", "Security deposit equal to one month's rent"],
+    "warnings": ["Late fee of 10% exceeds the typical 5%"],
+    "suggestions": ["Negotiate the late fee down to 5%"],
+}
+
+
+class StubLLMHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, format, *args):
+        pass
+
+    def do_POST(self):
+        length = int(self.headers.get("Content-Length", 0))
+        request = json.loads(self.rfile.read(length) or b"{}")
+        if not self.path.rstrip("/").endswith("/chat/completions"):
+            self.send_error(404)
+            return
+
+        if self.server.throttled():
+            body = json.dumps({"error": {"message": "Rate limit exceeded", "type": "rate_limit_error", "code": "429"}}).encode()
+            self.send_response(429)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.send_header("Retry-After", "1")
+            self.end_headers()
+            self.wfile.write(body)
+            return
+
+        content = json.dumps(STUB_REVIEW, indent=2)
+        if request.get("stream"):
+            self._stream(request, content)
+            return
+
+        time.sleep(self.server.latency * (self.server.slow_multiplier if random.random() < self.server.slow_fraction else 1))
+        body = json.dumps({
+            "id": "chatcmpl-stub",
+            "object": "chat.completion",
+            "created": int(time.time()),
+            "model": request.get("model", "stub"),
+            "choices": [{
+                "index": 0,
+                "message": {"role": "assistant", "content": content},
+                "finish_reason": "stop",
+            }],
+            "usage": {"prompt_tokens": 500, "completion_tokens": 120, "total_tokens": 620},
+        }).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+
+    def _stream(self, request: dict, content: str, piece_size: int = 8):
+        """Send the content as chat.completion.chunk events spread over the configured latency."""
+        pieces = [content[i:i + piece_size] for i in range(0, len(content), piece_size)]
+        delay = self.server.latency / (len(pieces) + 1)
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.send_header("Connection", "close")
+        self.end_headers()
+        self.close_connection = True
+        for piece in pieces:
+            time.sleep(delay)
+            chunk = {
+                "id": "chatcmpl-stub",
+                "object": "chat.completion.chunk",
+                "created": int(time.time()),
+                "model": request.get("model", "stub"),
+                "choices": [{"index": 0, "delta": {"content": piece}, "finish_reason": None}],
+            }
+            self.wfile.write(f"data: {json.dumps(chunk)}\n\n".encode())
+            self.wfile.flush()
+        if (request.get("stream_options") or {}).get("include_usage"):
+            # Like OpenAI: a last chunk without choices that reports the usage
+            chunk = {
+                "id": "chatcmpl-stub",
+                "object": "chat.completion.chunk",
+                "created": int(time.time()),
+                "model": request.get("model", "stub"),
+                "choices": [],
+                "usage": {"prompt_tokens": 500, "completion_tokens": 120, "total_tokens": 620},
+            }
+            self.wfile.write(f"data: {json.dumps(chunk)}\n\n".encode())
+        self.wfile.write(b"data: [DONE]\n\n")
+        self.wfile.flush()
+
+
+class StubLLMServer(ThreadingHTTPServer):
+    daemon_threads = True
+    # Large accept backlog so bursts of connections are not refused
+    request_queue_size = 1024
+
+    def __init__(
+        self,
+        address,
+        latency: float,
+        requests_per_second: float = 0,
+        slow_fraction: float = 0,
+        slow_multiplier: float = 10,
+        window: float = 10.0
+    ):
+        super().__init__(address, StubLLMHandler)
+        self.latency = latency
+        self.requests_per_second = requests_per_second
+        self.slow_fraction = slow_fraction
+        self.slow_multiplier = slow_multiplier
+        self.window = window
+        self.throttled_count = 0
+        self.request_count = 0
+        # (monotonic arrival time, throttled) for every request
+        self.request_log = []
+        self._window = []
+        self._lock = threading.Lock()
+
+    def handle_error(self, request, client_address):
+        # Clients cancel hedged and timed-out requests; a closed socket is expected
+        pass
+
+    def throttled(self) -> bool:
+        """Count the request and report whether it exceeds the quota over the sliding window."""
+        with self._lock:
+            self.request_count += 1
+            now = time.monotonic()
+            throttled = False
+            if self.requests_per_second:
+                self._window = [t for t in self._window if now - t < self.window]
+                throttled = len(self._window) >= self.requests_per_second * self.window
+                if throttled:
+                    self.throttled_count += 1
+                else:
+                    self._window.append(now)
+            self.request_log.append((now, throttled))
+            return throttled
+
+
+def start_stub_server(
+    port: int = 0,
+    latency: float = 2.0,
+    requests_per_second: float = 0,
+    slow_fraction: float = 0,
+    slow_multiplier: float = 10,
+    window: float = 10.0
+) -> StubLLMServer:
+    """
+    Start the stub server on a daemon thread and return it; port 0 picks a free port.
+
+    Args:
+        latency: Seconds before each response
+        requests_per_second: Answer 429 above this average rate over `window` seconds (0 disables throttling)
+        slow_fraction: Fraction of responses that take slow_multiplier times longer
+        window: Sliding window for the throttling quota, in seconds
+    """
+    server = StubLLMServer(("127.0.0.1", port), latency, requests_per_second, slow_fraction, slow_multiplier, window)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--port", type=int, default=8901)
+    parser.add_argument("--latency", type=float, default=2.0, help="seconds before each response")
+    parser.add_argument("--requests-per-second", type=float, default=0, help="throttle with 429 above this rate")
+    parser.add_argument("--slow-fraction", type=float, default=0, help="fraction of responses that are 10x slower")
+    args = parser.parse_args()
+
+    server = start_stub_server(args.port, args.latency, args.requests_per_second, args.slow_fraction)
+    print(f"Stub LLM listening on http://127.0.0.1:{server.server_address[1]}/v1")
+    try:
+        threading.Event().wait()
+    except KeyboardInterrupt:
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,12 @@
+import pytest
+from fastapi.testclient import TestClient
+
+
+@pytest.fixture
+def client(monkeypatch):
+    """API client with the application lifespan running; bulk review jobs are kept in memory."""
+    monkeypatch.setenv("CONTRACT_REVIEW_JOB_DB", ":memory:")
+    from app.main import app
+
+    with TestClient(app) as client:
+        yield client
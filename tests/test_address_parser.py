@@ -0,0 +1,40 @@
+import pytest
+
+from app.services.address_parser import AddressIndex, InvalidAddressError, parse_address
+
+SAME_ADDRESSES = [
+    ("123 north main street apt. 4b, springfield, illinois 62701", "123 N Main St #4B Springfield IL 62701-1234"),
+    ("500 West End Ave, New York, NY 10024", "500 west end avenue new york ny 10024-3316"),
+    ("12 West St, Springfield, IL 62701", "12 west street springfield il 62701"),
+]
+
+
+@pytest.mark.parametrize("spellings", SAME_ADDRESSES)
+def test_spellings_share_a_key(spellings):
+    assert len({parse_address(address).key for address in spellings}) == 1
+
+
+def test_directional_street_name_is_kept_whole():
+    assert parse_address("500 West End Ave, New York, NY 10024").street == "500 West End Ave"
+
+
+def test_ordinals_stay_lowercase():
+    parsed = parse_address("350 FIFTH AVE, NEW YORK, NY 10118")
+    assert parsed.full_address == "350 Fifth Ave, New York, NY 10118"
+
+    parsed = parse_address("350 5th ave new york ny 10118")
+    assert parsed.full_address == "350 5th Ave, New York, NY 10118"
+    assert parse_address("1 W 42ND ST, NEW YORK, NY").street == "1 W 42nd St"
+
+
+def test_index_entries_keep_ordinals_lowercase():
+    index = AddressIndex()
+    index.add_many([{"street": "5TH AVE", "city": "NEW YORK", "state": "NY", "zip_code": "10118"}])
+
+    assert index.entries[0]["street"] == "5th Ave"
+
+
+@pytest.mark.parametrize("address", ["", "   ", ", ,"])
+def test_empty_address_is_invalid(address):
+    with pytest.raises(InvalidAddressError):
+        parse_address(address)
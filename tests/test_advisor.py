@@ -0,0 +1,117 @@
+import asyncio
+import json
+import random
+from types import SimpleNamespace
+
+import pytest
+
+from app.ai.tools.contract_reviewer import split_contract_into_chunks
+from app.core.advisor import AdvisorAgent
+from app.core.clause_index import ClauseIndex
+from benchmarks.stub_llm_server import STUB_REVIEW
+
+WORDS = "tenant landlord premises rent deposit repair notice default term renewal assignment sublet insurance utility access".split()
+
+
+class FakeCompletions:
+    """Non-streaming chat.completions stand-in that counts calls and the peak number in flight."""
+
+    def __init__(self, latency: float = 0.0, error: Exception = None):
+        self.latency = latency
+        self.error = error
+        self.calls = 0
+        self.in_flight = 0
+        self.peak_in_flight = 0
+
+    async def create(self, **kwargs):
+        self.calls += 1
+        self.in_flight += 1
+        self.peak_in_flight = max(self.peak_in_flight, self.in_flight)
+        try:
+            await asyncio.sleep(self.latency)
+            if self.error is not None:
+                raise self.error
+        finally:
+            self.in_flight -= 1
+        return SimpleNamespace(
+            choices=[SimpleNamespace(message=SimpleNamespace(content=json.dumps(STUB_REVIEW)))],
+            usage=SimpleNamespace(prompt_tokens=500, completion_tokens=120, total_tokens=620),
+        )
+
+
+def fake_agent(completions: FakeCompletions, **options) -> AdvisorAgent:
+    agent = AdvisorAgent(openai_api_key="stub-key", deployment_name="stub", **options)
+    agent._client = SimpleNamespace(chat=SimpleNamespace(completions=completions))
+    return agent
+
+
+def make_contract(sections: int = 100, rent: int = 2500) -> str:
+    """A contract of numbered sections of about 400 characters, each with its own wording."""
+    rng = random.Random(0)
+    parts = []
+    for i in range(1, sections + 1):
+        body = " ".join(f"{rng.choice(WORDS)}{rng.randint(0, 999)}" for _ in range(45))
+        if i == 5:
+            body += f" Monthly rent is ${rent}."
+        parts.append(f"{i}. Section {i}. {body}")
+    return "\n\n".join(parts)
+
+
+def test_short_contract_is_one_call():
+    completions = FakeCompletions()
+
+    review = asyncio.run(fake_agent(completions).analyze_contract("This lease is made between Landlord and Tenant."))
+
+    assert completions.calls == 1
+    assert review["summary"] == STUB_REVIEW["summary"]
+
+
+def test_concurrent_calls_respect_the_cap():
+    completions = FakeCompletions(latency=0.02)
+    agent = fake_agent(completions, max_concurrent_requests=3)
+
+    async def reviews():
+        return await asyncio.gather(*(agent.analyze_contract(f"Lease number {i}.") for i in range(12)))
+
+    asyncio.run(reviews())
+
+    assert completions.calls == 12
+    assert completions.peak_in_flight <= 3
+
+
+def test_long_contract_is_reviewed_in_chunks():
+    completions = FakeCompletions()
+    contract = make_contract()
+
+    review = asyncio.run(fake_agent(completions, chunk_size_chars=12000).analyze_contract(contract))
+
+    assert completions.calls == len(split_contract_into_chunks(contract, 12000)) > 1
+    # Chunk findings are merged and deduplicated
+    assert review["warnings"] == STUB_REVIEW["warnings"]
+
+
+def test_errors_are_raised_on_request():
+    completions = FakeCompletions(error=RuntimeError("provider down"))
+    agent = fake_agent(completions, max_retries=0)
+
+    assert asyncio.run(agent.analyze_contract("Lease.")).get("summary").startswith("Error analyzing contract")
+    with pytest.raises(RuntimeError):
+        asyncio.run(agent.analyze_contract("Lease.", raise_errors=True))
+
+
+def test_clause_index_reuses_unchanged_chunks():
+    index = ClauseIndex()
+
+    def calls_for(contract: str) -> int:
+        completions = FakeCompletions()
+        asyncio.run(fake_agent(completions, clause_index=index).analyze_contract(contract))
+        return completions.calls
+
+    new = calls_for(make_contract())
+    repeat = calls_for(make_contract())
+    changed_rent = calls_for(make_contract(rent=2700))
+
+    # A new contract costs about as many calls as plain chunking, not one per clause
+    assert new <= 5
+    assert repeat == 0
+    assert changed_rent == 1
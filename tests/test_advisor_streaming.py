@@ -0,0 +1,104 @@
+import asyncio
+import json
+from types import SimpleNamespace
+
+import httpx
+import openai
+
+from app.core.advisor import AdvisorAgent
+from benchmarks.stub_llm_server import STUB_REVIEW, start_stub_server
+
+CONTRACT = "This lease agreement is made between Landlord and Tenant for the premises. " * 20
+
+
+def chunk(content=None, usage=None):
+    choices = [SimpleNamespace(delta=SimpleNamespace(content=content))] if content is not None else []
+    return SimpleNamespace(choices=choices, usage=usage)
+
+
+class FakeCompletions:
+    """chat.completions stand-in: each create() runs the next scripted stream."""
+
+    def __init__(self, scripts):
+        self.scripts = list(scripts)
+        self.calls = 0
+
+    async def create(self, **kwargs):
+        self.calls += 1
+        script = self.scripts.pop(0)
+        if isinstance(script, Exception):
+            raise script
+
+        async def stream():
+            for item in script:
+                if isinstance(item, Exception):
+                    raise item
+                yield item
+        return stream()
+
+
+def fake_agent(scripts) -> AdvisorAgent:
+    agent = AdvisorAgent(openai_api_key="stub-key", deployment_name="stub", max_retries=2)
+    agent._client = SimpleNamespace(chat=SimpleNamespace(completions=FakeCompletions(scripts)))
+    return agent
+
+
+def connection_error() -> openai.APIConnectionError:
+    return openai.APIConnectionError(request=httpx.Request("POST", "http://stub/v1/chat/completions"))
+
+
+async def collect(agent: AdvisorAgent):
+    return [event async for event in agent.stream_contract_review(CONTRACT, include_tokens=True)]
+
+
+REVIEW_CHUNKS = [chunk(piece) for piece in (json.dumps(STUB_REVIEW)[:40], json.dumps(STUB_REVIEW)[40:])]
+
+
+def test_error_before_the_first_token_is_retried():
+    agent = fake_agent([connection_error(), [chunk(""), connection_error()], REVIEW_CHUNKS])
+
+    events = asyncio.run(collect(agent))
+
+    assert agent.client.chat.completions.calls == 3
+    assert events[-1][0] == "result"
+    assert events[-1][1]["summary"] == STUB_REVIEW["summary"]
+    # Output of the failed attempts never reached the client
+    assert "".join(data for event, data in events if event == "token") == json.dumps(STUB_REVIEW)
+
+
+def test_error_after_a_token_is_not_retried():
+    agent = fake_agent([[REVIEW_CHUNKS[0], connection_error()], REVIEW_CHUNKS])
+
+    events = asyncio.run(collect(agent))
+
+    assert agent.client.chat.completions.calls == 1
+    assert events[-1][0] == "error"
+    assert agent.concurrency.in_flight == 0
+
+
+def test_throttled_stream_is_retried_after_retry_after():
+    # One request per second: the warm-up review uses it, so the stream first gets a 429
+    server = start_stub_server(latency=0.05, requests_per_second=1, window=1.0)
+    agent = AdvisorAgent(
+        openai_api_key="stub-key",
+        deployment_name="stub",
+        api_base=f"http://127.0.0.1:{server.server_address[1]}/v1",
+        max_retries=3
+    )
+
+    async def run():
+        try:
+            await agent.analyze_contract("Short lease. " * 10, raise_errors=True)
+            return await collect(agent)
+        finally:
+            await agent.aclose()
+
+    try:
+        events = asyncio.run(run())
+    finally:
+        server.shutdown()
+        server.server_close()
+
+    assert server.throttled_count == 1
+    assert events[-1][0] == "result"
+    assert events[-1][1]["summary"] == STUB_REVIEW["summary"]
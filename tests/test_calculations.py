@@ -0,0 +1,45 @@
+import numpy as np
+import pytest
+
+from app.services.calculations import calculate_property_metrics, calculate_property_metrics_batch
+
+PROPERTIES = [
+    {"purchase_price": 400000.0, "annual_rental_income": 36000.0, "property_taxes": 6000.0, "insurance": None, "vacancy_rate": 0.05},
+    {"purchase_price": 250000.0, "annual_rental_income": 24000.0, "property_taxes": None, "insurance": 900.0, "vacancy_rate": 0.08},
+    {"purchase_price": 900000.0, "annual_rental_income": 70000.0, "property_taxes": None, "insurance": None, "vacancy_rate": 0.0},
+]
+
+
+def test_batch_matches_scalar_calculation():
+    columns = {name: [p[name] for p in PROPERTIES] for name in PROPERTIES[0]}
+
+    batch = calculate_property_metrics_batch(**columns)
+
+    for i, inputs in enumerate(PROPERTIES):
+        expected = calculate_property_metrics(**inputs)
+        assert batch["cap_rate"][i] == pytest.approx(expected["cap_rate"], abs=0.01)
+        assert batch["noi"][i] == pytest.approx(expected["noi"], abs=0.01)
+        assert batch["total_expenses"][i] == pytest.approx(expected["total_expenses"], abs=0.01)
+
+
+def test_batch_size_comes_from_any_column():
+    batch = calculate_property_metrics_batch(purchase_price=400000.0, annual_rental_income=36000.0, vacancy_rate=[0.0, 0.05, 0.1])
+
+    assert batch["noi"].shape == (3,)
+    assert batch["noi"][0] > batch["noi"][1] > batch["noi"][2]
+
+
+def test_nan_estimates_use_the_defaults():
+    batch = calculate_property_metrics_batch(purchase_price=[400000.0], annual_rental_income=[36000.0], property_taxes=np.array([np.nan]))
+
+    assert batch["expense_breakdown"]["property_taxes"][0] == pytest.approx(400000.0 * 0.015)
+
+
+def test_column_lengths_must_match():
+    with pytest.raises(ValueError, match="Column lengths differ"):
+        calculate_property_metrics_batch(purchase_price=[1.0, 2.0], annual_rental_income=[1.0, 2.0, 3.0])
+
+
+def test_columns_must_be_one_dimensional():
+    with pytest.raises(ValueError, match="1-D"):
+        calculate_property_metrics_batch(purchase_price=np.ones((2, 2)), annual_rental_income=1.0)
@@ -0,0 +1,31 @@
+import numpy as np
+import pytest
+
+from app.services.cash_flow_projection import project_hold_period_batch
+
+INPUTS = {
+    "annual_rental_income": 36000.0,
+    "property_taxes": 6000.0,
+    "insurance": 1200.0,
+    "rent_growth_rate": 0.03,
+    "appreciation_rate": 0.04,
+    "expense_growth_rate": 0.03,
+    "discount_rate": 0.08,
+    "selling_cost_rate": 0.06,
+}
+
+
+def test_projection_per_horizon():
+    projection = project_hold_period_batch(horizon_years=[5, 10], purchase_price=400000.0, **INPUTS)
+
+    assert projection["projected_noi"].shape == (2, 10)
+    assert (projection["projected_noi"][0, 5:] == 0).all()
+    assert projection["resale_value"][1] == pytest.approx(400000.0 * 1.04 ** 10)
+    assert not np.isnan(projection["irr"]).any()
+    assert (projection["equity_multiple"] > 1).all()
+
+
+def test_equity_multiple_is_nan_without_purchase_price():
+    projection = project_hold_period_batch(horizon_years=[5], purchase_price=0.0, **INPUTS)
+
+    assert np.isnan(projection["equity_multiple"][0])
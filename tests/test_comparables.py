@@ -0,0 +1,92 @@
+import random
+
+import pytest
+
+from app.services.comparables import ComparablesIndex
+from app.services.property_data_provider import get_property_data
+
+CENTER = (39.78, -89.65)
+
+
+def make_rows(n: int = 2000, seed: int = 0):
+    rng = random.Random(seed)
+    return [
+        {
+            "address": f"{i} Elm St, Springfield, IL 62701",
+            "latitude": CENTER[0] + rng.uniform(-0.05, 0.05),
+            "longitude": CENTER[1] + rng.uniform(-0.05, 0.05),
+            "bedrooms": rng.randint(1, 5),
+            "bathrooms": rng.choice([1, 1.5, 2, 3]),
+            "square_feet": rng.randint(700, 3500),
+            "year_built": rng.randint(1920, 2020),
+            "property_type": rng.choice(["single_family", "condo", "townhouse"]),
+            "zip_code": "62701",
+        }
+        for i in range(n)
+    ]
+
+
+TARGET = {"bedrooms": 3, "bathrooms": 2, "square_feet": 1500, "year_built": 1995, "property_type": "single_family"}
+
+
+def test_query_returns_nearby_similar_properties():
+    index = ComparablesIndex()
+    index.build(make_rows())
+
+    results = index.query(*CENTER, TARGET, k=5)
+
+    assert len(results) == 5
+    scores = [result["similarity_score"] for result in results]
+    assert scores == sorted(scores)
+    assert all(result["distance_km"] < 3 for result in results)
+
+
+def test_query_matches_a_full_scan():
+    index = ComparablesIndex()
+    index.build(make_rows(300))
+
+    # A window covering every row turns the query into a full scan
+    windowed = index.query(*CENTER, TARGET, k=5)
+    full = index.query(*CENTER, TARGET, k=5, max_rings=20)
+
+    assert [r["address"] for r in windowed] == [r["address"] for r in full]
+
+
+def test_inserted_properties_are_found_before_compaction():
+    index = ComparablesIndex()
+    index.build(make_rows())
+    index.insert({"address": "1 Subject Way, Springfield, IL 62701", "latitude": CENTER[0], "longitude": CENTER[1], **TARGET})
+
+    results = index.query(*CENTER, TARGET, k=1)
+
+    assert results[0]["address"] == "1 Subject Way, Springfield, IL 62701"
+    assert index.query(*CENTER, TARGET, k=1, exclude_address="1 Subject Way, Springfield, IL 62701")[0]["address"] != results[0]["address"]
+
+
+def test_saved_index_loads_memory_mapped(tmp_path):
+    index = ComparablesIndex()
+    index.build(make_rows())
+    index.save(str(tmp_path / "comparables"))
+
+    loaded = ComparablesIndex.load(str(tmp_path / "comparables"))
+
+    assert len(loaded) == len(index)
+    assert loaded.query(*CENTER, TARGET, k=5) == index.query(*CENTER, TARGET, k=5)
+
+
+def test_similar_to_falls_back_to_the_zip_centroid():
+    index = ComparablesIndex()
+    index.build(make_rows())
+
+    results = index.similar_to(get_property_data("999 Unknown Rd, Springfield, IL 62701"), k=3)
+
+    assert len(results) == 3
+    assert index.similar_to(get_property_data("1 Nowhere Ln, Anytown, CA 12345"), k=3) == []
+
+
+@pytest.mark.parametrize("k", [1, 10])
+def test_k_results(k):
+    index = ComparablesIndex()
+    index.build(make_rows(200))
+
+    assert len(index.query(*CENTER, TARGET, k=k)) == k
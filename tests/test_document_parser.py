@@ -0,0 +1,65 @@
+import zipfile
+
+from app.ai.tools.document_parser import DOCX, PDF, TEXT, detect_document_type, iter_docx_pages, iter_text_pages, parse_document
+
+DOCX_XML = (
+    '<?xml version="1.0" encoding="UTF-8"?>'
+    '<w:document xmlns:w="http://schemas.openxmlformats.org/wordprocessingml/2006/main"><w:body>{}</w:body></w:document>'
+)
+
+
+def paragraph(text: str, page_break: bool = False) -> str:
+    brk = '<w:r><w:br w:type="page"/></w:r>' if page_break else ""
+    return f"<w:p>{brk}<w:r><w:t>{text}</w:t></w:r></w:p>"
+
+
+def write_docx(path, body: str):
+    with zipfile.ZipFile(path, "w") as archive:
+        archive.writestr("[Content_Types].xml", "<Types/>")
+        archive.writestr("word/document.xml", DOCX_XML.format(body))
+    return str(path)
+
+
+def test_document_type_is_sniffed_when_not_declared(tmp_path):
+    pdf = tmp_path / "lease.bin"
+    pdf.write_bytes(b"%PDF-1.7\n")
+    docx = write_docx(tmp_path / "lease.zip", paragraph("Lease"))
+    text = tmp_path / "lease.txt"
+    text.write_text("Lease")
+
+    assert detect_document_type(str(pdf)) == PDF
+    assert detect_document_type(docx) == DOCX
+    assert detect_document_type(str(text)) == TEXT
+    assert detect_document_type(str(text), "application/pdf; charset=binary") == PDF
+
+
+def test_docx_pages_follow_recorded_page_breaks(tmp_path):
+    path = write_docx(tmp_path / "lease.docx", paragraph("Parties") + paragraph("Term") + paragraph("Rent", page_break=True))
+
+    assert list(iter_docx_pages(path, page_chars=1)) == ["Parties\nTerm", "Rent"]
+
+
+def test_docx_without_page_breaks_is_split_by_size(tmp_path):
+    path = write_docx(tmp_path / "lease.docx", "".join(paragraph(f"Section {i}") for i in range(6)))
+
+    pages = list(iter_docx_pages(path, page_chars=20))
+
+    assert pages == ["Section 0\nSection 1\nSection 2", "Section 3\nSection 4\nSection 5"]
+
+
+def test_text_pages_split_at_form_feeds_and_line_breaks(tmp_path):
+    path = tmp_path / "lease.txt"
+    lines = "".join(f"line {i}\n" for i in range(10))
+    path.write_text("Cover\f" + lines)
+
+    pages = list(iter_text_pages(str(path), page_chars=20))
+
+    assert pages[0] == "Cover"
+    assert "".join(pages[1:]) == lines
+    assert all(len(page) <= 20 and page.endswith("\n") for page in pages[1:])
+
+
+def test_parse_document_joins_pages(tmp_path):
+    path = write_docx(tmp_path / "lease.docx", paragraph("Parties") + paragraph("Rent", page_break=True))
+
+    assert parse_document(path) == "Parties\n\nRent"
@@ -0,0 +1,81 @@
+import math
+
+import numpy as np
+import pytest
+
+from app.services.financing import (
+    MAX_FINANCING_SCENARIOS,
+    amortization_schedule_batch,
+    financing_scenarios,
+    loan_balance_batch,
+)
+
+
+def simulate_loan(loan, annual_rate, amortization_years, interest_only_years, years):
+    """Month-by-month reference: (annual debt service, end-of-year balance) for each year."""
+    i = annual_rate / 12
+    n = amortization_years * 12
+    payment = loan / n if i == 0 else loan * i / (1 - (1 + i) ** -n)
+    balance, schedule = loan, []
+    for year in range(1, years + 1):
+        paid = 0.0
+        for _ in range(12):
+            if year <= interest_only_years:
+                paid += balance * i
+            elif balance > 0.01:
+                interest = balance * i
+                paid += payment
+                balance = max(balance + interest - payment, 0.0)
+        schedule.append((paid, balance))
+    return schedule
+
+
+@pytest.mark.parametrize("rate, amortization, interest_only", [(0.065, 30, 0), (0.05, 25, 3), (0.0, 10, 0), (0.07, 5, 2)])
+def test_schedule_matches_a_monthly_simulation(rate, amortization, interest_only):
+    years = 10
+    schedule = amortization_schedule_batch([400_000], [rate], [amortization], [interest_only], years)
+    expected = simulate_loan(400_000, rate, amortization, interest_only, years)
+
+    np.testing.assert_allclose(schedule["debt_service"][0], [paid for paid, _ in expected], rtol=1e-9, atol=1e-6)
+    np.testing.assert_allclose(schedule["balance"][0], [balance for _, balance in expected], rtol=1e-9, atol=1e-6)
+    np.testing.assert_allclose(schedule["interest"] + schedule["principal"], schedule["debt_service"])
+
+
+def test_loan_balance_broadcasts_over_loans_and_years():
+    balances = loan_balance_batch([100_000, 200_000], 0.06, 30, 0, [[0], [30]])
+
+    np.testing.assert_allclose(balances[0], [100_000, 200_000])
+    np.testing.assert_allclose(balances[1], [0, 0], atol=1e-6)
+
+
+def test_scenarios_follow_the_grid_order():
+    grid = financing_scenarios(
+        noi=60_000, purchase_price=1_000_000, gross_income=100_000, operating_expenses=40_000,
+        interest_rates=[0.05, 0.07], ltvs=[0.0, 0.75], interest_only_years=[0, 1], balance_after_years=5
+    )
+
+    assert grid["shape"] == [2, 2, 1, 2]
+    # Index [rate=0.07][ltv=0.75][30y][interest only] in the flat arrays
+    index = np.ravel_multi_index((1, 1, 0, 1), grid["shape"])
+    assert grid["loan_amount"][index] == pytest.approx(750_000)
+    assert grid["annual_debt_service"][index] == pytest.approx(750_000 * 0.07)
+    assert grid["dscr"][index] == pytest.approx(60_000 / (750_000 * 0.07))
+    assert grid["amortizing_debt_service"][index] > grid["annual_debt_service"][index]
+    assert grid["cash_on_cash"][index] == pytest.approx((60_000 - 52_500) / 280_000 * 100)
+    assert grid["loan_balance"][index] == pytest.approx(simulate_loan(750_000, 0.07, 30, 1, 5)[-1][1])
+
+    all_cash = np.ravel_multi_index((0, 0, 0, 0), grid["shape"])
+    assert math.isnan(grid["dscr"][all_cash])
+    assert grid["cash_flow"][all_cash] == 60_000
+
+
+@pytest.mark.parametrize("options", [
+    {"ltvs": [1.0]},
+    {"amortization_years": [0]},
+    {"interest_only_years": [-1]},
+    {"interest_rates": np.linspace(0.03, 0.08, MAX_FINANCING_SCENARIOS + 1)},
+])
+def test_invalid_grids_are_rejected(options):
+    arguments = {"interest_rates": [0.06], "ltvs": [0.7], **options}
+    with pytest.raises(ValueError):
+        financing_scenarios(noi=60_000, purchase_price=1_000_000, gross_income=100_000, operating_expenses=40_000, **arguments)
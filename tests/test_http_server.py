@@ -0,0 +1,140 @@
+import pytest
+
+from app.routes.http_server import PropertyDataLoader
+from app.services.property_data_provider import get_property_data
+
+
+def test_lifespan_builds_shared_components(client):
+    state = client.app.state
+
+    assert isinstance(state.property_data_loader, PropertyDataLoader)
+    assert state.property_data_loader.market_rollups is state.market_rollups
+    assert client.get("/api/property_data_cache/stats").status_code == 200
+    assert client.get("/api/underwriting_sessions/stats").status_code == 200
+
+
+def test_property_insight_is_cached_by_etag(client):
+    address = {"address": "123 Main St, Springfield, IL 62701"}
+
+    response = client.post("/api/get_property_insight", json=address)
+    assert response.status_code == 200
+    assert response.json()["zip_code"] == "62701"
+
+    cached = client.post("/api/get_property_insight", json=address, headers={"If-None-Match": response.headers["etag"]})
+    assert cached.status_code == 304
+
+
+def test_blank_address_is_rejected(client):
+    response = client.post("/api/get_property_insight", json={"address": "  "})
+
+    assert response.status_code == 422
+    assert response.json()["detail"] == "Address is empty"
+
+
+def test_server_side_value_errors_are_not_client_errors(client):
+    loader = client.app.state.property_data_loader
+
+    async def broken_fetch(address):
+        raise ValueError("corrupt cache entry")
+
+    loader.aggregator.get = broken_fetch
+    with pytest.raises(ValueError, match="corrupt cache entry"):
+        client.post("/api/get_property_insight", json={"address": "9 Elm St, Springfield, IL 62701"})
+
+
+def test_oversized_sensitivity_grid_is_rejected(client):
+    axis = [i / 1000 for i in range(100)]
+    request = {
+        "address": "123 Main St, Springfield, IL 62701",
+        "n_scenarios": 1000,
+        "grid_vacancy_rates": axis,
+        "grid_rent_changes": axis,
+        "grid_expense_changes": [0.0, 0.05],
+    }
+
+    response = client.post("/api/property_risk", json=request)
+    assert response.status_code == 422
+    assert "limit" in response.json()["detail"]
+
+    request["grid_expense_changes"] = [0.0]
+    response = client.post("/api/property_risk", json=request)
+    assert response.status_code == 200
+    assert len(response.json()["sensitivity_grid"]["noi"]) == 100
+
+
+def test_financing_scenarios_report_all_cash_dscr_as_null(client):
+    response = client.post("/api/financing_scenarios", json={
+        "address": "123 Main St, Springfield, IL 62701", "interest_rates": [0.06], "ltvs": [0.0, 0.75]
+    })
+
+    assert response.status_code == 200
+    result = response.json()
+    assert result["shape"] == [1, 2, 1, 1]
+    assert result["dscr"][0] is None
+    assert result["dscr"][1] > 0
+
+
+def test_hold_period_without_purchase_price_has_no_equity_multiple(client):
+    async def unpriced(address):
+        property_data = get_property_data(address)
+        property_data.financial.current_market_value = 0.0
+        return property_data
+
+    client.app.state.property_data_loader.aggregator.get = unpriced
+    response = client.post("/api/hold_period_analysis", json={"address": "77 Oak St, Springfield, IL 62701", "horizons": [5]})
+
+    assert response.status_code == 200
+    result = response.json()["results"][0]
+    assert result["equity_multiple"] is None
+    assert result["irr"] is None
+    # The published schema allows the null, not just this serializer
+    schema = client.get("/openapi.json").json()["components"]["schemas"]["HoldPeriodResult"]
+    assert {"type": "null"} in schema["properties"]["equity_multiple"]["anyOf"]
+
+
+def test_batch_property_metrics(client):
+    response = client.post("/api/batch_property_metrics", json={"purchase_price": [400000, 250000], "annual_rental_income": [36000, 24000]})
+    assert response.status_code == 200
+    assert response.json()["count"] == 2
+
+    response = client.post("/api/batch_property_metrics", json={"purchase_price": [400000, 250000], "annual_rental_income": [36000]})
+    assert response.status_code == 422
+
+
+def test_contract_upload_is_reviewed_page_by_page(client, monkeypatch):
+    received = []
+
+    async def review_contract_pages(pages, timeout=None):
+        received.extend([page async for page in pages])
+        return {"summary": "Standard lease", "highlights": [], "warnings": [], "suggestions": []}
+
+    monkeypatch.setattr(client.app.state.agent, "review_contract_pages", review_contract_pages)
+    response = client.post(
+        "/api/ai_contract_review/upload", content=b"Parties\fRent", headers={"Content-Type": "text/plain"}
+    )
+
+    assert response.status_code == 200
+    assert response.json()["summary"] == "Standard lease"
+    assert received == ["Parties", "Rent"]
+
+
+def test_multipart_contract_upload_is_rejected(client):
+    response = client.post("/api/ai_contract_review/upload", files={"file": ("lease.txt", b"Lease")})
+
+    assert response.status_code == 415
+
+
+def test_underwriting_session_lifecycle(client):
+    created = client.post("/api/underwriting_sessions", json={"address": "123 Main St, Springfield, IL 62701", "inputs": {"vacancy_rate": 0.05}})
+    assert created.status_code == 201
+    session = created.json()
+    path = f"/api/underwriting_sessions/{session['session_id']}"
+
+    updated = client.patch(path, json={"changes": {"vacancy_rate": 0.1}})
+    assert updated.status_code == 200
+    assert updated.json()["changed"]["noi"] < session["metrics"]["noi"]
+    assert client.get(path).json()["inputs"]["vacancy_rate"] == 0.1
+
+    assert client.patch(path, json={"changes": {"unknown": 1.0}}).status_code == 422
+    assert client.delete(path).status_code == 204
+    assert client.get(path).status_code == 404
@@ -0,0 +1,128 @@
+import asyncio
+
+import pytest
+
+from app.core.job_queue import CANCELLED, COMPLETED, FAILED, ContractReviewQueue, JobStore, QueueFullError
+
+REVIEW = {"summary": "Standard lease", "highlights": [], "warnings": [], "suggestions": []}
+
+
+class FakeAgent:
+    """Reviews "bad" contracts with an error and "slow" ones after slow_delay seconds."""
+
+    def __init__(self, slow_delay: float = 10.0):
+        self.slow_delay = slow_delay
+        self.reviewed = []
+
+    async def analyze_contract(self, text, raise_errors=False):
+        if text == "bad":
+            raise RuntimeError("provider down")
+        if text == "slow":
+            await asyncio.sleep(self.slow_delay)
+        self.reviewed.append(text)
+        return REVIEW
+
+
+async def wait_for_status(queue: ContractReviewQueue, job_id: str, *statuses: str, timeout: float = 2.0):
+    for _ in range(int(timeout / 0.01)):
+        status = queue.store.job_status(job_id)
+        if status["status"] in statuses:
+            return status
+        await asyncio.sleep(0.01)
+    raise AssertionError(f"job stayed {status['status']}")
+
+
+def test_failed_reviews_are_flagged():
+    async def run():
+        queue = ContractReviewQueue(FakeAgent(), JobStore(":memory:"), workers=2)
+        job_id = await queue.submit(["ok", "bad"])
+        status = await wait_for_status(queue, job_id, COMPLETED, FAILED)
+        results = queue.store.job_results(job_id)
+        await queue.stop()
+        return status, results
+
+    status, results = asyncio.run(run())
+
+    assert status["status"] == COMPLETED
+    assert (status["completed"], status["failed"]) == (1, 1)
+    assert [item["status"] for item in results] == [COMPLETED, FAILED]
+    assert "provider down" in results[1]["review"]["summary"]
+
+
+def test_higher_priority_jobs_run_first():
+    async def run():
+        agent = FakeAgent()
+        queue = ContractReviewQueue(agent, JobStore(":memory:"), workers=1)
+        await queue.start()
+        blocker = await queue.submit(["slow"])
+        await asyncio.sleep(0.01)
+        low = await queue.submit(["low"], priority=0)
+        high = await queue.submit(["high"], priority=5)
+        # Both jobs wait behind the blocker; cancelling it frees the only worker
+        queue.cancel(blocker)
+        await wait_for_status(queue, low, COMPLETED)
+        await queue.stop()
+        return agent.reviewed, queue.store.job_status(high)["status"]
+
+    reviewed, high_status = asyncio.run(run())
+
+    assert reviewed == ["high", "low"]
+    assert high_status == COMPLETED
+
+
+def test_cancel_interrupts_running_reviews():
+    async def run():
+        queue = ContractReviewQueue(FakeAgent(), JobStore(":memory:"), workers=1)
+        job_id = await queue.submit(["slow", "ok"])
+        await asyncio.sleep(0.05)
+        assert queue.cancel(job_id)
+        await asyncio.sleep(0.05)
+        status = queue.store.job_status(job_id)
+        await queue.stop()
+        return status
+
+    status = asyncio.run(run())
+
+    assert status["status"] == CANCELLED
+    assert status["cancelled"] == 2
+
+
+def test_full_queue_rejects_batches():
+    async def run():
+        queue = ContractReviewQueue(FakeAgent(), JobStore(":memory:"), max_pending=3, workers=1)
+        await queue.submit(["slow"])
+        await asyncio.sleep(0.01)
+        await queue.submit(["ok", "ok", "ok"])
+        try:
+            with pytest.raises(QueueFullError):
+                await queue.submit(["ok"])
+        finally:
+            await queue.stop()
+
+    asyncio.run(run())
+
+
+def test_unfinished_items_resume_after_a_restart(tmp_path):
+    path = str(tmp_path / "jobs.sqlite")
+
+    async def first_run():
+        queue = ContractReviewQueue(FakeAgent(), JobStore(path), workers=1)
+        job_id = await queue.submit(["slow", "ok"])
+        await asyncio.sleep(0.05)
+        await asyncio.wait_for(queue.stop(), 1.0)
+        return job_id
+
+    async def second_run(job_id):
+        agent = FakeAgent(slow_delay=0)
+        queue = ContractReviewQueue(agent, JobStore(path), workers=1)
+        await queue.start()
+        status = await wait_for_status(queue, job_id, COMPLETED)
+        await queue.stop()
+        return agent.reviewed, status
+
+    job_id = asyncio.run(first_run())
+    reviewed, status = asyncio.run(second_run(job_id))
+
+    # The interrupted item is reviewed again, in submission order
+    assert reviewed == ["slow", "ok"]
+    assert status["completed"] == 2
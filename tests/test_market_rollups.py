@@ -0,0 +1,105 @@
+import random
+
+import numpy as np
+import pytest
+
+from app.services.market_rollups import RELATIVE_ACCURACY, MarketRollupStore, QuantileSketch
+
+
+def make_listings(count: int, seed: int = 7):
+    rng = random.Random(seed)
+    return [
+        {
+            "zip_code": rng.choice(["62701", "62702"]),
+            "county": "Sangamon",
+            "property_type": rng.choice(["condo", "single_family"]),
+            "monthly_rent": rng.uniform(900, 4000),
+            "square_feet": rng.uniform(500, 3000),
+            "vacancy_rate": rng.uniform(0.02, 0.1),
+        }
+        for _ in range(count)
+    ]
+
+
+def test_sketch_quantiles_are_within_the_relative_accuracy():
+    values = np.random.default_rng(3).lognormal(0.5, 0.8, 5000)
+    sketch = QuantileSketch()
+    for value in values:
+        sketch.add(value)
+
+    for q in (0.1, 0.5, 0.9):
+        exact = np.sort(values)[int(q * (len(values) - 1))]
+        assert sketch.quantile(q) == pytest.approx(exact, rel=RELATIVE_ACCURACY)
+    assert QuantileSketch().quantile(0.5) is None
+
+
+def test_merged_sketches_equal_one_sketch_of_all_values():
+    left, right, both = QuantileSketch(), QuantileSketch(), QuantileSketch()
+    for i, value in enumerate([0.0, 1.5, 2.0, 3.3, 8.0, 0.2, 5.5]):
+        (left if i % 2 else right).add(value)
+        both.add(value)
+    left.merge(right)
+
+    assert (left.counts, left.zero_count, left.count) == (both.counts, both.zero_count, both.count)
+
+
+def test_lookup_falls_back_to_broader_rollups():
+    store = MarketRollupStore()
+    store.add({"zip_code": "62701", "county": "Sangamon", "property_type": "Condo", "monthly_rent": 2000, "square_feet": 1000})
+    store.add({"county": "Sangamon", "property_type": "condo", "monthly_rent": 1000, "square_feet": 1000, "vacancy_rate": 0.05})
+    assert not store.add({"property_type": "condo", "monthly_rent": 1500})
+
+    fields = store.lookup("62701", "sangamon", "condo")
+
+    assert fields["average_rent_nearby"] == 2000
+    assert fields["median_rent_per_sqft"] == pytest.approx(2.0, rel=RELATIVE_ACCURACY)
+    # Only the county rollup has a vacancy rate
+    assert fields["vacancy_rate"] == 0.05
+    assert store.lookup("99999") == {}
+
+
+def test_incremental_adds_match_a_bulk_ingest():
+    listings = make_listings(400)
+    bulk, incremental = MarketRollupStore(), MarketRollupStore()
+    bulk.ingest(listings)
+    for listing in listings:
+        incremental.add(listing)
+
+    assert incremental._fields == bulk._fields
+    assert bulk.stats()["zip_codes"] == 2 and bulk.stats()["counties"] == 1
+
+
+def test_loaded_store_keeps_updating(tmp_path):
+    path = str(tmp_path / "rollups.npz")
+    listings = make_listings(300)
+    store = MarketRollupStore()
+    store.ingest(listings[:200])
+    store.save(path)
+
+    loaded = MarketRollupStore.load(path)
+    assert loaded._fields == store._fields
+    loaded.ingest(listings[200:])
+    store.ingest(listings[200:])
+
+    assert loaded._fields == store._fields
+    assert loaded.listings == 300
+
+
+def test_merge_into_keeps_every_workers_listings(tmp_path):
+    path = str(tmp_path / "rollups.npz")
+    listings = make_listings(300)
+    MarketRollupStore().save(path)
+    first, second = MarketRollupStore.load(path), MarketRollupStore.load(path)
+
+    first.ingest(listings[:100])
+    second.ingest(listings[100:])
+    first.merge_into(path)
+    second.merge_into(path)
+
+    expected = MarketRollupStore()
+    expected.ingest(listings[:100])
+    expected.ingest(listings[100:])
+    merged = MarketRollupStore.load(path)
+    assert merged.listings == 300
+    assert merged.lookup("62701", property_type="condo") == pytest.approx(expected.lookup("62701", property_type="condo"))
+    assert second.lookup("62702") == pytest.approx(expected.lookup("62702"))
@@ -0,0 +1,55 @@
+from app.core import metrics
+from app.core.metrics import MetricsRegistry
+
+
+def test_histogram_renders_cumulative_buckets():
+    registry = MetricsRegistry()
+    histogram = registry.histogram("stage_seconds", "Stage time", ("stage",), buckets=(0.1, 1.0))
+    for value in (0.05, 0.5, 0.7, 3.0):
+        histogram.observe(value, "parse")
+
+    lines = registry.render().splitlines()
+
+    assert lines[:2] == ["# HELP stage_seconds Stage time", "# TYPE stage_seconds histogram"]
+    assert lines[2:] == [
+        'stage_seconds_bucket{stage="parse",le="0.1"} 1',
+        'stage_seconds_bucket{stage="parse",le="1"} 3',
+        'stage_seconds_bucket{stage="parse",le="+Inf"} 4',
+        'stage_seconds_sum{stage="parse"} 4.25',
+        'stage_seconds_count{stage="parse"} 4',
+    ]
+
+
+def test_counter_escapes_label_values_and_is_registered_once():
+    registry = MetricsRegistry()
+    counter = registry.counter("errors_total", "Errors", ("reason",))
+    assert registry.counter("errors_total", "Errors", ("reason",)) is counter
+
+    counter.inc('bad "quote"\n')
+    counter.inc('bad "quote"\n', amount=2)
+
+    assert 'errors_total{reason="bad \\"quote\\"\\n"} 3' in registry.render().splitlines()
+
+
+def test_spans_are_skipped_when_sampling_is_off(monkeypatch):
+    monkeypatch.setattr(metrics, "SAMPLE_RATE", 0.0)
+    before = metrics.STAGE_SECONDS.count("test_stage")
+    with metrics.span("test_stage"):
+        pass
+    assert metrics.STAGE_SECONDS.count("test_stage") == before
+
+    monkeypatch.setattr(metrics, "SAMPLE_RATE", 1.0)
+    with metrics.span("test_stage"):
+        pass
+    assert metrics.STAGE_SECONDS.count("test_stage") == before + 1
+
+
+def test_metrics_endpoint_reports_requests_by_route_template(client):
+    client.get("/api/contract_review_jobs/not-a-job")
+
+    response = client.get("/metrics")
+
+    assert response.headers["content-type"] == metrics.CONTENT_TYPE
+    request_lines = [line for line in response.text.splitlines() if line.startswith("http_request_duration_seconds_count")]
+    assert any("contract_review_jobs/{job_id}" in line and 'status="404"' in line for line in request_lines)
+    assert not any("not-a-job" in line for line in request_lines)
@@ -0,0 +1,88 @@
+import asyncio
+import time
+
+import pytest
+
+from app.services.property_aggregator import (
+    PropertyDataAggregator,
+    PropertyDataSource,
+    PropertyDataUnavailableError,
+    StubSource,
+)
+
+LISTING = {
+    "address": {
+        "street": "123 Main St",
+        "city": "Springfield",
+        "state": "IL",
+        "zip_code": "62701",
+        "county": "Sangamon",
+        "full_address": "123 Main St, Springfield, IL 62701",
+    },
+    "details": {"property_type": "single_family", "bedrooms": 3, "bathrooms": 2.0, "square_feet": 1500},
+    "financial": {"current_market_value": 450000.0, "monthly_rent": 2500.0, "annual_rental_income": 30000.0},
+    "market": {"vacancy_rate": 0.05},
+}
+
+
+def test_incomplete_source_fails_on_creation():
+    class NoFetch(PropertyDataSource):
+        pass
+
+    with pytest.raises(TypeError):
+        NoFetch("incomplete")
+
+
+def test_slow_source_is_cut_off_at_deadline():
+    aggregator = PropertyDataAggregator(
+        [StubSource("mls", LISTING, delay=0.01), StubSource("slow", {"market": {"vacancy_rate": 0.08}}, priority=1, delay=5.0)],
+        deadline=0.5,
+    )
+
+    started = time.monotonic()
+    property_data = asyncio.run(aggregator.get("123 Main St, Springfield, IL 62701"))
+    elapsed = time.monotonic() - started
+
+    assert elapsed < 1.0
+    assert property_data.data_sources == ["mls"]
+    assert property_data.missing_sources == ["slow"]
+    assert property_data.market.vacancy_rate == 0.05
+    assert aggregator.stats()["sources"]["slow"]["timeout"] == 1
+
+
+def test_failing_source_is_listed_as_missing():
+    aggregator = PropertyDataAggregator(
+        [StubSource("mls", LISTING), StubSource("flaky", {"market": {"vacancy_rate": 0.08}}, failure_rate=1.0)],
+        deadline=0.5,
+    )
+
+    property_data = asyncio.run(aggregator.get("123 Main St"))
+
+    assert property_data.missing_sources == ["flaky"]
+    assert aggregator.stats()["sources"]["flaky"]["error"] == 1
+
+
+def test_fields_merge_by_priority():
+    aggregator = PropertyDataAggregator(
+        [
+            StubSource("mls", LISTING, priority=0),
+            StubSource("rentals", {"financial": {"monthly_rent": 2700.0}, "market": {"vacancy_rate": None}}, priority=1),
+        ],
+        deadline=0.5,
+    )
+
+    property_data = asyncio.run(aggregator.get("123 Main St"))
+
+    assert property_data.financial.monthly_rent == 2700.0
+    assert property_data.market.vacancy_rate == 0.05
+    assert property_data.data_sources == ["mls", "rentals"]
+
+
+def test_missing_required_fields_raise():
+    aggregator = PropertyDataAggregator(
+        [StubSource("rentals", {"financial": {"monthly_rent": 2700.0}}), StubSource("mls", LISTING, delay=5.0)],
+        deadline=0.2,
+    )
+
+    with pytest.raises(PropertyDataUnavailableError):
+        asyncio.run(aggregator.get("123 Main St"))
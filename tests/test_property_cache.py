@@ -0,0 +1,79 @@
+import asyncio
+
+import pytest
+
+from app.services.property_cache import PropertyDataCache
+from app.services.property_data_provider import get_property_data
+
+ADDRESS = "123 Main St, Springfield, IL 62701"
+
+
+def slow_fetcher(calls: list, delay: float = 0.05, error: Exception = None):
+    async def fetch(address):
+        calls.append(address)
+        await asyncio.sleep(delay)
+        if error is not None:
+            raise error
+        return get_property_data(address)
+    return fetch
+
+
+def test_concurrent_misses_share_one_fetch():
+    async def lookups():
+        cache, calls = PropertyDataCache(), []
+        results = await asyncio.gather(*(cache.get(ADDRESS, slow_fetcher(calls)) for _ in range(5)))
+        return cache, calls, results
+
+    cache, calls, results = asyncio.run(lookups())
+
+    assert len(calls) == 1
+    assert all(result is results[0] for result in results)
+    assert cache.stats()["misses"] == 1 and cache.stats()["coalesced"] == 4
+
+
+def test_cancelled_first_caller_does_not_fail_the_others():
+    async def lookups():
+        cache, calls = PropertyDataCache(), []
+        fetch = slow_fetcher(calls)
+        first = asyncio.create_task(cache.get(ADDRESS, fetch))
+        await asyncio.sleep(0)
+        waiters = [asyncio.create_task(cache.get(ADDRESS, fetch)) for _ in range(3)]
+        await asyncio.sleep(0.01)
+        first.cancel()
+        results = await asyncio.gather(*waiters)
+        cached = await cache.get(ADDRESS, fetch)
+        return first, calls, results, cached
+
+    first, calls, results, cached = asyncio.run(lookups())
+
+    assert first.cancelled()
+    assert len(calls) == 1
+    assert all(result.address.zip_code == "62701" for result in results)
+    # The fetch also completed the cache entry
+    assert cached is results[0]
+
+
+def test_fetch_errors_reach_every_caller_and_are_not_cached():
+    async def lookups():
+        cache, calls = PropertyDataCache(), []
+        results = await asyncio.gather(
+            *(cache.get(ADDRESS, slow_fetcher(calls, error=ConnectionError("provider down"))) for _ in range(3)),
+            return_exceptions=True
+        )
+        retry = await cache.get(ADDRESS, slow_fetcher(calls))
+        return calls, results, retry
+
+    calls, results, retry = asyncio.run(lookups())
+
+    assert all(isinstance(result, ConnectionError) for result in results)
+    assert len(calls) == 2
+    assert retry.address.zip_code == "62701"
+
+
+def test_sync_fetch_runs_in_a_thread():
+    cache = PropertyDataCache()
+
+    property_data = asyncio.run(cache.get(ADDRESS, get_property_data))
+
+    assert property_data.address.city == "Springfield"
+    assert cache.stats()["misses"] == 1
@@ -0,0 +1,51 @@
+import json
+
+import pytest
+
+from app.routes.http_server import (
+    PLACEHOLDER_SIMILAR_PROPERTIES,
+    etag_matches,
+    orjson,
+    property_insight_etag,
+    property_insight_payload,
+    serialize_property_insight,
+)
+from app.services.calculations import calculate_property_metrics, metric_inputs_from_property_data
+from app.services.property_data_provider import get_property_data
+
+ADDRESS = "123 Main St, Springfield, IL 62701"
+
+
+@pytest.mark.parametrize("header, matches", [
+    (None, False),
+    ('"abc"', True),
+    ('W/"abc"', True),
+    ('"other", "abc"', True),
+    ("*", True),
+    ('"other"', False),
+])
+def test_if_none_match_uses_weak_comparison(header, matches):
+    assert etag_matches(header, '"abc"') is matches
+
+
+def test_etag_tracks_missing_and_changed_inputs():
+    property_data = get_property_data(ADDRESS)
+    inputs = metric_inputs_from_property_data(property_data)
+    etag = property_insight_etag(property_data, inputs)
+
+    assert etag == property_insight_etag(property_data, dict(inputs))
+    # A missing expense (estimated by default rules) is not the same input as a zero expense
+    assert property_insight_etag(property_data, {**inputs, "insurance": None}) != property_insight_etag(property_data, {**inputs, "insurance": 0.0})
+    assert property_insight_etag(property_data, inputs, comparables_count=10) != etag
+
+    rollup_market = property_data.market.model_copy(update={"average_rent_nearby": None})
+    assert property_insight_etag(property_data.model_copy(update={"market": rollup_market}), inputs) != etag
+
+
+@pytest.mark.skipif(orjson is None, reason="the fast path needs orjson")
+def test_fast_path_serializes_like_the_response_model():
+    property_data = get_property_data(ADDRESS)
+    metrics = calculate_property_metrics(**metric_inputs_from_property_data(property_data))
+    payload = property_insight_payload(property_data, metrics, PLACEHOLDER_SIMILAR_PROPERTIES)
+
+    assert json.loads(serialize_property_insight(payload, fast_path=True)) == json.loads(serialize_property_insight(payload, fast_path=False))
@@ -0,0 +1,72 @@
+import time
+
+from app.core.cache import LRUCache, SQLiteCache, TieredCache
+from app.core.review_cache import contract_review_cache_key, create_review_cache
+
+REVIEW = {"summary": "Standard lease", "highlights": [], "warnings": [], "suggestions": []}
+
+
+def test_key_ignores_whitespace_and_quote_style():
+    first = contract_review_cache_key("The “Tenant”  shall pay\nrent.", "gpt", temperature=0.1)
+    second = contract_review_cache_key('The "Tenant" shall pay rent. ', "gpt", temperature=0.1)
+
+    assert first == second
+
+
+def test_key_depends_on_model_and_parameters():
+    text = "The Tenant shall pay rent."
+    keys = {
+        contract_review_cache_key(text, "gpt", temperature=0.1),
+        contract_review_cache_key(text, "other", temperature=0.1),
+        contract_review_cache_key(text, "gpt", temperature=0.2),
+    }
+
+    assert len(keys) == 3
+
+
+def test_lru_evicts_least_recently_used():
+    cache = LRUCache(max_entries=2)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.get("a")
+    cache.set("c", 3)
+
+    assert cache.get("a") == 1
+    assert cache.get("b") is None
+    assert cache.get("c") == 3
+
+
+def test_lru_entries_expire():
+    cache = LRUCache(ttl=0.05)
+    cache.set("a", 1)
+    time.sleep(0.06)
+
+    assert cache.get("a") is None
+
+
+def test_sqlite_tier_survives_a_restart(tmp_path):
+    path = str(tmp_path / "reviews.sqlite")
+    create_review_cache(path=path).set("key", REVIEW)
+
+    restarted = create_review_cache(path=path)
+
+    assert restarted.get("key") == REVIEW
+    assert restarted.stats()["persistent_hits"] == 1
+    # Promoted into the memory tier
+    assert restarted.get("key") == REVIEW
+    assert restarted.stats()["memory_hits"] == 1
+
+
+def test_sqlite_entries_expire(tmp_path):
+    cache = SQLiteCache(str(tmp_path / "reviews.sqlite"), ttl=0.05)
+    cache.set("key", REVIEW)
+    time.sleep(0.06)
+
+    assert cache.get("key") is None
+
+
+def test_tiered_cache_counts_misses():
+    cache = TieredCache()
+
+    assert cache.get("missing") is None
+    assert cache.stats()["misses"] == 1
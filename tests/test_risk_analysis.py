@@ -0,0 +1,31 @@
+import numpy as np
+import pytest
+
+from app.services.risk_analysis import MAX_SENSITIVITY_SCENARIOS, sensitivity_grid, simulate_property_risk
+
+INPUTS = {"purchase_price": 400000.0, "annual_rental_income": 36000.0, "property_taxes": 6000.0, "insurance": 1200.0}
+
+
+def test_sensitivity_grid_shape_and_direction():
+    grid = sensitivity_grid(INPUTS, vacancy_rates=[0.0, 0.1], rent_changes=[-0.05, 0.0, 0.05], expense_changes=[0.0])
+
+    noi = np.array(grid["noi"])
+    assert noi.shape == (2, 3, 1)
+    # More vacancy lowers NOI; higher rent raises it
+    assert (noi[0] > noi[1]).all()
+    assert noi[0, 0, 0] < noi[0, 1, 0] < noi[0, 2, 0]
+
+
+def test_sensitivity_grid_size_is_capped():
+    axis = [0.0] * 100
+    with pytest.raises(ValueError, match="limit"):
+        sensitivity_grid(INPUTS, vacancy_rates=axis, rent_changes=axis, expense_changes=[0.0, 0.1])
+    assert len(axis) * len(axis) <= MAX_SENSITIVITY_SCENARIOS
+
+
+def test_simulation_is_reproducible_with_a_seed():
+    first = simulate_property_risk(INPUTS, n_scenarios=1000, seed=7)
+    second = simulate_property_risk(INPUTS, n_scenarios=1000, seed=7)
+
+    assert first == second
+    assert 0 <= first["probability_negative_noi"] <= 1
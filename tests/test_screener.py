@@ -0,0 +1,55 @@
+import io
+
+import numpy as np
+import pytest
+
+from app.screener import CSV, ScreenCriteria, _to_float, screen_file, screen_rows
+
+FIELDS = ["purchase_price", "annual_rental_income", "vacancy_rate", "property_taxes", "insurance"]
+
+
+@pytest.mark.parametrize("value, expected", [
+    ("$450,000", 450000.0),
+    ("450000", 450000.0),
+    (450000, 450000.0),
+    ("5%", 0.05),
+    (" 7.5 % ", 0.075),
+    ("0.05", 0.05),
+])
+def test_to_float(value, expected):
+    assert _to_float(value) == pytest.approx(expected)
+
+
+@pytest.mark.parametrize("value", ["", None, "n/a"])
+def test_to_float_missing(value):
+    assert np.isnan(_to_float(value))
+
+
+def test_percent_vacancy_matches_fraction():
+    rows = [
+        ["300000", "36000", "5%", "3000", "1200"],
+        ["300000", "36000", "0.05", "3000", "1200"],
+    ]
+    matches, cap_rate, noi = screen_rows(FIELDS, rows, ScreenCriteria())
+
+    assert matches == [0, 1]
+    assert cap_rate[0] == pytest.approx(cap_rate[1])
+    assert noi[0] == pytest.approx(noi[1])
+    assert noi[0] > 0
+
+
+def test_screen_file_filters_and_appends_metrics(tmp_path):
+    listings = tmp_path / "listings.csv"
+    listings.write_text(
+        ",".join(FIELDS) + "\n"
+        "300000,36000,5%,3000,1200\n"
+        "900000,36000,5%,3000,1200\n"
+    )
+    output = io.StringIO()
+
+    stats = screen_file(str(listings), output, ScreenCriteria(max_price=500000), workers=1, output_format=CSV)
+
+    lines = output.getvalue().splitlines()
+    assert stats["rows"] == 2 and stats["matches"] == 1
+    assert lines[0].endswith("cap_rate,noi")
+    assert lines[1].startswith("300000,")
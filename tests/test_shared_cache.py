@@ -0,0 +1,97 @@
+import multiprocessing
+import time
+
+import pytest
+
+from app.core.shared_cache import SharedMemoryCache, decode_value, encode_value
+
+PROPERTY = {"address": "123 Main St", "rent": 2500.0, "tags": ["condo", None], "units": 1}
+
+
+@pytest.fixture
+def cache(tmp_path):
+    cache = SharedMemoryCache(str(tmp_path / "cache.bin"), max_bytes=64 * 1024, max_entries=64)
+    yield cache
+    cache.close()
+
+
+def test_values_roundtrip_through_the_encoding():
+    assert decode_value(encode_value(PROPERTY)) == PROPERTY
+    with pytest.raises(ValueError):
+        decode_value(b"?garbage")
+
+
+def test_set_get_overwrite_and_delete(cache):
+    cache.set("property:1", PROPERTY)
+    cache.set("property:1", {**PROPERTY, "rent": 2600.0})
+    cache.set("property:2", "second")
+
+    assert cache.get("property:1")["rent"] == 2600.0
+    assert cache.get("property:2") == "second"
+    assert len(cache) == 2
+
+    cache.delete("property:1")
+    assert cache.get("property:1") is None
+    assert cache.get("missing") is None
+    assert len(cache) == 1
+
+
+def test_expired_entries_are_misses_and_purged(cache):
+    cache.set("short", 1, ttl=0.05)
+    cache.set("long", 2, ttl=60)
+    time.sleep(0.1)
+
+    assert cache.get("short") is None
+    assert cache.purge_expired() == 1
+    assert cache.get("long") == 2
+
+
+def test_full_cache_evicts_least_recently_used_entries(cache):
+    value = "x" * 1000
+    cache.set("hot", value)
+    for i in range(200):
+        cache.get("hot")
+        cache.set(f"cold:{i}", value)
+
+    stats = cache.stats()
+    assert cache.get("hot") == value
+    assert cache.get("cold:0") is None
+    assert cache.get("cold:199") == value
+    assert stats["evictions"] > 0
+    assert stats["bytes_used"] <= stats["max_bytes"]
+
+
+def test_reopened_file_keeps_entries_and_its_size(tmp_path):
+    path = str(tmp_path / "cache.bin")
+    first = SharedMemoryCache(path, max_bytes=64 * 1024)
+    first.set("property:1", PROPERTY)
+    first.close()
+
+    second = SharedMemoryCache(path, max_bytes=1024 * 1024)
+    try:
+        assert second.get("property:1") == PROPERTY
+        assert second.stats()["max_bytes"] == 64 * 1024
+    finally:
+        second.close()
+
+
+def _write_entries(cache: SharedMemoryCache, worker: int):
+    for i in range(50):
+        cache.set(f"worker{worker}:{i}", {"worker": worker, "i": i})
+
+
+def test_entries_are_shared_with_forked_workers(tmp_path):
+    cache = SharedMemoryCache(str(tmp_path / "cache.bin"), max_entries=1024)
+    context = multiprocessing.get_context("fork")
+    workers = [context.Process(target=_write_entries, args=(cache, worker)) for worker in range(3)]
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join(10)
+
+    try:
+        assert all(worker.exitcode == 0 for worker in workers)
+        assert len(cache) == 150
+        assert cache.get("worker2:49") == {"worker": 2, "i": 49}
+    finally:
+        cache.close()
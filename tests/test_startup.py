@@ -0,0 +1,12 @@
+from benchmarks.check_startup import DEFAULT_BUDGET_MS, import_profile
+
+
+def test_app_imports_within_budget_without_deferred_modules():
+    timings, loaded = [], set()
+    for _ in range(3):
+        milliseconds, modules = import_profile()
+        timings.append(milliseconds)
+        loaded.update(modules)
+
+    assert sorted(timings)[1] <= DEFAULT_BUDGET_MS
+    assert not loaded, f"imported at startup instead of on first use: {sorted(loaded)}"
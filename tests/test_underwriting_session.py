@@ -0,0 +1,74 @@
+import random
+
+import pytest
+
+from app.services.calculations import calculate_property_metrics
+from app.services.underwriting_session import UnderwritingSession, UnderwritingSessionStore
+
+INPUTS = {"purchase_price": 400_000, "annual_rental_income": 36_000, "other_income": 1_200, "vacancy_rate": 0.05, "utilities": 1_800}
+
+
+def test_random_updates_match_a_full_recalculation():
+    rng = random.Random(11)
+    session = UnderwritingSession("s1", INPUTS)
+    choices = {
+        "purchase_price": lambda: rng.uniform(200_000, 900_000),
+        "annual_rental_income": lambda: rng.uniform(20_000, 80_000),
+        "vacancy_rate": lambda: rng.uniform(0, 0.2),
+        "insurance": lambda: rng.choice([None, rng.uniform(500, 3000)]),
+        "property_management": lambda: rng.choice([None, rng.uniform(1000, 5000)]),
+        "default_property_tax_rate": lambda: rng.uniform(0.005, 0.03),
+    }
+    for _ in range(200):
+        names = rng.sample(sorted(choices), rng.randint(1, 3))
+        session.update({name: choices[name]() for name in names})
+        assert session.metrics() == calculate_property_metrics(**session.inputs())
+
+
+def test_update_recomputes_only_downstream_values():
+    session = UnderwritingSession("s1", INPUTS)
+    taxes = session.metrics()["expense_breakdown"]["property_taxes"]
+
+    changed, recomputed = session.update({"vacancy_rate": 0.08})
+
+    assert recomputed < len(session.rounded)
+    assert {"vacancy_loss", "effective_gross_income", "noi", "cap_rate"} <= set(changed)
+    assert "property_taxes" not in changed.get("expense_breakdown", {})
+    assert session.metrics()["expense_breakdown"]["property_taxes"] == taxes
+    assert session.update({"vacancy_rate": 0.08}) == ({}, 0)
+
+
+def test_none_restores_the_default_estimate():
+    session = UnderwritingSession("s1", INPUTS)
+    estimate = session.metrics()["expense_breakdown"]["insurance"]
+
+    session.update({"insurance": 99.0})
+    changed, _ = session.update({"insurance": None})
+
+    assert changed["expense_breakdown"]["insurance"] == estimate
+
+
+@pytest.mark.parametrize("changes", [{"square_feet": 1000.0}, {"vacancy_rate": None}])
+def test_invalid_changes_are_rejected_before_any_is_applied(changes):
+    session = UnderwritingSession("s1", INPUTS)
+    before = session.metrics()
+
+    with pytest.raises(ValueError):
+        session.update({"annual_rental_income": 50_000, **changes})
+    assert session.metrics() == before
+
+
+def test_store_evicts_least_recently_used_and_idle_sessions(monkeypatch):
+    store = UnderwritingSessionStore(max_sessions=2, idle_timeout=60)
+    first, second = store.create(INPUTS), store.create(INPUTS)
+    store.get(first.session_id)
+    third = store.create(INPUTS)
+
+    assert store.get(second.session_id) is None
+    assert store.stats()["evicted"] == 1
+
+    now = third.last_used + 61
+    monkeypatch.setattr("app.services.underwriting_session.time.monotonic", lambda: now)
+    assert store.get(third.session_id) is None
+    assert store.stats()["sessions"] == 0
+    assert store.stats()["expired"] == 2
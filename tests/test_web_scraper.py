@@ -0,0 +1,104 @@
+import asyncio
+
+import httpx
+import pytest
+
+from app.ai.tools.web_scraper import AsyncWebScraper, TextExtractor
+
+PAGE = (
+    "<html><head><title>Listing</title><style>p { color: red; }</style></head>"
+    "<body><!-- tracking --><div>3 bed &middot; 2 bath</div><p>Rent: $2,500 &amp; utilities</p>"
+    "<script>var x = '<p>hidden</p>';</script><li>Pets</li><li>Parking</li></body></html>"
+)
+
+
+def extract(chunks):
+    extractor = TextExtractor()
+    for chunk in chunks:
+        extractor.feed(chunk)
+    return extractor.text()
+
+
+def test_extractor_skips_scripts_styles_and_comments():
+    assert extract([PAGE]) == "Listing 3 bed · 2 bath Rent: $2,500 & utilities Pets Parking"
+
+
+@pytest.mark.parametrize("size", [1, 2, 3, 7, 64])
+def test_extractor_ignores_chunk_boundaries(size):
+    chunks = [PAGE[i:i + size] for i in range(0, len(PAGE), size)]
+    assert extract(chunks) == extract([PAGE])
+
+
+def test_unterminated_script_hides_the_rest_of_the_page():
+    assert extract(["<p>Visible</p><script>never closed <p>text"]) == "Visible"
+
+
+def make_scraper(handler, **options) -> AsyncWebScraper:
+    scraper = AsyncWebScraper(**options)
+    scraper.client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    return scraper
+
+
+def test_scrape_revalidates_with_the_cached_etag():
+    requests = []
+
+    def handler(request):
+        requests.append(request)
+        if request.headers.get("if-none-match") == '"v1"':
+            return httpx.Response(304)
+        return httpx.Response(200, html=PAGE, headers={"ETag": '"v1"'})
+
+    async def run():
+        async with make_scraper(handler) as scraper:
+            return await scraper.scrape("http://listings.test/1"), await scraper.scrape("http://listings.test/1")
+
+    first, second = asyncio.run(run())
+
+    assert not first.from_cache and first.status_code == 200
+    assert second.from_cache and second.status_code == 304
+    assert second.text == first.text
+    assert "if-none-match" not in requests[0].headers
+
+
+def test_scrape_stops_reading_after_max_bytes():
+    body = b"<p>" + b"word " * 1000 + b"</p>"
+
+    async def run():
+        async with make_scraper(lambda request: httpx.Response(200, content=body), max_bytes=100) as scraper:
+            return await scraper.scrape("http://listings.test/big")
+
+    result = asyncio.run(run())
+
+    assert result.truncated
+    assert len(result.text) <= 100
+
+
+def test_scrape_reports_errors_in_the_result():
+    async def run():
+        async with make_scraper(lambda request: httpx.Response(503)) as scraper:
+            return await scraper.scrape_many(["http://listings.test/down", "http://listings.test/down2"])
+
+    results = asyncio.run(run())
+
+    assert [result.url for result in results] == ["http://listings.test/down", "http://listings.test/down2"]
+    assert all(result.error and "503" in result.error for result in results)
+
+
+def test_requests_per_host_are_bounded():
+    in_flight, peak = 0, 0
+
+    async def handler(request):
+        nonlocal in_flight, peak
+        in_flight += 1
+        peak = max(peak, in_flight)
+        await asyncio.sleep(0.02)
+        in_flight -= 1
+        return httpx.Response(200, text="ok")
+
+    async def run():
+        async with make_scraper(handler, max_per_host=2) as scraper:
+            await scraper.scrape_many([f"http://listings.test/{i}" for i in range(10)])
+
+    asyncio.run(run())
+
+    assert peak == 2